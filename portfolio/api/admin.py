@@ -2,8 +2,25 @@ from django.contrib import admin
 from django import forms
 from .models import (
     Country, Project, Book, Hobby,
-    Skills, Photo
+    Skills, Photo, ContributionSnapshot, ContentVersion, PortfolioSnapshot, Tombstone,
+    SearchEntry
 )
+from .search import matching_ids
+
+
+class FullTextSearchMixin:
+    """
+    Admin search over search_fields (icontains, so "ython" still finds "Python") and,
+    combined with it, the full-text index (see api.search), which also matches word
+    prefixes in the rest of the indexed text
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if not search_term.strip():
+            return results, may_have_duplicates
+        indexed = queryset.filter(pk__in=matching_ids(self.model, search_term))
+        return results | indexed, may_have_duplicates
 
 
 class ProjectAdminForm(forms.ModelForm):
@@ -25,7 +42,7 @@ class CountryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(FullTextSearchMixin, admin.ModelAdmin):
     form = ProjectAdminForm
     list_display = ['title', 'created_at']
     list_filter = ['created_at']
@@ -35,7 +52,7 @@ class ProjectAdmin(admin.ModelAdmin):
 
 
 @admin.register(Book)
-class BookAdmin(admin.ModelAdmin):
+class BookAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'author', 'rating', 'created_at']
     list_filter = ['rating', 'created_at']
     search_fields = ['title', 'author']
@@ -43,7 +60,7 @@ class BookAdmin(admin.ModelAdmin):
 
 
 @admin.register(Photo)
-class PhotoAdmin(admin.ModelAdmin):
+class PhotoAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'created_at']
     list_filter = ['created_at']
     search_fields = ['title']
@@ -51,14 +68,14 @@ class PhotoAdmin(admin.ModelAdmin):
 
 
 @admin.register(Hobby)
-class HobbyAdmin(admin.ModelAdmin):
+class HobbyAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['name', 'category', 'reason', 'social', 'created_at']
     list_filter = ['category', 'social', 'created_at']
     search_fields = ['name', 'reason', 'category']
 
 
 @admin.register(Skills)
-class SkillsAdmin(admin.ModelAdmin):
+class SkillsAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['name', 'category', 'has_icon', 'created_at']
     list_filter = ['category', 'created_at']
     search_fields = ['name']
@@ -87,3 +104,33 @@ class SkillsAdmin(admin.ModelAdmin):
     icon_preview.short_description = 'Icon Preview'
 
 
+@admin.register(ContributionSnapshot)
+class ContributionSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['username', 'fetched_at']
+    readonly_fields = ['username', 'data', 'fetched_at']
+
+
+@admin.register(ContentVersion)
+class ContentVersionAdmin(admin.ModelAdmin):
+    list_display = ['key', 'version', 'updated_at']
+    readonly_fields = ['key', 'version', 'updated_at']
+
+
+@admin.register(PortfolioSnapshot)
+class PortfolioSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['name', 'digest', 'built_at']
+    readonly_fields = ['name', 'digest', 'document', 'built_at']
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ['collection', 'object_id', 'deleted_at']
+    list_filter = ['collection']
+    readonly_fields = ['collection', 'object_id', 'deleted_at']
+
+
+@admin.register(SearchEntry)
+class SearchEntryAdmin(admin.ModelAdmin):
+    list_display = ['collection', 'object_id', 'title', 'updated_at']
+    list_filter = ['collection']
+    readonly_fields = ['collection', 'object_id', 'title', 'body', 'updated_at']
@@ -5,3 +5,7 @@ class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
 
+    def ready(self):
+        # Register signal handlers that invalidate cached content on writes
+        from . import signals  # noqa: F401
+
@@ -0,0 +1,150 @@
+"""
+Batch creation
+Creates many rows of one model from a JSON array in a fixed number of queries: every
+item is cleaned and validated in memory, the names are checked against the database
+with one IN query, and the new rows are inserted with one bulk_create in a single
+transaction. The result lists what happened to each item, by its index in the array.
+bulk_create sends no model signals, so the caches and the search index are updated
+here instead.
+"""
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.functions import Upper
+
+from .models import Country, Hobby, Skills
+from .search import index_objects
+
+
+class BatchSpec(NamedTuple):
+    model: type
+    # Builds the model's field values from one JSON item; raises ValueError
+    clean: Callable
+    # Fields returned for each created row
+    fields: tuple
+    # Whether names clash regardless of case
+    case_insensitive: bool = False
+
+
+class BatchError(ValueError):
+    """The request as a whole is unusable (not per item)"""
+
+
+def _text(item, name, max_length=None):
+    value = item.get(name) or ''
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string")
+    value = value.strip()
+    return value[:max_length] if max_length else value
+
+
+def _name(item):
+    name = _text(item, 'name')
+    if not name:
+        raise ValueError("Name is required")
+    return name
+
+
+def clean_hobby(item):
+    return {
+        'name': _name(item),
+        'reason': _text(item, 'reason'),
+        'category': _text(item, 'category'),
+        'icon': _text(item, 'icon'),
+        'social': _text(item, 'social') or 'maybe',
+    }
+
+
+def clean_country(item):
+    # Truncated like create_country does
+    return {
+        'name': _name(item),
+        'code': _text(item, 'code', 2).upper(),
+        'flag_emoji': _text(item, 'flag_emoji', 10),
+        'thoughts': _text(item, 'thoughts', 50),
+    }
+
+
+def clean_skill(item):
+    return {
+        'name': _name(item),
+        'category': _text(item, 'category'),
+        'description': _text(item, 'description'),
+    }
+
+
+HOBBIES = BatchSpec(Hobby, clean_hobby, ('id', 'name', 'reason', 'category', 'social', 'icon'))
+COUNTRIES = BatchSpec(Country, clean_country, ('id', 'name', 'code', 'flag_emoji', 'thoughts'))
+# Skill names are unique regardless of case, as in create_skill
+SKILLS = BatchSpec(Skills, clean_skill, ('id', 'name', 'category', 'description'), case_insensitive=True)
+
+
+def _existing_names(spec, names):
+    """Names (uppercased if case-insensitive) that are already taken, in one query"""
+    if spec.case_insensitive:
+        # UPPER(name), like name__iexact, so the api_skills_name_upper index serves it
+        return set(
+            spec.model.objects.annotate(upper_name=Upper('name'))
+            .filter(upper_name__in=names).order_by().values_list('upper_name', flat=True)
+        )
+    return set(spec.model.objects.filter(name__in=names).order_by().values_list('name', flat=True))
+
+
+def batch_create(spec, items):
+    """
+    Create the valid, new items of `items` (a list of dicts).
+    Returns per-item results in input order: {'index', 'success', ...fields} for created
+    rows and {'index', 'success': False, 'error'} for the others.
+    Raises BatchError for payloads that are not a list or are too large, and lets
+    IntegrityError through when a concurrent request took one of the names.
+    """
+    if not isinstance(items, list):
+        raise BatchError("Expected a JSON array of items")
+    max_size = getattr(settings, 'API_MAX_BATCH_SIZE', 500)
+    if len(items) > max_size:
+        raise BatchError(f"At most {max_size} items per batch")
+
+    results = [None] * len(items)
+    pending = {}  # name key -> (index, unsaved instance)
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError("Item must be an object")
+            instance = spec.model(**spec.clean(item))
+            # In-memory checks only (lengths, choices); uniqueness is checked below in one query
+            instance.full_clean(validate_unique=False, validate_constraints=False)
+        except ValidationError as e:
+            results[index] = {'index': index, 'success': False, 'error': '; '.join(
+                f"{field}: {' '.join(messages)}" for field, messages in e.message_dict.items()
+            )}
+            continue
+        except ValueError as e:
+            results[index] = {'index': index, 'success': False, 'error': str(e)}
+            continue
+        key = instance.name.upper() if spec.case_insensitive else instance.name
+        if key in pending:
+            results[index] = {'index': index, 'success': False, 'error': 'Duplicate name in batch'}
+            continue
+        pending[key] = (index, instance)
+
+    verbose_name = spec.model._meta.verbose_name.capitalize()
+    if pending:
+        existing = _existing_names(spec, list(pending))
+        for key in existing:
+            index, _ = pending.pop(key)
+            results[index] = {'index': index, 'success': False, 'error': f'{verbose_name} with this name already exists'}
+
+    if pending:
+        # Imported here: api.signals imports the views, which import this module
+        from .signals import content_changed
+        with transaction.atomic():
+            created = spec.model.objects.bulk_create([instance for _, instance in pending.values()])
+            content_changed(spec.model)
+            index_objects(spec.model, created)
+        for (index, _), instance in zip(pending.values(), created):
+            results[index] = {'index': index, 'success': True, **{
+                field: getattr(instance, field) for field in spec.fields
+            }}
+    return results
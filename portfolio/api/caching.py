@@ -0,0 +1,78 @@
+"""
+Full-page cache for anonymous visitors
+Anonymous visitors all see the same HTML, so page views cache their rendered
+response and serve it straight from the cache. Every cache key includes a
+generation number that model signals bump on writes (see api.signals), which
+invalidates all cached pages at once without tracking individual keys.
+Authenticated users see the admin add buttons and always bypass the cache.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+PAGE_CACHE_VERSION_KEY = 'page_cache:version'
+
+# Headers that belong to the original request and must not be replayed to other visitors
+_UNCACHED_HEADERS = {'set-cookie', 'vary'}
+
+
+def page_cache_version():
+    """Current page cache generation"""
+    version = cache.get(PAGE_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(PAGE_CACHE_VERSION_KEY, 1, None)
+        version = cache.get(PAGE_CACHE_VERSION_KEY, 1)
+    return version
+
+
+def invalidate_page_cache():
+    """Drop every cached page by moving to a new generation"""
+    try:
+        cache.incr(PAGE_CACHE_VERSION_KEY)
+    except ValueError:
+        # The version key was evicted; any value other than the old one will do
+        cache.set(PAGE_CACHE_VERSION_KEY, page_cache_version() + 1, None)
+
+
+def page_cache_key(request, query_params=()):
+    """Cache key for a page: URL, relevant query params and whether it was an AJAX request"""
+    params = '&'.join(f'{name}={request.GET.get(name, "")}' for name in query_params)
+    ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+    raw = f'{request.scheme}://{request.get_host()}{request.path}?{params}:{ajax}'
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'page:{page_cache_version()}:{digest}'
+
+
+def cache_page_for_anonymous(query_params=()):
+    """
+    Cache a view's successful GET responses for anonymous visitors.
+    query_params lists the query string parameters that change the page (e.g. 'section').
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 600)
+            if (not timeout or request.method not in ('GET', 'HEAD')
+                    or request.user.is_authenticated):
+                return view_func(request, *args, **kwargs)
+
+            key = page_cache_key(request, query_params)
+            cached = cache.get(key)
+            if cached is not None:
+                content, headers = cached
+                response = HttpResponse(content)
+                for header, value in headers:
+                    response[header] = value
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            # Responses that set cookies (e.g. a CSRF token) are specific to this visitor
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                headers = [(h, v) for h, v in response.items() if h.lower() not in _UNCACHED_HEADERS]
+                cache.set(key, (response.content, headers), timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,58 @@
+"""
+CDN edge caching policy
+Public GET responses are cached at the edge: "s-maxage" lets the CDN serve them without
+invoking the function, and "stale-while-revalidate" lets it keep serving while it fetches
+a fresh copy in the background. Browsers get max-age=0 and revalidate with the ETag
+(see api.versions). Responses are tagged with the content keys they are built from, so
+a write purges just the affected pages (see api.purge). Anything served to a logged-in
+user, or that sets cookies, is "private, no-store".
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+
+
+def _tag_header():
+    return getattr(settings, 'CDN_CACHE_TAG_HEADER', 'Surrogate-Key')
+
+
+def patch_edge_cache(response, public, tags=(), s_maxage=None, stale_while_revalidate=None):
+    """Set the edge caching headers on a response"""
+    if not public or response.cookies:
+        patch_cache_control(response, private=True, no_store=True)
+        return response
+    if response.status_code not in (200, 304):
+        return response
+    if s_maxage is None:
+        s_maxage = getattr(settings, 'CDN_S_MAXAGE', 300)
+    if stale_while_revalidate is None:
+        stale_while_revalidate = getattr(settings, 'CDN_STALE_WHILE_REVALIDATE', 86400)
+    patch_cache_control(
+        response, public=True, max_age=0, s_maxage=s_maxage,
+        stale_while_revalidate=stale_while_revalidate,
+    )
+    if tags:
+        response[_tag_header()] = ' '.join(sorted(tags))
+    return response
+
+
+def edge_cache(tags=None, s_maxage=None, stale_while_revalidate=None):
+    """
+    Apply the edge caching policy to a view's GET responses.
+    Tags default to the content keys declared by the view's @conditional.
+    """
+    def decorator(view_func):
+        view_tags = tags if tags is not None else getattr(view_func, 'content_keys', ())
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = view_func(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                patch_edge_cache(
+                    response, not request.user.is_authenticated, view_tags,
+                    s_maxage, stale_while_revalidate,
+                )
+            return response
+        return wrapper
+    return decorator
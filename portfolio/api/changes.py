@@ -0,0 +1,141 @@
+"""
+Change feed
+Inserted, updated and deleted portfolio items in the order they changed, so a client
+that mirrors the public collections (see api.collections) only downloads what changed
+since its last poll. Saves are found by each model's updated_at, deletions by the
+Tombstone rows recorded when an item is deleted (see api.signals).
+
+Changes are ordered by (time, source, id), where the sources are the collections
+followed by the tombstones, and the position in that order is handed to the client as
+an opaque cursor. Changes from the last few seconds are held back until transactions
+that started earlier have had time to commit, since such a change can carry an older
+timestamp than one already returned.
+"""
+import logging
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .collections import COLLECTIONS
+from .models import Tombstone
+from .pagination import InvalidCursor, decode_values, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+DELETED = 'deleted'
+# Sources in tie-break order for changes made at the same instant
+SOURCES = tuple(COLLECTIONS) + (DELETED,)
+COLLECTION_NAMES = {collection.model: name for name, collection in COLLECTIONS.items()}
+
+
+class CursorExpired(InvalidCursor):
+    """The cursor is older than the tombstones kept, so deletions may have been missed"""
+
+
+class Change(NamedTuple):
+    changed_at: object
+    source: str
+    id: int
+    data: dict
+
+    def as_json(self):
+        if self.source == DELETED:
+            return {
+                'op': 'delete', 'collection': self.data['collection'], 'id': self.data['object_id'],
+                'changed_at': self.changed_at,
+            }
+        return {
+            'op': 'upsert', 'collection': self.source, 'id': self.id, 'data': self.data,
+            'changed_at': self.changed_at,
+        }
+
+
+class ChangePage(NamedTuple):
+    changes: list
+    # Cursor to poll with next; the one given if nothing changed
+    cursor: str
+    has_more: bool
+
+
+def _retention():
+    return timedelta(days=getattr(settings, 'CHANGES_TOMBSTONE_RETENTION_DAYS', 90))
+
+
+def record_deletion(model, pk):
+    """Leave a tombstone for a deleted item of a public collection"""
+    name = COLLECTION_NAMES.get(model)
+    if name is None or pk is None:
+        return
+    try:
+        # Savepoint, so a failure here never breaks the delete that triggered it
+        with transaction.atomic():
+            Tombstone.objects.create(collection=name, object_id=pk)
+            Tombstone.objects.filter(deleted_at__lt=timezone.now() - _retention()).delete()
+    except DatabaseError as e:
+        logger.error(f"Error recording deletion of {name} #{pk}: {e}")
+
+
+def decode_change_cursor(cursor):
+    """(time, source, id) from a change cursor; raises InvalidCursor or CursorExpired"""
+    values = decode_values(cursor)
+    if not isinstance(values, list) or len(values) != 3 or values[1] not in SOURCES:
+        raise InvalidCursor("Cursor does not belong to the change feed")
+    changed_at = parse_datetime(values[0]) if isinstance(values[0], str) else None
+    if changed_at is None or timezone.is_naive(changed_at) or not isinstance(values[2], int):
+        raise InvalidCursor("Invalid cursor value")
+    if changed_at < timezone.now() - _retention():
+        raise CursorExpired("Cursor is older than the deletions kept")
+    return changed_at, values[1], values[2]
+
+
+def _after(source, time_field, position):
+    """Q for the rows of `source` that come after `position` in (time, source, id) order"""
+    if position is None:
+        return Q()
+    changed_at, cursor_source, cursor_id = position
+    rank, cursor_rank = SOURCES.index(source), SOURCES.index(cursor_source)
+    if rank < cursor_rank:
+        return Q(**{f'{time_field}__gt': changed_at})
+    if rank > cursor_rank:
+        return Q(**{f'{time_field}__gte': changed_at})
+    return Q(**{f'{time_field}__gt': changed_at}) | Q(**{time_field: changed_at, 'id__gt': cursor_id})
+
+
+def changes_since(cursor=None, limit=100):
+    """
+    Up to `limit` changes after `cursor` (from the beginning if None), oldest first.
+    Each source is read with one index range scan of at most limit + 1 rows.
+    Raises InvalidCursor (or CursorExpired) for cursors this feed cannot continue from.
+    """
+    position = decode_change_cursor(cursor) if cursor else None
+    settled = timezone.now() - timedelta(seconds=getattr(settings, 'CHANGES_SETTLE_SECONDS', 2))
+
+    changes = []
+    for name, collection in COLLECTIONS.items():
+        rows = (
+            collection.model.objects
+            .filter(_after(name, 'updated_at', position), updated_at__lt=settled)
+            .order_by('updated_at', 'id')
+            .values(*collection.fields)[:limit + 1]
+        )
+        changes += [Change(row['updated_at'], name, row['id'], collection.serialize(row)) for row in rows]
+    tombstones = (
+        Tombstone.objects
+        .filter(_after(DELETED, 'deleted_at', position), deleted_at__lt=settled)
+        .order_by('deleted_at', 'id')
+        .values('id', 'collection', 'object_id', 'deleted_at')[:limit + 1]
+    )
+    changes += [Change(row['deleted_at'], DELETED, row['id'], row) for row in tombstones]
+
+    changes.sort(key=lambda change: (change.changed_at, SOURCES.index(change.source), change.id))
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if changes:
+        last = changes[-1]
+        cursor = encode_cursor([last.changed_at, last.source, last.id])
+    return ChangePage(changes, cursor, has_more)
@@ -0,0 +1,84 @@
+"""
+Circuit breaker for calls to external services
+Failures are tracked per failure class (e.g. rate limit, timeout) so each class backs off
+exponentially on its own schedule. While the breaker is open, a short-lived negative entry
+in the cache tells callers to skip the upstream call entirely.
+"""
+import time
+
+from django.core.cache import cache
+
+
+class CircuitBreaker:
+    """Per-failure-class circuit breaker with exponential backoff, state kept in the cache"""
+
+    def __init__(self, name, base_delays, default_delay=30, max_delay=3600):
+        # base_delays: failure class -> backoff in seconds after the first failure
+        self.name = name
+        self.base_delays = base_delays
+        self.default_delay = default_delay
+        self.max_delay = max_delay
+
+    def _open_key(self):
+        return f'breaker:{self.name}:open'
+
+    def _class_key(self, failure_class):
+        return f'breaker:{self.name}:{failure_class}'
+
+    def backoff(self, failure_class, failures):
+        """Backoff in seconds after the given number of consecutive failures"""
+        base = self.base_delays.get(failure_class, self.default_delay)
+        return min(base * 2 ** (failures - 1), self.max_delay)
+
+    def open_failure(self):
+        """Return the negative cache entry if the breaker is open, otherwise None"""
+        return cache.get(self._open_key())
+
+    def is_open(self):
+        return self.open_failure() is not None
+
+    def record_failure(self, failure_class, message='', retry_after=None):
+        """
+        Record a failure and open the breaker.
+        Returns the number of seconds the breaker stays open. A retry_after hint from
+        the upstream (e.g. a Retry-After header) is honoured if it is longer.
+        """
+        key = self._class_key(failure_class)
+        state = cache.get(key) or {'failures': 0}
+        failures = state['failures'] + 1
+        delay = self.backoff(failure_class, failures)
+        if retry_after:
+            delay = max(delay, min(int(retry_after), self.max_delay))
+
+        now = time.time()
+        state = {
+            'failures': failures,
+            'last_error': message,
+            'last_failure_at': now,
+        }
+        # Keep the failure count long enough for the next backoff step to build on it
+        cache.set(key, state, self.max_delay * 2)
+        cache.set(self._open_key(), {
+            'failure_class': failure_class,
+            'message': message,
+            'opened_at': now,
+            'open_until': now + delay,
+        }, delay)
+        return delay
+
+    def record_success(self):
+        """Close the breaker and reset the failure counts of every class"""
+        cache.delete_many([self._open_key()] + [self._class_key(c) for c in self.base_delays])
+
+    def state(self):
+        """Breaker state for monitoring"""
+        open_entry = self.open_failure()
+        return {
+            'name': self.name,
+            'open': open_entry is not None,
+            'open_failure': open_entry,
+            'failure_classes': {
+                failure_class: cache.get(self._class_key(failure_class)) or {'failures': 0}
+                for failure_class in self.base_delays
+            },
+        }
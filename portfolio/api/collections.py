@@ -0,0 +1,49 @@
+"""
+Public collections
+The portfolio content exposed to API consumers, with the fields each collection
+publishes and its stable ordering (backed by an index, see models.py).
+"""
+from typing import NamedTuple
+
+from django.db.models import FileField
+
+from .models import Project, Skills, Book, Hobby, Country, Photo
+
+
+class Collection(NamedTuple):
+    model: type
+    fields: tuple
+    ordering: tuple
+
+    def serialize(self, row, fields=None):
+        """A .values() row as API data, with files as URLs (see api.renderers for the rest)"""
+        data = {}
+        for name in fields or self.fields:
+            value = row[name]
+            field = self.model._meta.get_field(name)
+            if isinstance(field, FileField):
+                value = field.storage.url(value) if value else None
+            data[name] = value
+        return data
+
+
+COLLECTIONS = {
+    'projects': Collection(
+        Project, ('id', 'title', 'description', 'image', 'created_at', 'updated_at'), ('-created_at', '-id'),
+    ),
+    'skills': Collection(
+        Skills, ('id', 'name', 'category', 'description', 'icon', 'created_at', 'updated_at'), ('category', 'name'),
+    ),
+    'books': Collection(
+        Book, ('id', 'title', 'author', 'rating', 'cover_image', 'created_at', 'updated_at'), ('-created_at', '-id'),
+    ),
+    'hobbies': Collection(
+        Hobby, ('id', 'name', 'reason', 'category', 'social', 'icon', 'created_at', 'updated_at'), ('category', 'name'),
+    ),
+    'countries': Collection(
+        Country, ('id', 'name', 'code', 'flag_emoji', 'thoughts', 'created_at', 'updated_at'), ('name',),
+    ),
+    'photos': Collection(
+        Photo, ('id', 'title', 'image', 'created_at', 'updated_at'), ('-created_at', '-id'),
+    ),
+}
@@ -0,0 +1,185 @@
+"""
+Compact contribution calendar
+Stores a year of GitHub contribution days as a start date plus one byte per day for the
+level and a packed array of counts, instead of hundreds of nested dicts. Cache round
+trips then pickle a handful of bytes objects, and days are read lazily from the buffers.
+"""
+import hashlib
+from array import array
+from datetime import date, timedelta
+from typing import NamedTuple
+
+# GitHub contributionLevel values, indexed by the byte stored per day
+LEVELS = ('NONE', 'FIRST_QUARTILE', 'SECOND_QUARTILE', 'THIRD_QUARTILE', 'FOURTH_QUARTILE')
+_LEVEL_INDEX = {level: i for i, level in enumerate(LEVELS)}
+
+# Unsigned 32-bit counts; 'I' is 4 bytes on every platform we deploy to
+_COUNT_TYPECODE = 'I'
+
+MONTH_NAMES = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+class Day(NamedTuple):
+    date: date
+    level: str
+    count: int
+
+
+class ContributionCalendar:
+    """A contiguous run of contribution days starting at `start`"""
+
+    __slots__ = ('start', 'total', 'levels', 'counts')
+
+    def __init__(self, start=None, total=0, levels=b'', counts=b''):
+        self.start = start
+        self.total = total
+        self.levels = bytes(levels)
+        self.counts = bytes(counts)
+
+    @classmethod
+    def from_weeks(cls, weeks, total):
+        """Build from the GraphQL `weeks { contributionDays { ... } }` shape"""
+        days = [day for week in weeks for day in week.get('contributionDays', [])]
+        if not days:
+            return cls(total=total)
+        start = date.fromisoformat(days[0]['date'])
+        levels = bytes(_LEVEL_INDEX.get(day.get('contributionLevel'), 0) for day in days)
+        counts = array(_COUNT_TYPECODE, (day.get('contributionCount', 0) for day in days))
+        return cls(start, total, levels, counts.tobytes())
+
+    @classmethod
+    def from_json(cls, data):
+        """Build from to_json() output (or the raw GraphQL result shape of older snapshots)"""
+        if 'weeks' in data:
+            return cls.from_weeks(data['weeks'], data.get('total_contributions', 0))
+        if not data.get('start'):
+            return cls(total=data.get('total', 0))
+        return cls(
+            date.fromisoformat(data['start']),
+            data.get('total', 0),
+            bytes.fromhex(data['levels']),
+            array(_COUNT_TYPECODE, data['counts']).tobytes(),
+        )
+
+    def to_json(self):
+        """JSON-serialisable form, used for the database snapshot"""
+        return {
+            'start': self.start.isoformat() if self.start else None,
+            'total': self.total,
+            'levels': self.levels.hex(),
+            'counts': list(self.count_view()),
+        }
+
+    def __getstate__(self):
+        return (self.start.toordinal() if self.start else None, self.total, self.levels, self.counts)
+
+    def __setstate__(self, state):
+        start, self.total, self.levels, self.counts = state
+        self.start = date.fromordinal(start) if start is not None else None
+
+    def __len__(self):
+        return len(self.levels)
+
+    def __eq__(self, other):
+        if not isinstance(other, ContributionCalendar):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    @property
+    def digest(self):
+        """Content hash of the calendar, used to key rendered fragments"""
+        start = self.start.isoformat() if self.start else ''
+        content = f'{start}:{self.total}:'.encode() + self.levels + self.counts
+        return hashlib.sha1(content).hexdigest()
+
+    @property
+    def end(self):
+        return self.start + timedelta(days=len(self) - 1) if self.start else None
+
+    def count_view(self):
+        """Counts as a memoryview over the packed buffer (no copy)"""
+        return memoryview(self.counts).cast(_COUNT_TYPECODE)
+
+    def days(self):
+        """Iterate over every day, oldest first"""
+        if not self.start:
+            return
+        ordinal = self.start.toordinal()
+        for offset, (level, count) in enumerate(zip(self.levels, self.count_view())):
+            yield Day(date.fromordinal(ordinal + offset), LEVELS[level], count)
+
+    def weeks(self):
+        """Iterate over the days grouped into Sunday-to-Saturday weeks, like GitHub's calendar"""
+        week = []
+        for day in self.days():
+            # date.weekday() is 0 for Monday, so Sunday (6) starts a new week
+            if week and day.date.weekday() == 6:
+                yield week
+                week = []
+            week.append(day)
+        if week:
+            yield week
+
+    def month_labels(self):
+        """Month label for each run of weeks, based on the first day of each week"""
+        labels = []
+        current_month = None
+        for week in self.weeks():
+            month = week[0].date.month
+            if month != current_month:
+                labels.append(MONTH_NAMES[month - 1])
+                current_month = month
+        return labels
+
+    def contributions_since(self, since):
+        """Sum of the counts from `since` (inclusive) to the end of the calendar"""
+        if not self.start:
+            return 0
+        offset = max((since - self.start).days, 0)
+        return sum(self.count_view()[offset:])
+
+    def level_for(self, count):
+        """
+        Estimate GitHub's level for a count from the levels it assigned in this calendar:
+        the highest level whose smallest observed count is not above `count`.
+        """
+        if count <= 0:
+            return LEVELS[0]
+        lowest = {}
+        for level, day_count in zip(self.levels, self.count_view()):
+            if level and (level not in lowest or day_count < lowest[level]):
+                lowest[level] = day_count
+        best = 1
+        for level in sorted(lowest):
+            if count >= lowest[level]:
+                best = level
+        return LEVELS[best]
+
+    def merge(self, days, window_start, total):
+        """
+        Return a new calendar with `days` ((date, count) pairs) applied on top of this one.
+        The calendar is extended up to the latest merged day, and whole weeks that ended
+        before window_start are dropped so the week layout stays the same while it rolls forward.
+        """
+        days = list(days)
+        if not self.start or not days:
+            return self
+        start = self.start
+        while start + timedelta(days=7) <= window_start:
+            start += timedelta(days=7)
+        end = max(self.end, max(day for day, _ in days))
+        length = (end - start).days + 1
+
+        offset = (start - self.start).days
+        kept = max(len(self) - offset, 0)
+        levels = bytearray(length)
+        levels[:kept] = self.levels[offset:offset + kept]
+        counts = array(_COUNT_TYPECODE, bytes(length * array(_COUNT_TYPECODE).itemsize))
+        counts[:kept] = array(_COUNT_TYPECODE, self.count_view()[offset:offset + kept])
+
+        for day, count in days:
+            index = (day - start).days
+            if 0 <= index < length:
+                counts[index] = count
+                levels[index] = _LEVEL_INDEX[self.level_for(count)]
+        return ContributionCalendar(start, total, levels, counts.tobytes())
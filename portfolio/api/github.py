@@ -0,0 +1,552 @@
+"""
+GitHub contributions integration
+Fetches the contribution calendar from the GitHub GraphQL API (incrementally, when a
+calendar is already cached) and caches it with a soft/hard TTL (stale-while-revalidate): once any calendar is cached, visitors are
+served it immediately and refreshes happen in the background. The last good calendar
+is also kept in the database so new (cold) instances never have to wait on GitHub.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.dispatch import Signal
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .caching import invalidate_page_cache
+from .circuitbreaker import CircuitBreaker
+from .contributions import ContributionCalendar
+from .models import ContributionSnapshot
+from .outbound import get_client
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Sent with `calendar` when a fetch stores a calendar whose content differs from the
+# database snapshot, so it fires once per change however many instances are running
+contributions_updated = Signal()
+
+GRAPHQL_URL = 'https://api.github.com/graphql'
+GITHUB_API_HOST = 'api.github.com'
+
+CACHE_KEY = 'github_contributions'
+REFRESH_LOCK_KEY = 'github_contributions:refreshing'
+DIRTY_KEY = 'github_contributions:dirty'
+GRAPH_CACHE_KEY = 'github_graph:{digest}'
+
+# How long a background refresh may hold the refresh lock before another one is allowed
+REFRESH_LOCK_TIMEOUT = 60
+
+# Webhook events that can change the contribution calendar
+CONTRIBUTION_EVENTS = {
+    'push', 'pull_request', 'pull_request_review', 'issues', 'create', 'repository', 'release',
+}
+
+# A cached calendar further behind than this is refetched in full rather than merged
+INCREMENTAL_MAX_GAP_DAYS = 30
+
+# Coalesces concurrent cache misses into a single GitHub request
+_fetch_flight = SingleFlight(lock_timeout=REFRESH_LOCK_TIMEOUT, wait_timeout=15)
+
+
+def empty_contributions():
+    """Result used when no contribution data is available"""
+    return ContributionCalendar()
+
+
+class ContributionsFetchError(Exception):
+    """A failed GitHub request, tagged with its failure class for the circuit breaker"""
+
+    def __init__(self, failure_class, message, retry_after=None):
+        super().__init__(message)
+        self.failure_class = failure_class
+        self.retry_after = retry_after
+
+
+# Backoff after the first failure of each class, doubled on every consecutive failure.
+# Credential and missing-user failures need someone to fix the configuration, so they back off longest.
+BREAKER_BASE_DELAYS = {
+    'auth': 600,
+    'forbidden': 600,
+    'not_found': 600,
+    'rate_limit': 60,
+    'graphql': 60,
+    'invalid_response': 60,
+    'http': 30,
+    'timeout': 30,
+    'network': 30,
+    'unexpected': 60,
+}
+
+breaker = CircuitBreaker(
+    'github',
+    BREAKER_BASE_DELAYS,
+    max_delay=getattr(settings, 'GITHUB_BREAKER_MAX_BACKOFF', 3600),
+)
+
+
+def _username():
+    return getattr(settings, 'GITHUB_USERNAME', 'ElSancturioDeThomas')
+
+
+def _rate_limit_retry_after(response):
+    """Seconds until GitHub allows requests again, from the rate limit headers"""
+    retry_after = response.headers.get('Retry-After')
+    if retry_after and retry_after.isdigit():
+        return int(retry_after)
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        reset = response.headers.get('X-RateLimit-Reset', '')
+        if reset.isdigit():
+            return max(int(reset) - int(time.time()), 0)
+    return None
+
+
+CALENDAR_QUERY = """
+query($login: String!) {
+  user(login: $login) {
+    contributionsCollection {
+      contributionCalendar {
+        totalContributions
+        weeks {
+          contributionDays {
+            contributionLevel
+            contributionCount
+            date
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Only the recent window's days, plus the last-year total and window start used as a checksum
+RECENT_QUERY = """
+query($login: String!, $from: DateTime!, $to: DateTime!) {
+  user(login: $login) {
+    recent: contributionsCollection(from: $from, to: $to) {
+      contributionCalendar {
+        weeks {
+          contributionDays {
+            contributionCount
+            date
+          }
+        }
+      }
+    }
+    year: contributionsCollection {
+      startedAt
+      contributionCalendar {
+        totalContributions
+      }
+    }
+  }
+}
+"""
+
+
+def _graphql_user(token, username, query, variables):
+    """Run a GraphQL query and return its `user` object, raising ContributionsFetchError on failure"""
+    headers = {"Authorization": f"Bearer {token}"}
+
+    try:
+        # Queries only read, so a gateway error or dropped connection is safe to retry
+        response = get_client().post(
+            GRAPHQL_URL,
+            json={'query': query, 'variables': variables},
+            headers=headers,
+            idempotent=True,
+        )
+    except requests.exceptions.Timeout:
+        raise ContributionsFetchError('timeout', "GitHub API request timed out")
+    except requests.exceptions.RequestException as e:
+        raise ContributionsFetchError('network', f"GitHub API request failed: {e}")
+
+    # Handle different HTTP status codes
+    if response.status_code == 401:
+        raise ContributionsFetchError(
+            'auth', "GitHub API authentication failed - token may be invalid or expired")
+    if response.status_code == 429 or (
+            response.status_code == 403 and response.headers.get('X-RateLimit-Remaining') == '0'):
+        raise ContributionsFetchError(
+            'rate_limit', "GitHub API rate limit exceeded",
+            retry_after=_rate_limit_retry_after(response))
+    if response.status_code == 403:
+        raise ContributionsFetchError(
+            'forbidden', "GitHub API access forbidden - token may lack required permissions")
+    if response.status_code != 200:
+        raise ContributionsFetchError(
+            'http', f"GitHub API returned status {response.status_code}: {response.text[:200]}")
+
+    data = response.json()
+
+    # Check for GraphQL errors (even with 200 status)
+    if 'errors' in data:
+        error_messages = [err.get('message', 'Unknown error') for err in data['errors']]
+        raise ContributionsFetchError('graphql', f"GitHub GraphQL API errors: {', '.join(error_messages)}")
+
+    # Check if data structure is valid
+    if not ('data' in data and data['data'] and 'user' in data['data']):
+        raise ContributionsFetchError('invalid_response', f"Invalid response structure from GitHub API: {data}")
+
+    user_data = data['data']['user']
+
+    # Check if user exists (might be None if user not found)
+    if user_data is None:
+        raise ContributionsFetchError('not_found', f"GitHub user '{username}' not found")
+
+    return user_data
+
+
+def _request_contributions(token, username):
+    """Fetch the full last-year calendar"""
+    user_data = _graphql_user(token, username, CALENDAR_QUERY, {'login': username})
+
+    contributions_collection = user_data.get('contributionsCollection')
+    if not contributions_collection:
+        raise ContributionsFetchError(
+            'not_found', f"No contributions collection found for user '{username}'")
+
+    calendar_data = contributions_collection.get('contributionCalendar', {})
+    weeks = calendar_data.get('weeks', [])
+    total_contributions = calendar_data.get('totalContributions', 0)
+
+    if not weeks:
+        raise ContributionsFetchError('not_found', f"No contribution weeks found for user '{username}'")
+
+    return ContributionCalendar.from_weeks(weeks, total_contributions)
+
+
+def _request_recent_contributions(token, username, base):
+    """
+    Fetch only the days since the end of `base` (re-reading its last day, which may
+    have changed) and merge them into it. Returns None if the merged calendar does
+    not add up to GitHub's last-year total, meaning a full refetch is needed.
+    """
+    window_from = datetime.combine(base.end - timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    window_to = datetime.now(timezone.utc)
+    user_data = _graphql_user(token, username, RECENT_QUERY, {
+        'login': username,
+        'from': window_from.isoformat(),
+        'to': window_to.isoformat(),
+    })
+
+    recent = (user_data.get('recent') or {}).get('contributionCalendar') or {}
+    year = user_data.get('year') or {}
+    total_contributions = (year.get('contributionCalendar') or {}).get('totalContributions')
+    if total_contributions is None or not year.get('startedAt'):
+        raise ContributionsFetchError('invalid_response', "Incomplete incremental response from GitHub API")
+
+    days = [
+        (date.fromisoformat(day['date']), day.get('contributionCount', 0))
+        for week in recent.get('weeks', [])
+        for day in week.get('contributionDays', [])
+        if day['date'] >= window_from.date().isoformat()
+    ]
+    year_start = datetime.fromisoformat(year['startedAt'].replace('Z', '+00:00')).date()
+    calendar = base.merge(days, year_start, total_contributions)
+
+    if calendar.contributions_since(year_start) != total_contributions:
+        logger.info("GitHub contributions checksum mismatch - falling back to a full refetch")
+        return None
+    return calendar
+
+
+def fetch_github_contributions(base=None):
+    """
+    Fetch the contribution calendar from the GitHub GraphQL API.
+    With a `base` calendar only the recent days are fetched and merged into it,
+    falling back to the full calendar if the result does not add up.
+    Returns (calendar, full_sync), or None if the data could not be fetched or the
+    circuit breaker is open after recent failures.
+    """
+    # Get GitHub token from settings
+    token = getattr(settings, 'GITHUB_TOKEN', None)
+    username = _username()
+
+    if not token:
+        logger.warning("GitHub token not configured - contributions will not be displayed")
+        return None
+
+    open_failure = breaker.open_failure()
+    if open_failure:
+        logger.debug(f"GitHub circuit breaker open ({open_failure['failure_class']}) - skipping request")
+        return None
+
+    try:
+        result = None
+        if base:
+            result = _request_recent_contributions(token, username, base)
+        full_sync = result is None
+        if full_sync:
+            result = _request_contributions(token, username)
+    except ContributionsFetchError as e:
+        delay = breaker.record_failure(e.failure_class, str(e), retry_after=e.retry_after)
+        logger.error(f"{e} - backing off GitHub requests for {delay}s")
+        return None
+    except Exception as e:
+        delay = breaker.record_failure('unexpected', str(e))
+        logger.exception(f"Unexpected error fetching GitHub contributions: {e} - backing off for {delay}s")
+        return None
+
+    breaker.record_success()
+    sync_type = 'full' if full_sync else 'incremental'
+    logger.info(f"Successfully fetched GitHub contributions ({sync_type}): {result.total} total")
+    return result, full_sync
+
+
+def _soft_ttl():
+    return getattr(settings, 'GITHUB_CONTRIBUTIONS_SOFT_TTL', 900)
+
+
+def _hard_ttl():
+    return getattr(settings, 'GITHUB_CONTRIBUTIONS_HARD_TTL', 7 * 24 * 3600)
+
+
+def _full_sync_interval():
+    return getattr(settings, 'GITHUB_CONTRIBUTIONS_FULL_SYNC_INTERVAL', 24 * 3600)
+
+
+def contribution_graph_html(calendar):
+    """
+    HTML fragment of the contribution graph, including the month labels.
+    Rendered once per calendar and cached under its content hash, so page
+    views only inline the cached string.
+    """
+    if not calendar:
+        return ''
+    key = GRAPH_CACHE_KEY.format(digest=calendar.digest)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string('portfolio/components/contribution_graph.html', {
+            'weeks': list(calendar.weeks()),
+            'months': calendar.month_labels(),
+        })
+        cache.set(key, html, _hard_ttl())
+    return mark_safe(html)
+
+
+def store_contributions(calendar, fetched_at=None, full_synced_at=None):
+    """
+    Cache a contribution calendar; it is served until the hard TTL expires.
+    Replacing a cached calendar with different content drops this instance's cached
+    pages; everything shared is left to contributions_updated (see _fetch_entry).
+    """
+    fetched_at = fetched_at if fetched_at is not None else time.time()
+    previous = cache.get(CACHE_KEY)
+    entry = {
+        'data': calendar,
+        'fetched_at': fetched_at,
+        # When the calendar was last fetched in full rather than merged incrementally
+        'full_synced_at': full_synced_at if full_synced_at is not None else fetched_at,
+    }
+    cache.set(CACHE_KEY, entry, _hard_ttl())
+    # Render the graph now so no page view has to
+    contribution_graph_html(calendar)
+    if previous is not None and previous['data'].digest != calendar.digest:
+        invalidate_page_cache()
+    return entry
+
+
+def load_snapshot():
+    """
+    Load the last known good calendar from the database into the cache.
+    Returns the cache entry, or None if there is no snapshot. Nothing is announced:
+    the snapshot's content was announced when it was saved.
+    """
+    try:
+        snapshot = ContributionSnapshot.objects.filter(username=_username()).first()
+    except DatabaseError as e:
+        logger.error(f"Error loading GitHub contributions snapshot: {e}")
+        return None
+    if snapshot is None:
+        return None
+    logger.info("Loaded GitHub contributions snapshot from the database")
+    calendar = ContributionCalendar.from_json(snapshot.data)
+    return store_contributions(calendar, fetched_at=snapshot.fetched_at.timestamp())
+
+
+def save_snapshot(entry):
+    """
+    Persist a cache entry as the last known good calendar.
+    Returns True if its content differs from the stored snapshot (or there was none),
+    False if it is the same, or None if the database is unavailable.
+    """
+    calendar = entry['data']
+    try:
+        with transaction.atomic():
+            snapshot = ContributionSnapshot.objects.select_for_update().filter(username=_username()).first()
+            changed = snapshot is None or ContributionCalendar.from_json(snapshot.data).digest != calendar.digest
+            ContributionSnapshot.objects.update_or_create(
+                username=_username(),
+                defaults={
+                    'data': calendar.to_json(),
+                    'fetched_at': datetime.fromtimestamp(entry['fetched_at'], tz=timezone.utc),
+                },
+            )
+    except DatabaseError as e:
+        logger.error(f"Error saving GitHub contributions snapshot: {e}")
+        return None
+    return changed
+
+
+def _incremental_base(entry):
+    """
+    The cached calendar to sync incrementally from, or None when a full fetch is due:
+    incremental sync is disabled, nothing is cached, the cached calendar is too far behind,
+    or level estimates have drifted long enough since the last full fetch.
+    """
+    if not entry or not entry['data'] or not getattr(settings, 'GITHUB_CONTRIBUTIONS_INCREMENTAL', True):
+        return None
+    if time.time() - entry.get('full_synced_at', 0) >= _full_sync_interval():
+        return None
+    if (date.today() - entry['data'].end).days > INCREMENTAL_MAX_GAP_DAYS:
+        return None
+    return entry['data']
+
+
+def _fetch_entry():
+    """Fetch from GitHub and return the new cache entry, or None if the fetch failed"""
+    started = time.time()
+    previous = cache.get(CACHE_KEY)
+    result = fetch_github_contributions(base=_incremental_base(previous))
+    if result is None:
+        return None
+    calendar, full_sync = result
+    full_synced_at = None if full_sync else previous.get('full_synced_at')
+    entry = store_contributions(calendar, full_synced_at=full_synced_at)
+    # Compare against the durable snapshot rather than this instance's cache, which
+    # is empty on every cold start and would announce the same calendar again
+    if save_snapshot(entry):
+        contributions_updated.send(sender=ContributionCalendar, calendar=calendar)
+    # Clear the dirty flag unless a webhook marked it again while we were fetching
+    dirty_since = cache.get(DIRTY_KEY)
+    if dirty_since is not None and dirty_since <= started:
+        cache.delete(DIRTY_KEY)
+    return entry
+
+
+def refresh_github_contributions():
+    """Fetch fresh data from GitHub and cache it. Returns None if the fetch failed."""
+    entry = _fetch_entry()
+    return entry['data'] if entry else None
+
+
+def refresh_if_idle():
+    """Refresh now unless a refresh is already running. Returns False if one was."""
+    if not cache.add(REFRESH_LOCK_KEY, True, REFRESH_LOCK_TIMEOUT):
+        return False
+    try:
+        refresh_github_contributions()
+    finally:
+        cache.delete(REFRESH_LOCK_KEY)
+    return True
+
+
+def refresh_in_background():
+    """
+    Start a background refresh unless one is already running.
+    The lock lives in the cache so only one refresh runs per cache backend.
+    """
+    if not cache.add(REFRESH_LOCK_KEY, True, REFRESH_LOCK_TIMEOUT):
+        return False
+
+    def run():
+        try:
+            refresh_github_contributions()
+        except Exception as e:
+            logger.exception(f"Background GitHub contributions refresh failed: {e}")
+        finally:
+            cache.delete(REFRESH_LOCK_KEY)
+            # The thread opened its own database connection for the snapshot
+            connection.close()
+
+    # Daemon thread so a stuck request never blocks worker shutdown. On serverless
+    # platforms the thread may be frozen with the instance and finish on its next request.
+    threading.Thread(target=run, name='github-contributions-refresh', daemon=True).start()
+    return True
+
+
+def get_github_contributions():
+    """
+    Get GitHub contributions, serving cached or snapshotted data whenever there is any.
+    Past the soft TTL the stale calendar is returned and one background refresh runs;
+    visitors only wait on GitHub when nothing is cached at all.
+    """
+    entry = cache.get(CACHE_KEY)
+    if not entry:
+        # Cold instance: start from the durable snapshot and refresh it in the background
+        entry = load_snapshot()
+    if entry:
+        age = time.time() - entry['fetched_at']
+        if age >= _soft_ttl() or cache.get(DIRTY_KEY) is not None:
+            logger.debug(f"GitHub contributions are {int(age)}s old or dirty - refreshing in background")
+            refresh_in_background()
+        else:
+            logger.debug("Returning cached GitHub contributions")
+        return entry['data']
+
+    # Nothing cached: one caller fetches from GitHub and concurrent callers,
+    # in this process or others sharing the cache, reuse its result
+    entry = _fetch_flight.do(CACHE_KEY, _fetch_entry, lookup=lambda: cache.get(CACHE_KEY))
+    return entry['data'] if entry else empty_contributions()
+
+
+def contributions_status():
+    """Cache and circuit breaker state of the GitHub integration, for monitoring"""
+    entry = cache.get(CACHE_KEY)
+    return {
+        'cached': entry is not None,
+        'fetched_at': entry['fetched_at'] if entry else None,
+        'age_seconds': int(time.time() - entry['fetched_at']) if entry else None,
+        'soft_ttl': _soft_ttl(),
+        'hard_ttl': _hard_ttl(),
+        'refreshing': cache.get(REFRESH_LOCK_KEY) is not None,
+        'dirty_since': cache.get(DIRTY_KEY),
+        'breaker': breaker.state(),
+        'recent_calls': [timing.as_dict() for timing in get_client().timings(GITHUB_API_HOST)],
+    }
+
+
+def verify_webhook_signature(secret, body, signature_header):
+    """Check a GitHub X-Hub-Signature-256 header against the raw request body"""
+    if not secret or not signature_header.startswith('sha256='):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header[len('sha256='):])
+
+
+def mark_contributions_dirty():
+    """Mark the cached calendar as out of date so the next read refreshes it"""
+    cache.set(DIRTY_KEY, time.time(), _hard_ttl())
+
+
+def handle_webhook_event(event, body):
+    """
+    Handle a verified webhook event. Events that can change our contributions mark
+    the calendar dirty and refresh it right away (incrementally, so it stays within
+    GitHub's webhook timeout). Returns True if a refresh was triggered.
+    """
+    if event not in CONTRIBUTION_EVENTS:
+        return False
+    try:
+        payload = json.loads(body or b'{}')
+    except ValueError:
+        payload = {}
+    sender = (payload.get('sender') or {}).get('login') if isinstance(payload, dict) else None
+    if sender and sender.lower() != _username().lower():
+        logger.debug(f"Ignoring {event} webhook from {sender}")
+        return False
+
+    mark_contributions_dirty()
+    # If a refresh is already running, the dirty flag makes the next read refresh again
+    refresh_if_idle()
+    return True
@@ -0,0 +1,395 @@
+"""
+Image upload pipeline
+Uploaded images are processed before they are stored (see the pre_save handler in
+api.signals). The original is re-encoded without its EXIF, XMP and comment metadata
+(GPS positions included), with its orientation applied to the pixels; animated images
+keep every frame. The stored original is what renditions are made from, so it is not
+degraded: JPEGs keep their own quantization tables and chroma subsampling, WebP is
+saved lossless and other formats become PNG or a high-quality JPEG. The image's dimensions, dominant color and a tiny blurred preview
+(a data: URI of a few hundred bytes) are stored next to it, so pages can reserve the
+image's space and paint a placeholder before it loads. Images with transparent
+pixels get no color or placeholder, which would show through them.
+
+Responsive renditions are made after the save has committed, in a background thread
+(or inline when IMAGE_RENDITIONS_IN_BACKGROUND is off), so uploads do not wait on
+encoding them: the stored image is resized to the widths in IMAGE_RENDITION_WIDTHS
+and saved in AVIF and WebP (where Pillow supports them) and in JPEG (or PNG for
+images with transparency) as the fallback. Their names are recorded in the model's
+<field>_renditions JSON field, and the {% picture %} template tag
+(api.templatetags.images) turns them into <picture> elements with srcset and sizes;
+until then the image is served as a plain <img>. The generate_image_renditions
+command makes any that are missing (e.g. when a background thread was cut short),
+and backfill_image_metadata fills in the metadata of images uploaded before it was
+recorded. Recording renditions bumps the model's content version and purges it from
+the CDN but, unlike a content write, does not re-render pages or trigger a deploy.
+Renditions of replaced and deleted images are removed once the change has committed.
+"""
+import base64
+import io
+import logging
+import os
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+
+from .caching import invalidate_page_cache
+from .models import Project, Book, Photo, Skills
+from .purge import purge_tags
+from .versions import bump_version, version_key
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image, ImageOps, JpegImagePlugin, features
+except ImportError:
+    Image = None
+
+# Image fields stripped of their metadata on upload
+IMAGE_FIELDS = {
+    Project: ('image',),
+    Book: ('cover_image',),
+    Photo: ('image',),
+    Skills: ('icon',),
+}
+# Image fields shown on pages, which also get renditions in <field>_renditions and
+# their metadata in <field>_<key> (see EMPTY_METADATA)
+RENDITION_FIELDS = {
+    Project: ('image',),
+    Book: ('cover_image',),
+    Photo: ('image',),
+}
+
+# Encoder settings per output format, best compression first
+FORMATS = (
+    ('image/avif', 'AVIF', 'avif', {'quality': 50, 'speed': 8}),
+    ('image/webp', 'WEBP', 'webp', {'quality': 75, 'method': 4}),
+)
+JPEG = ('image/jpeg', 'JPEG', 'jpg', {'quality': 80, 'optimize': True, 'progressive': True})
+PNG = ('image/png', 'PNG', 'png', {'optimize': True})
+# Longest side of the inline placeholder, and of the copy the dominant color is taken from
+PLACEHOLDER_SIZE = 16
+COLOR_SAMPLE_SIZE = 64
+# Per-image metadata, stored in <field>_<key>; these values when there is no image
+EMPTY_METADATA = {'width': None, 'height': None, 'color': '', 'placeholder': ''}
+# Encoder settings of the stripped original per upload format; anything else is stored as
+# JPEG or PNG. JPEG uploads are re-encoded with their own tables (see _jpeg_tables)
+ORIGINAL_JPEG = ('image/jpeg', 'JPEG', 'jpg', {'quality': 95, 'optimize': True, 'progressive': True})
+ORIGINAL_FORMATS = {
+    'JPEG': ORIGINAL_JPEG,
+    'PNG': PNG,
+    'WEBP': ('image/webp', 'WEBP', 'webp', {'lossless': True, 'method': 4}),
+}
+# Formats whose animations are kept (APNG is PNG); other multi-frame files keep their first frame
+ANIMATED_FORMATS = ('GIF', 'PNG', 'WEBP')
+# Image.info keys holding metadata that re-encoding must not carry over
+METADATA_KEYS = ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment')
+
+
+def renditions_field(field_name):
+    return f'{field_name}_renditions'
+
+
+def metadata_field(field_name, key):
+    return f'{field_name}_{key}'
+
+
+def rendition_widths():
+    return sorted(getattr(settings, 'IMAGE_RENDITION_WIDTHS', (320, 640, 960, 1280, 1920)))
+
+
+def _supported(pil_format):
+    return Image is not None and features.check(pil_format.lower())
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def _encode(image, pil_format, options, icc_profile=None):
+    buffer = io.BytesIO()
+    if pil_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    extra = {'icc_profile': icc_profile} if icc_profile and pil_format in ('JPEG', 'PNG', 'WEBP', 'AVIF') else {}
+    # No exif= argument, so no EXIF block is written
+    image.save(buffer, pil_format, **options, **extra)
+    return buffer.getvalue()
+
+
+def _load(field_file):
+    """(upright Pillow image, its format, whether it is animated); multi-frame images give their first frame"""
+    field_file.open('rb')
+    field_file.seek(0)
+    image = Image.open(field_file)
+    source_format = image.format
+    animated = getattr(image, 'n_frames', 1) > 1 and source_format in ANIMATED_FORMATS
+    image = ImageOps.exif_transpose(image)
+    image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if _has_alpha(image) else 'RGB')
+    # Some encoders (JPEG comments, WebP XMP) write these back from image.info
+    for key in METADATA_KEYS:
+        image.info.pop(key, None)
+    return image, source_format, animated
+
+
+def _is_transparent(image):
+    return image.mode == 'RGBA' and image.getchannel('A').getextrema()[0] < 255
+
+
+def image_metadata(image):
+    """
+    {'width', 'height', 'color', 'placeholder'} of an upright Pillow image; the color
+    and placeholder are left empty for images with transparent pixels
+    """
+    if _is_transparent(image):
+        return {**EMPTY_METADATA, 'width': image.width, 'height': image.height}
+    sample = image.convert('RGB')
+    sample.thumbnail((COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE))
+    # The most common colour of a five-colour palette, rather than a muddy average
+    palette = sample.quantize(colors=5)
+    _, index = max(palette.getcolors())
+    red, green, blue = palette.getpalette()[index * 3:index * 3 + 3]
+
+    preview = image.copy()
+    preview.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    content_type, pil_format, _, _ = FORMATS[1] if _supported('WEBP') else JPEG
+    data = _encode(preview, pil_format, {'quality': 50})
+    return {
+        'width': image.width,
+        'height': image.height,
+        'color': f'#{red:02x}{green:02x}{blue:02x}',
+        'placeholder': f'data:{content_type};base64,{base64.b64encode(data).decode()}',
+    }
+
+
+def stored_image_metadata(field_file):
+    """image_metadata() of an already stored image, read back from its storage"""
+    try:
+        image, _, _ = _load(field_file)
+        return image_metadata(image)
+    finally:
+        field_file.close()
+
+
+def _strip_animated(field_file, source_format):
+    """Every frame of an animated upload re-encoded in its own format, without metadata"""
+    field_file.seek(0)
+    image = Image.open(field_file)
+    for key in METADATA_KEYS:
+        image.info.pop(key, None)
+    buffer = io.BytesIO()
+    # Frame durations, disposal and looping come from the frames themselves
+    image.save(buffer, source_format, save_all=True)
+    return buffer.getvalue()
+
+
+def _jpeg_tables(field_file):
+    """
+    Encoder options reusing a JPEG upload's quantization tables and chroma subsampling,
+    so re-encoding it adds next to no loss (what Pillow's quality='keep' does, which
+    only works on the unrotated image as opened)
+    """
+    field_file.seek(0)
+    source = Image.open(field_file)
+    if not getattr(source, 'quantization', None):
+        return {}
+    # An explicit quality would rescale the tables
+    options = {key: value for key, value in ORIGINAL_JPEG[3].items() if key != 'quality'}
+    options['qtables'] = source.quantization
+    sampling = JpegImagePlugin.get_sampling(source)
+    if sampling != -1:
+        options['subsampling'] = sampling
+    return options
+
+
+def strip_image(field_file):
+    """
+    Re-encode an uncommitted upload without its metadata.
+    Returns (stripped image as a ContentFile, metadata dict).
+    """
+    image, source_format, animated = _load(field_file)
+    metadata = image_metadata(image)
+    name = os.path.basename(field_file.name)
+    if animated:
+        return ContentFile(_strip_animated(field_file, source_format), name=name), metadata
+
+    original = ORIGINAL_FORMATS.get(source_format) or (PNG if _has_alpha(image) else ORIGINAL_JPEG)
+    if original[2] != os.path.splitext(name)[1].lower().lstrip('.').replace('jpeg', 'jpg'):
+        name = f'{os.path.splitext(name)[0]}.{original[2]}'
+    options = (source_format == 'JPEG' and _jpeg_tables(field_file)) or original[3]
+    data = _encode(image, original[1], options, image.info.get('icc_profile'))
+    return ContentFile(data, name=name), metadata
+
+
+def generate_renditions(field_file, upload_dir):
+    """
+    Store the renditions of a stored image and return them as recorded in
+    <field>_renditions. Animated images get none and are served as they are.
+    """
+    image, _, animated = _load(field_file)
+    if animated:
+        return {'sources': {}}
+    icc_profile = image.info.get('icc_profile')
+
+    fallback = PNG if _has_alpha(image) else JPEG
+    outputs = [fmt for fmt in FORMATS if _supported(fmt[1])] + [fallback]
+    # Never upscale; the original width is the largest rendition when it is narrower than the widest
+    widths = [width for width in rendition_widths() if width < image.width]
+    if image.width <= rendition_widths()[-1]:
+        widths.append(image.width)
+
+    storage = field_file.storage
+    token = uuid.uuid4().hex[:12]
+    stem = os.path.splitext(os.path.basename(field_file.name))[0][:40]
+    sources = {content_type: [] for content_type, *_ in outputs}
+    # Largest first, each step resized from the previous one to keep the work small
+    current = image
+    for width in sorted(widths, reverse=True):
+        height = max(1, round(image.height * width / image.width))
+        current = current.resize((width, height), Image.LANCZOS) if current.width != width else current
+        for content_type, pil_format, extension, options in outputs:
+            data = _encode(current, pil_format, options, icc_profile)
+            stored = storage.save(f'{upload_dir}renditions/{stem}-{token}-{width}w.{extension}', ContentFile(data))
+            sources[content_type].insert(0, {'width': width, 'name': stored})
+    return {'sources': sources}
+
+
+def delete_renditions(storage, renditions):
+    """Remove the files of recorded renditions from storage"""
+    for entries in ((renditions or {}).get('sources') or {}).values():
+        for entry in entries:
+            try:
+                storage.delete(entry['name'])
+            except Exception as e:
+                logger.error(f"Error deleting rendition {entry['name']}: {e}")
+
+
+def _upload_dir(model, field_name):
+    upload_to = model._meta.get_field(field_name).upload_to
+    return upload_to if isinstance(upload_to, str) else ''
+
+
+def store_renditions(model, pk, field_name):
+    """
+    Generate and record the renditions of one stored image, replacing (and deleting)
+    any recorded before. Returns whether they were recorded: if the image was replaced
+    or its row deleted in the meantime, the new files are deleted again instead.
+    """
+    instance = model.objects.filter(pk=pk).only('pk', field_name, renditions_field(field_name)).first()
+    field_file = getattr(instance, field_name, None)
+    if not field_file:
+        return False
+    previous = getattr(instance, renditions_field(field_name))
+    try:
+        renditions = generate_renditions(field_file, _upload_dir(model, field_name))
+    finally:
+        field_file.close()
+    updated = model.objects.filter(pk=pk, **{field_name: field_file.name}).update(
+        **{renditions_field(field_name): renditions}
+    )
+    if not updated:
+        delete_renditions(field_file.storage, renditions)
+        return False
+    delete_renditions(field_file.storage, previous)
+    _renditions_changed(model)
+    return True
+
+
+def _renditions_changed(model):
+    """
+    Refresh what shows the renditions: cached pages, ETags and the CDN. Not a full
+    content change: pre-rendered pages built before this are simply served live until
+    the next deploy (which makes missing renditions first), rather than each upload's
+    renditions re-rendering pages and triggering a deploy of their own.
+    """
+    invalidate_page_cache()
+    bump_version(model)
+    purge_tags([version_key(model)])
+
+
+def _store_all(model, pk, field_names):
+    for field_name in field_names:
+        try:
+            store_renditions(model, pk, field_name)
+        except Exception as e:
+            logger.exception(f"Error generating renditions of {model._meta.label} #{pk} {field_name}: {e}")
+
+
+def _start_renditions(model, pk, field_names):
+    if not getattr(settings, 'IMAGE_RENDITIONS_IN_BACKGROUND', True):
+        _store_all(model, pk, field_names)
+        return
+
+    def run():
+        try:
+            _store_all(model, pk, field_names)
+        finally:
+            # The thread opened its own database connection
+            connection.close()
+
+    # Daemon thread, like the GitHub refresh; renditions a frozen or recycled instance
+    # never finishes are left to the generate_image_renditions command
+    threading.Thread(target=run, name='image-renditions', daemon=True).start()
+
+
+def _set_metadata(instance, field_name, metadata):
+    for key, value in {**EMPTY_METADATA, **metadata}.items():
+        setattr(instance, metadata_field(field_name, key), value)
+
+
+def process_images(instance):
+    """
+    Strip every new upload on `instance` (called before it is saved). Renditions of
+    new uploads are left for schedule_renditions(); those of replaced or cleared
+    images are deleted once the save commits.
+    """
+    if Image is None:
+        return
+    model = type(instance)
+    pending = []
+    for field_name in IMAGE_FIELDS.get(model, ()):
+        field_file = getattr(instance, field_name)
+        has_renditions = field_name in RENDITION_FIELDS.get(model, ())
+        if field_file and field_file._committed:
+            continue  # Already stored and processed
+        if has_renditions:
+            previous = getattr(instance, renditions_field(field_name))
+            if previous:
+                storage = instance._meta.get_field(field_name).storage
+                transaction.on_commit(lambda storage=storage, previous=previous: delete_renditions(storage, previous))
+            setattr(instance, renditions_field(field_name), {})
+        if not field_file:
+            if has_renditions:
+                _set_metadata(instance, field_name, {})
+            continue
+        try:
+            stripped, metadata = strip_image(field_file)
+        except Exception as e:
+            # Not an image Pillow can read, or a storage error: keep the upload as it is
+            logger.error(f"Error processing {instance._meta.label}.{field_name} upload: {e}")
+            continue
+        setattr(instance, field_name, stripped)
+        if has_renditions:
+            _set_metadata(instance, field_name, metadata)
+            pending.append(field_name)
+    instance._pending_renditions = pending
+
+
+def schedule_renditions(instance):
+    """Generate the renditions of the uploads process_images() left pending, after the save commits"""
+    field_names = instance.__dict__.pop('_pending_renditions', None)
+    if field_names:
+        model, pk = type(instance), instance.pk
+        transaction.on_commit(lambda: _start_renditions(model, pk, field_names))
+
+
+def remove_renditions(instance):
+    """Delete the renditions of a deleted instance's images, after the delete commits"""
+    for field_name in RENDITION_FIELDS.get(type(instance), ()):
+        renditions = getattr(instance, renditions_field(field_name))
+        if renditions:
+            storage = instance._meta.get_field(field_name).storage
+            transaction.on_commit(lambda storage=storage, renditions=renditions: delete_renditions(storage, renditions))
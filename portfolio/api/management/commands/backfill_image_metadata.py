@@ -0,0 +1,49 @@
+"""
+Fill in the stored dimensions, dominant color and placeholder (see api.images) of images
+uploaded before they were recorded. New uploads get them on save; this reads each
+older image back from storage once. Rows are written with update(), so updated_at and
+the change feed are left alone, and the caches of each changed model are invalidated
+once at the end.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from api.images import RENDITION_FIELDS, EMPTY_METADATA, metadata_field, stored_image_metadata
+from api.signals import content_changed
+
+
+class Command(BaseCommand):
+    help = "Compute missing width, height, dominant color and placeholder of stored images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help="Recompute every image, not only those without stored dimensions",
+        )
+
+    def handle(self, *args, **options):
+        total = failed = 0
+        for model, field_names in RENDITION_FIELDS.items():
+            updated = 0
+            for field_name in field_names:
+                rows = model.objects.exclude(Q(**{field_name: ''}) | Q(**{f'{field_name}__isnull': True}))
+                if not options['force']:
+                    rows = rows.filter(**{f"{metadata_field(field_name, 'width')}__isnull": True})
+                for instance in rows.only('pk', field_name).iterator():
+                    field_file = getattr(instance, field_name)
+                    try:
+                        metadata = stored_image_metadata(field_file)
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"{model._meta.label} #{instance.pk} ({field_file.name}): {e}")
+                        continue
+                    model.objects.filter(pk=instance.pk).update(**{
+                        metadata_field(field_name, key): metadata[key] for key in EMPTY_METADATA
+                    })
+                    updated += 1
+            if updated:
+                content_changed(model)
+                self.stdout.write(f"{model._meta.verbose_name_plural}: {updated}")
+            total += updated
+        style = self.style.WARNING if failed else self.style.SUCCESS
+        self.stdout.write(style(f"Updated {total} images, {failed} could not be read"))
@@ -0,0 +1,65 @@
+"""
+Compare the cached forms of the GitHub contribution calendar (see api.contributions).
+Pickles a synthetic year of contributions as the raw GraphQL dicts and as the packed
+ContributionCalendar, the way LocMemCache does, and prints the payload size and the
+mean dumps/loads time of each.
+"""
+import pickle
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from api.contributions import LEVELS, ContributionCalendar
+
+
+def _weeks(days):
+    """GraphQL `weeks` for `days` days ending today, with random counts"""
+    day = date.today() - timedelta(days=days - 1)
+    weeks, week = [], []
+    for _ in range(days):
+        if week and day.weekday() == 6:
+            weeks.append({'contributionDays': week})
+            week = []
+        count = random.choice((0, 0, 1, 2, 3, 5, 8, 13))
+        week.append({
+            'date': day.isoformat(),
+            'contributionCount': count,
+            'contributionLevel': LEVELS[min(count, 4)],
+        })
+        day += timedelta(days=1)
+    weeks.append({'contributionDays': week})
+    return weeks
+
+
+def _mean(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+class Command(BaseCommand):
+    help = "Benchmark the pickled size and round-trip time of the cached contribution calendar"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=371, help="Days in the calendar")
+        parser.add_argument('--repeat', type=int, default=2000, help="Runs per measurement (the mean is shown)")
+
+    def handle(self, *args, **options):
+        weeks = _weeks(options['days'])
+        total = sum(day['contributionCount'] for week in weeks for day in week['contributionDays'])
+        candidates = [
+            ('raw GraphQL dicts', {'total_contributions': total, 'weeks': weeks}),
+            ('packed calendar', ContributionCalendar.from_weeks(weeks, total)),
+        ]
+
+        repeat = options['repeat']
+        self.stdout.write(f"{options['days']} days, pickle protocol {pickle.HIGHEST_PROTOCOL}, mean of {repeat} runs")
+        self.stdout.write(f"{'form':<20}{'size (bytes)':>14}{'dumps (us)':>12}{'loads (us)':>12}")
+        for name, value in candidates:
+            payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            dumps = _mean(lambda: pickle.dumps(value, pickle.HIGHEST_PROTOCOL), repeat)
+            loads = _mean(lambda: pickle.loads(payload), repeat)
+            self.stdout.write(f"{name:<20}{len(payload):>14}{dumps * 1e6:>12.1f}{loads * 1e6:>12.1f}")
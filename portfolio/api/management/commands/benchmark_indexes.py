@@ -0,0 +1,121 @@
+"""
+Measure what the list and lookup indexes (see models.py) buy on a large table.
+Seeds --rows books, hobbies, skills and countries, then runs the queries behind the
+list endpoints and the skill name checks with the indexes in place and again after
+dropping them, printing the best time and the query plan of each. Everything runs in
+one transaction that is always rolled back, so the database is left as it was.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models.functions import Upper
+
+from api.batch import SKILLS, _existing_names
+from api.models import Book, Country, Hobby, Skills
+
+PREFIX = 'benchmark-'
+
+# Indexes the queries below depend on; Country's unique name index is a constraint and stays
+INDEXES = ['api_book_created_id', 'api_hobby_category_name', 'api_skills_name_upper']
+
+CATEGORIES = ['Programming Languages', 'Soft', 'Hard', 'Spoken Languages']
+
+
+class Rollback(Exception):
+    pass
+
+
+def _seed(rows):
+    batch_size = 2000
+    Book.objects.bulk_create(
+        (Book(title=f'{PREFIX}{i}', author=f'Author {i % 500}', rating=i % 5 + 1) for i in range(rows)),
+        batch_size=batch_size,
+    )
+    Hobby.objects.bulk_create(
+        (Hobby(name=f'{PREFIX}{i}', category=f'Category {i % 20}') for i in range(rows)),
+        batch_size=batch_size,
+    )
+    Skills.objects.bulk_create(
+        (Skills(name=f'{PREFIX}{i}', category=CATEGORIES[i % 4]) for i in range(rows)),
+        batch_size=batch_size,
+    )
+    Country.objects.bulk_create(
+        (Country(name=f'{PREFIX}{i}', code='XX') for i in range(rows)),
+        batch_size=batch_size,
+    )
+
+
+def _queries(rows):
+    """(name, queryset to explain, callable to time) for the queries the indexes serve"""
+    names = [f'{PREFIX.upper()}{i}' for i in range(0, rows, max(1, rows // 100))]
+    upper_in = Skills.objects.annotate(upper_name=Upper('name')).filter(upper_name__in=names).order_by()
+    books = Book.objects.order_by('-created_at', '-id').values('id', 'title', 'author', 'rating')[:10]
+    hobbies = Hobby.objects.order_by('category', 'name').values(
+        'id', 'name', 'reason', 'category', 'social', 'icon', 'created_at',
+    )[:10]
+    iexact = Skills.objects.filter(name__iexact=f'{PREFIX.upper()}{rows // 2}')
+    countries = Country.objects.order_by('name').values('id', 'name')[:10]
+    return [
+        # .all() so each run queries again instead of reading the result cache
+        ('books page', books, lambda: list(books.all())),
+        ('hobbies page', hobbies, lambda: list(hobbies.all())),
+        ('skill name__iexact', iexact, iexact.exists),
+        ('skill UPPER(name) IN', upper_in, lambda: _existing_names(SKILLS, names)),
+        ('countries by name', countries, lambda: list(countries.all())),
+    ]
+
+
+def _plan(queryset, title):
+    """
+    The query plan on one line. Not queryset.explain(): SQLite keeps the plan of a cached
+    EXPLAIN statement after the indexes are dropped, so the SQL is made unique per phase.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} /* {title} */ {sql}', params)
+        return ' / '.join(' '.join(str(row[-1]).split()) for row in cursor.fetchall())
+
+
+def _best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = "Benchmark the list and lookup queries with and without their indexes (rolled back afterwards)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help="Rows seeded per table")
+        parser.add_argument('--repeat', type=int, default=20, help="Runs per measurement (best is kept)")
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        self.stdout.write(f"{rows} rows per table, {connection.vendor}, best of {repeat} runs")
+        try:
+            with transaction.atomic():
+                _seed(rows)
+                if connection.vendor == 'postgresql':
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE')
+                self._report('with indexes', rows, repeat)
+                # Plain DDL rather than schema_editor.remove_index(), which SQLite refuses inside a transaction
+                editor = connection.schema_editor()
+                with connection.cursor() as cursor:
+                    for name in INDEXES:
+                        cursor.execute(editor.sql_delete_index % {'name': editor.quote_name(name)})
+                self._report('without indexes', rows, repeat)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _report(self, title, rows, repeat):
+        self.stdout.write(f"\n{title}")
+        for name, queryset, fn in _queries(rows):
+            elapsed = _best(fn, repeat)
+            self.stdout.write(f"  {name:<22}{elapsed * 1000:>9.2f} ms  {_plan(queryset, title)}")
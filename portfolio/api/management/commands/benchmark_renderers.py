@@ -0,0 +1,60 @@
+"""
+Compare the API renderers (see api.renderers) on synthetic list responses.
+Prints the best-of-N serialization time and payload size per renderer and list size.
+"""
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+
+
+def _rows(count):
+    now = timezone.now()
+    return {
+        'results': [{
+            'id': i,
+            'title': f'Item {i}',
+            'description': 'A reasonably sized description of a portfolio item. ' * 2,
+            'rating': Decimal('4.5'),
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now,
+        } for i in range(count)],
+        'count': count,
+        'next': None,
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark serialization time and payload size of the API renderers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,1000,100000', help="Comma-separated list lengths")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement (best is kept)")
+
+    def handle(self, *args, **options):
+        candidates = [
+            ('DRF JSONRenderer (stdlib)', JSONRenderer().render),
+            ('dumps, json backend', lambda data: renderers.dumps(data, 'json')),
+        ]
+        if renderers.orjson is not None:
+            candidates.append(('dumps, orjson backend', lambda data: renderers.dumps(data, 'orjson')))
+        if renderers.msgpack is not None:
+            candidates.append(('MessagePack', renderers.packb))
+
+        self.stdout.write(f"{'items':>8}  {'renderer':<28}{'time (ms)':>12}{'size (KiB)':>12}")
+        for size in [int(size) for size in options['sizes'].split(',')]:
+            data = _rows(size)
+            repeat = options['repeat'] if size < 100000 else max(1, options['repeat'] // 2)
+            for name, render in candidates:
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    payload = render(data)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                self.stdout.write(f"{size:>8}  {name:<28}{best * 1000:>12.3f}{len(payload) / 1024:>12.1f}")
@@ -0,0 +1,41 @@
+"""
+Make the responsive renditions (see api.images) of stored images that have none yet.
+Uploads normally get them in a background thread after they are saved; this catches
+the ones it did not finish (e.g. on a serverless instance frozen or recycled first)
+and runs on each build. Renditions are recorded with update(), so updated_at and the
+change feed are left alone.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from api.images import RENDITION_FIELDS, renditions_field, store_renditions
+
+
+class Command(BaseCommand):
+    help = "Generate missing AVIF/WebP/JPEG renditions of stored images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help="Regenerate the renditions of every image (the old files are deleted)",
+        )
+
+    def handle(self, *args, **options):
+        total = failed = 0
+        for model, field_names in RENDITION_FIELDS.items():
+            for field_name in field_names:
+                rows = model.objects.exclude(Q(**{field_name: ''}) | Q(**{f'{field_name}__isnull': True}))
+                if not options['force']:
+                    rows = rows.filter(**{renditions_field(field_name): {}})
+                updated = 0
+                for pk in rows.values_list('pk', flat=True).iterator():
+                    try:
+                        updated += store_renditions(model, pk, field_name)
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"{model._meta.label} #{pk} ({field_name}): {e}")
+                if updated:
+                    self.stdout.write(f"{model._meta.verbose_name_plural}: {updated}")
+                total += updated
+        style = self.style.WARNING if failed else self.style.SUCCESS
+        self.stdout.write(style(f"Generated renditions of {total} images, {failed} could not be read"))
@@ -0,0 +1,29 @@
+"""
+Render the public pages into PRERENDER_ROOT (see api.prerender).
+Run at build/deploy time after collectstatic so the pages link to the hashed static files.
+Failures are reported but never fail the build; pages are then rendered per request.
+"""
+from django.core.management.base import BaseCommand
+
+from api.prerender import prerender
+
+
+class Command(BaseCommand):
+    help = "Pre-render the home, skills and library pages to static files"
+
+    def handle(self, *args, **options):
+        try:
+            pages = prerender()
+        except Exception as e:
+            self.stderr.write(self.style.WARNING(f"Pre-rendering failed: {e}"))
+            return
+
+        if pages is None:
+            self.stderr.write(self.style.WARNING(
+                "Content versions could not be read - pages were not pre-rendered"
+            ))
+            return
+
+        for page in pages:
+            self.stdout.write(f"  {page.url} -> {page.filename}")
+        self.stdout.write(self.style.SUCCESS(f"Pre-rendered {len(pages)} pages"))
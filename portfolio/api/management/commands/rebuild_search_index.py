@@ -0,0 +1,16 @@
+"""
+Re-create the full-text search entries (see api.search) from the content tables.
+Saves keep the index current on their own; this is for repairs and for content written
+with signals bypassed (e.g. raw SQL or loaddata --no-signals).
+"""
+from django.core.management.base import BaseCommand
+
+from api.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of projects, books, photos, skills and hobbies"
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} items"))
@@ -0,0 +1,29 @@
+"""
+Fetch the GitHub contribution calendar and store it as the durable snapshot.
+Run at build/deploy time so the first request on a cold instance never waits on GitHub.
+Failures are reported but never fail the build.
+"""
+from django.core.management.base import BaseCommand
+
+from api.github import refresh_github_contributions
+
+
+class Command(BaseCommand):
+    help = "Fetch GitHub contributions and store the last known good snapshot in the database"
+
+    def handle(self, *args, **options):
+        try:
+            result = refresh_github_contributions()
+        except Exception as e:
+            self.stderr.write(self.style.WARNING(f"GitHub contributions sync failed: {e}"))
+            return
+
+        if result is None:
+            self.stderr.write(self.style.WARNING(
+                "GitHub contributions could not be fetched - existing snapshot left unchanged"
+            ))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored GitHub contributions snapshot: {result.total} total"
+        ))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0015_add_description_field_to_skills"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContributionSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("username", models.CharField(max_length=100, unique=True)),
+                (
+                    "data",
+                    models.JSONField(
+                        help_text="Contribution calendar as cached by the GitHub integration"
+                    ),
+                ),
+                (
+                    "fetched_at",
+                    models.DateTimeField(
+                        help_text="When the calendar was fetched from GitHub"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Contribution Snapshot",
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0016_contributionsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Model label (e.g. api.project) or other content key",
+                        max_length=100,
+                        unique=True,
+                    ),
+                ),
+                ("version", models.PositiveBigIntegerField(default=0)),
+                (
+                    "updated_at",
+                    models.DateTimeField(help_text="When the content last changed"),
+                ),
+            ],
+            options={
+                "verbose_name": "Content Version",
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0017_contentversion"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["created_at", "id"], name="api_book_created_id"),
+        ),
+        migrations.AddIndex(
+            model_name="hobby",
+            index=models.Index(
+                fields=["category", "name"], name="api_hobby_category_name"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photo",
+            index=models.Index(
+                fields=["created_at", "id"], name="api_photo_created_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["created_at", "id"], name="api_project_created_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skills",
+            index=models.Index(
+                fields=["category", "name"], name="api_skills_category_name"
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0018_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PortfolioSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                (
+                    "digest",
+                    models.CharField(
+                        help_text="Content versions the document was built from",
+                        max_length=32,
+                    ),
+                ),
+                ("document", models.TextField(help_text="Serialized JSON document")),
+                ("built_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Portfolio Snapshot",
+            },
+        ),
+    ]
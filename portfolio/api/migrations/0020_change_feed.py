@@ -0,0 +1,115 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:56
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Existing rows were last changed no later than they were created, as far as we know"""
+    for model_name in ("Book", "Country", "Hobby", "Photo", "Skills"):
+        apps.get_model("api", model_name).objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0019_portfoliosnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "collection",
+                    models.CharField(
+                        help_text="Public collection name (e.g. projects)",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.PositiveBigIntegerField(
+                        help_text="Primary key of the deleted item"
+                    ),
+                ),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="country",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="hobby",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="skills",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["updated_at", "id"], name="api_book_updated_id"),
+        ),
+        migrations.AddIndex(
+            model_name="country",
+            index=models.Index(
+                fields=["updated_at", "id"], name="api_country_updated_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hobby",
+            index=models.Index(
+                fields=["updated_at", "id"], name="api_hobby_updated_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photo",
+            index=models.Index(
+                fields=["updated_at", "id"], name="api_photo_updated_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["updated_at", "id"], name="api_project_updated_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skills",
+            index=models.Index(
+                fields=["updated_at", "id"], name="api_skills_updated_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["deleted_at", "id"], name="api_tombstone_deleted_id"
+            ),
+        ),
+    ]
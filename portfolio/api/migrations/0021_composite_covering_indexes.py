@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:02
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0020_change_feed"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="book",
+            name="api_book_created_id",
+        ),
+        migrations.RemoveIndex(
+            model_name="hobby",
+            name="api_hobby_category_name",
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["created_at", "id"],
+                include=("title", "author", "rating"),
+                name="api_book_created_id",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hobby",
+            index=models.Index(
+                fields=["category", "name"],
+                include=("id", "reason", "social", "icon", "created_at"),
+                name="api_hobby_category_name",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skills",
+            index=models.Index(
+                django.db.models.functions.text.Upper("name"),
+                name="api_skills_name_upper",
+            ),
+        ),
+    ]
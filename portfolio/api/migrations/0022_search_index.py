@@ -0,0 +1,154 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:05
+
+from django.db import migrations, models
+
+# Full-text index over api_searchentry (see api.search). Django has no portable field for
+# it, so it is created here per database: a generated, weighted tsvector column with a GIN
+# index on PostgreSQL, and an external-content FTS5 table kept in sync by triggers on SQLite.
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE api_searchentry ADD COLUMN document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX api_searchentry_document ON api_searchentry USING GIN (document)",
+]
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS api_searchentry_document",
+    "ALTER TABLE api_searchentry DROP COLUMN IF EXISTS document",
+]
+SQLITE_FORWARD = [
+    # prefix='2 3' adds prefix indexes so type-ahead queries ("ab"*) stay index lookups
+    """
+    CREATE VIRTUAL TABLE api_searchentry_fts USING fts5(
+        title, body, content='api_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER api_searchentry_fts_insert AFTER INSERT ON api_searchentry BEGIN
+        INSERT INTO api_searchentry_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER api_searchentry_fts_delete AFTER DELETE ON api_searchentry BEGIN
+        INSERT INTO api_searchentry_fts (api_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER api_searchentry_fts_update AFTER UPDATE ON api_searchentry BEGIN
+        INSERT INTO api_searchentry_fts (api_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO api_searchentry_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS api_searchentry_fts_update",
+    "DROP TRIGGER IF EXISTS api_searchentry_fts_delete",
+    "DROP TRIGGER IF EXISTS api_searchentry_fts_insert",
+    "DROP TABLE IF EXISTS api_searchentry_fts",
+]
+
+# Searchable text per content model, as in api.search.SEARCH_SOURCES
+SOURCES = {
+    "projects": ("Project", "title", ("description",)),
+    "books": ("Book", "title", ("author",)),
+    "photos": ("Photo", "title", ()),
+    "skills": ("Skills", "name", ("category", "description")),
+    "hobbies": ("Hobby", "name", ("category", "reason")),
+}
+
+
+def _execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _execute(schema_editor, POSTGRESQL_FORWARD)
+    elif vendor == "sqlite":
+        try:
+            with schema_editor.connection.cursor() as cursor:
+                cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+                cursor.execute("DROP TABLE temp.fts5_probe")
+        except Exception:
+            return  # SQLite built without FTS5: api.search falls back to icontains
+        _execute(schema_editor, SQLITE_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _execute(schema_editor, POSTGRESQL_BACKWARD)
+    elif vendor == "sqlite":
+        _execute(schema_editor, SQLITE_BACKWARD)
+
+
+def index_existing_content(apps, schema_editor):
+    SearchEntry = apps.get_model("api", "SearchEntry")
+    for collection, (model_name, title, body) in SOURCES.items():
+        SearchEntry.objects.bulk_create(
+            [
+                SearchEntry(
+                    collection=collection,
+                    object_id=item.pk,
+                    title=(getattr(item, title) or "")[:200],
+                    body=" ".join(
+                        str(getattr(item, field) or "") for field in body
+                    ).strip(),
+                )
+                for item in apps.get_model("api", model_name).objects.iterator()
+            ],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0021_composite_covering_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "collection",
+                    models.CharField(
+                        help_text="Public collection name (e.g. projects)",
+                        max_length=50,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("title", models.CharField(max_length=200)),
+                ("body", models.TextField(blank=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Search entries",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("collection", "object_id"),
+                        name="api_searchentry_unique_object",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(index_existing_content, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0022_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="cover_image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive renditions (see api.images)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive renditions (see api.images)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive renditions (see api.images)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="skills",
+            name="icon_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive renditions (see api.images)",
+            ),
+        ),
+    ]
@@ -0,0 +1,137 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0023_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="cover_image_color",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Dominant color (#rrggbb)",
+                max_length=7,
+            ),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="cover_image_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="cover_image_placeholder",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Tiny blurred preview as a data: URI",
+            ),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="cover_image_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="image_color",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Dominant color (#rrggbb)",
+                max_length=7,
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="image_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="image_placeholder",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Tiny blurred preview as a data: URI",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="image_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="image_color",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Dominant color (#rrggbb)",
+                max_length=7,
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="image_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="image_placeholder",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Tiny blurred preview as a data: URI",
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="image_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="skills",
+            name="icon_color",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Dominant color (#rrggbb)",
+                max_length=7,
+            ),
+        ),
+        migrations.AddField(
+            model_name="skills",
+            name="icon_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="skills",
+            name="icon_placeholder",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Tiny blurred preview as a data: URI",
+            ),
+        ),
+        migrations.AddField(
+            model_name="skills",
+            name="icon_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0024_image_metadata"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="skills",
+            name="icon_renditions",
+        ),
+    ]
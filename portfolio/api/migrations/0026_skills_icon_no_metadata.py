@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:43
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0025_skills_icon_no_renditions"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="skills",
+            name="icon_color",
+        ),
+        migrations.RemoveField(
+            model_name="skills",
+            name="icon_height",
+        ),
+        migrations.RemoveField(
+            model_name="skills",
+            name="icon_placeholder",
+        ),
+        migrations.RemoveField(
+            model_name="skills",
+            name="icon_width",
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
@@ -10,9 +11,12 @@ class Country(models.Model):
     flag_emoji = models.CharField(max_length=10, blank=True, help_text="Flag emoji or icon")
     thoughts = models.CharField(max_length=50, blank=True, help_text="One word opinion about the country")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['name']
+        # Backs the change feed on (updated_at, id)
+        indexes = [models.Index(fields=['updated_at', 'id'], name='api_country_updated_id')]
         verbose_name_plural = "Countries"
 
     def __str__(self):
@@ -24,11 +28,22 @@ class Project(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     image = models.ImageField(upload_to='projects/', help_text="Project image (required)")
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Responsive renditions (see api.images)")
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, default='', editable=False, help_text="Dominant color (#rrggbb)")
+    image_placeholder = models.TextField(blank=True, default='', editable=False, help_text="Tiny blurred preview as a data: URI")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        # Backs keyset pagination on (created_at, id)
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='api_project_created_id'),
+            # Backs the change feed on (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='api_project_updated_id'),
+        ]
 
     def __str__(self):
         return self.title
@@ -45,10 +60,22 @@ class Book(models.Model):
         help_text="Rating from 1-5"
     )
     cover_image = models.ImageField(upload_to='books/', help_text="Book cover image (required)")
+    cover_image_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Responsive renditions (see api.images)")
+    cover_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    cover_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    cover_image_color = models.CharField(max_length=7, blank=True, default='', editable=False, help_text="Dominant color (#rrggbb)")
+    cover_image_placeholder = models.TextField(blank=True, default='', editable=False, help_text="Tiny blurred preview as a data: URI")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        # Backs keyset pagination on (created_at, id), covering /api/books/ on PostgreSQL
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='api_book_created_id', include=['title', 'author', 'rating']),
+            # Backs the change feed on (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='api_book_updated_id'),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
@@ -58,10 +85,22 @@ class Photo(models.Model):
     """Photos in the library"""
     title = models.CharField(max_length=200)
     image = models.ImageField(upload_to='photos/', help_text="Photo image (required)")
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Responsive renditions (see api.images)")
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, default='', editable=False, help_text="Dominant color (#rrggbb)")
+    image_placeholder = models.TextField(blank=True, default='', editable=False, help_text="Tiny blurred preview as a data: URI")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        # Backs keyset pagination on (created_at, id)
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='api_photo_created_id'),
+            # Backs the change feed on (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='api_photo_updated_id'),
+        ]
 
     def __str__(self):
         return self.title
@@ -81,9 +120,19 @@ class Hobby(models.Model):
     category = models.CharField(max_length=50, blank=True, help_text="e.g., Sports, Arts, Music")
     icon = models.CharField(max_length=100, blank=True, help_text="Icon class or name")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['category', 'name']
+        # Backs keyset pagination on (category, name), covering /api/hobbies/ on PostgreSQL
+        indexes = [
+            models.Index(
+                fields=['category', 'name'], name='api_hobby_category_name',
+                include=['id', 'reason', 'social', 'icon', 'created_at'],
+            ),
+            # Backs the change feed on (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='api_hobby_updated_id'),
+        ]
         verbose_name_plural = "Hobbies"
 
     def __str__(self):
@@ -111,9 +160,18 @@ class Skills(models.Model):
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['category', 'name']
+        # Backs keyset pagination on (category, name)
+        indexes = [
+            models.Index(fields=['category', 'name'], name='api_skills_category_name'),
+            # Backs the change feed on (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='api_skills_updated_id'),
+            # Case-insensitive name lookups: name__iexact is UPPER(name) = UPPER(%s) on PostgreSQL
+            models.Index(Upper('name'), name='api_skills_name_upper'),
+        ]
         verbose_name = "Skill"
         verbose_name_plural = "Skills"
 
@@ -121,3 +179,77 @@ class Skills(models.Model):
         return self.name
 
 
+class ContributionSnapshot(models.Model):
+    """Last known good GitHub contribution calendar, kept in the database so it survives cold starts"""
+    username = models.CharField(max_length=100, unique=True)
+    data = models.JSONField(help_text="Contribution calendar as cached by the GitHub integration")
+    fetched_at = models.DateTimeField(help_text="When the calendar was fetched from GitHub")
+
+    class Meta:
+        verbose_name = "Contribution Snapshot"
+
+    def __str__(self):
+        return f"{self.username} ({self.fetched_at:%Y-%m-%d %H:%M})"
+
+
+class ContentVersion(models.Model):
+    """Change stamp for one kind of content, bumped on every save and delete (see api.versions)"""
+    key = models.CharField(max_length=100, unique=True, help_text="Model label (e.g. api.project) or other content key")
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(help_text="When the content last changed")
+
+    class Meta:
+        verbose_name = "Content Version"
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+
+class PortfolioSnapshot(models.Model):
+    """Precomputed JSON document of all public collections, rebuilt on writes (see api.snapshot)"""
+    name = models.CharField(max_length=100, unique=True)
+    digest = models.CharField(max_length=32, help_text="Content versions the document was built from")
+    document = models.TextField(help_text="Serialized JSON document")
+    built_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Portfolio Snapshot"
+
+    def __str__(self):
+        return f"{self.name} ({self.built_at:%Y-%m-%d %H:%M})"
+
+
+class Tombstone(models.Model):
+    """Record of a deleted portfolio item, so the change feed can report deletions (see api.changes)"""
+    collection = models.CharField(max_length=50, help_text="Public collection name (e.g. projects)")
+    object_id = models.PositiveBigIntegerField(help_text="Primary key of the deleted item")
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # Backs the change feed on (deleted_at, id)
+        indexes = [models.Index(fields=['deleted_at', 'id'], name='api_tombstone_deleted_id')]
+
+    def __str__(self):
+        return f"{self.collection} #{self.object_id} ({self.deleted_at:%Y-%m-%d %H:%M})"
+
+
+class SearchEntry(models.Model):
+    """
+    Searchable text of one portfolio item (see api.search). The full-text index over it is
+    database specific and created by migration 0022: a generated tsvector column with a
+    GIN index on PostgreSQL, an FTS5 table kept in sync by triggers on SQLite.
+    """
+    collection = models.CharField(max_length=50, help_text="Public collection name (e.g. projects)")
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['collection', 'object_id'], name='api_searchentry_unique_object'),
+        ]
+        verbose_name_plural = "Search entries"
+
+    def __str__(self):
+        return f"{self.collection} #{self.object_id}: {self.title}"
@@ -0,0 +1,198 @@
+"""
+Outbound HTTP client
+All calls from the api app to external services go through one shared requests
+Session per process, so connections (and their TLS sessions) are pooled and kept
+alive between calls. Pool size, retries and per-host timeouts come from the
+OUTBOUND_HTTP setting, and the connect and time-to-first-byte of every call are
+recorded for monitoring. Only idempotent methods are retried; a call whose method is
+not (e.g. a GraphQL read sent as a POST) can opt in with idempotent=True.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Number of hosts to keep connection pools for, and connections kept alive per host
+    'POOL_CONNECTIONS': 4,
+    'POOL_MAXSIZE': 10,
+    # Retries for failed connections and gateway errors. Read timeouts are never
+    # retried so one slow upstream cannot hold a request for several timeouts.
+    'RETRIES': 2,
+    'BACKOFF_FACTOR': 0.3,
+    'RETRY_STATUSES': (502, 503, 504),
+    # Methods retried by default; other calls opt in with request(..., idempotent=True)
+    'RETRY_METHODS': ('HEAD', 'GET', 'OPTIONS'),
+    # (connect, read) timeouts in seconds, overridable per host
+    'TIMEOUT': (3.05, 10),
+    'HOST_TIMEOUTS': {},
+    # How many recent call timings to keep for monitoring
+    'TIMING_HISTORY': 100,
+}
+
+# Connect time of the last new connection made by this thread
+_local = threading.local()
+
+
+class _TimedConnectionMixin:
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        _local.connect_time = time.perf_counter() - started
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools record how long new connections take to open"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+class CallTiming(NamedTuple):
+    method: str
+    host: str
+    status: Optional[int]
+    # Seconds to open a new connection (TCP + TLS), or None if a pooled connection was reused
+    connect: Optional[float]
+    # Seconds from sending the request until the response headers arrived
+    ttfb: Optional[float]
+    total: float
+    at: float
+
+    def as_dict(self):
+        return self._asdict()
+
+
+class OutboundClient:
+    """Pooled keep-alive HTTP client with retries, per-host timeouts and call timings"""
+
+    def __init__(self, **options):
+        self.options = {**DEFAULTS, **options}
+        self.session = self._session(self.options['RETRY_METHODS'])
+        # Session for calls that opted in to retries of any method, created on first use
+        self._idempotent_session = None
+        self._session_lock = threading.Lock()
+        self._timings = deque(maxlen=self.options['TIMING_HISTORY'])
+
+    def _session(self, retry_methods):
+        session = requests.Session()
+        retry = Retry(
+            total=self.options['RETRIES'],
+            connect=self.options['RETRIES'],
+            read=0,
+            status=self.options['RETRIES'],
+            backoff_factor=self.options['BACKOFF_FACTOR'],
+            status_forcelist=self.options['RETRY_STATUSES'],
+            allowed_methods=frozenset(method.upper() for method in retry_methods) if retry_methods else None,
+            raise_on_status=False,
+        )
+        adapter = TimedHTTPAdapter(
+            pool_connections=self.options['POOL_CONNECTIONS'],
+            pool_maxsize=self.options['POOL_MAXSIZE'],
+            max_retries=retry,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _session_for(self, method, idempotent):
+        if not idempotent or method.upper() in self.options['RETRY_METHODS']:
+            return self.session
+        if self._idempotent_session is None:
+            with self._session_lock:
+                if self._idempotent_session is None:
+                    # allowed_methods=None retries every method
+                    self._idempotent_session = self._session(None)
+        return self._idempotent_session
+
+    def timeout_for(self, host):
+        return self.options['HOST_TIMEOUTS'].get(host, self.options['TIMEOUT'])
+
+    def request(self, method, url, idempotent=False, **kwargs):
+        """
+        Send a request through the shared session; raises requests exceptions like requests.request.
+        idempotent=True retries the call like a GET even if its method is not retried by default.
+        """
+        host = urlsplit(url).hostname or ''
+        kwargs.setdefault('timeout', self.timeout_for(host))
+        _local.connect_time = None
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self._session_for(method, idempotent).request(method, url, **kwargs)
+            return response
+        finally:
+            timing = CallTiming(
+                method=method.upper(),
+                host=host,
+                status=response.status_code if response is not None else None,
+                connect=_local.connect_time,
+                ttfb=response.elapsed.total_seconds() if response is not None else None,
+                total=time.perf_counter() - started,
+                at=time.time(),
+            )
+            self._timings.append(timing)
+            logger.debug(
+                f"{timing.method} {host} -> {timing.status} "
+                f"connect={timing.connect} ttfb={timing.ttfb} total={timing.total:.3f}s"
+            )
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def timings(self, host=None):
+        """Recent call timings, oldest first, optionally for one host only"""
+        return [t for t in list(self._timings) if host is None or t.host == host]
+
+    def close(self):
+        self.session.close()
+        if self._idempotent_session is not None:
+            self._idempotent_session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide outbound client, configured from settings.OUTBOUND_HTTP"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OutboundClient(**getattr(settings, 'OUTBOUND_HTTP', {}))
+    return _client
@@ -0,0 +1,103 @@
+"""
+Keyset (cursor) pagination
+Pages are selected with "after the last row of the previous page" conditions on the
+ordering columns, e.g. (created_at, id) < (last.created_at, last.id), instead of OFFSET.
+Every page then costs the same index range scan however deep it is, and rows added
+while a visitor scrolls never shift items between pages. The position is handed to
+the client as an opaque cursor string.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import NamedTuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+# Newest first, with the primary key as tie-breaker for rows created in the same instant
+DEFAULT_ORDERING = ('-created_at', '-id')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage(NamedTuple):
+    items: list
+    # Cursor for the following page, or None on the last page
+    next_cursor: str
+
+
+def _parse_ordering(ordering):
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def _row_value(row, name):
+    # Rows are model instances, or dicts from .values()
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def _json_value(value):
+    # Full precision: a cursor rounded to milliseconds would skip or repeat rows
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def encode_cursor(values):
+    raw = json.dumps([_json_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_values(cursor):
+    """The raw JSON values of a cursor; raises InvalidCursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        return json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Malformed cursor: {e}")
+
+
+def decode_cursor(cursor, model, ordering=DEFAULT_ORDERING):
+    """Decode a cursor into values for the ordering fields; raises InvalidCursor"""
+    values = decode_values(cursor)
+    fields = _parse_ordering(ordering)
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise InvalidCursor("Cursor does not match the ordering")
+    try:
+        return [
+            model._meta.get_field(name).to_python(value)
+            for (name, _), value in zip(fields, values)
+        ]
+    except (FieldDoesNotExist, ValidationError) as e:
+        raise InvalidCursor(f"Invalid cursor value: {e}")
+
+
+def keyset_filter(ordering, values):
+    """Q selecting the rows that come after `values` in `ordering`"""
+    fields = _parse_ordering(ordering)
+    condition = Q()
+    for i, (name, descending) in enumerate(fields):
+        step = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[i]})
+        for (previous, _), value in zip(fields[:i], values):
+            step &= Q(**{previous: value})
+        condition |= step
+    # Redundant bound on the leading column, so the planner can start an index range scan there
+    first, descending = fields[0]
+    return Q(**{f"{first}__{'lte' if descending else 'gte'}": values[0]}) & condition
+
+
+def keyset_page(queryset, cursor=None, size=20, ordering=DEFAULT_ORDERING):
+    """
+    One page of `queryset` in `ordering`, starting after `cursor`.
+    `queryset` may be a .values() queryset as long as it includes the ordering fields.
+    Raises InvalidCursor for cursors that were not produced by this ordering.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        queryset = queryset.filter(keyset_filter(ordering, decode_cursor(cursor, queryset.model, ordering)))
+    # One extra row tells whether there is a next page without a COUNT
+    items = list(queryset[:size + 1])
+    if len(items) <= size:
+        return KeysetPage(items, None)
+    items = items[:size]
+    last = items[-1]
+    return KeysetPage(items, encode_cursor([_row_value(last, name) for name, _ in _parse_ordering(ordering)]))
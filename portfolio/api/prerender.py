@@ -0,0 +1,299 @@
+"""
+Static pre-rendering of the public pages
+The home, skills and library pages only change when content is written, so they can be
+rendered once to files (plus the first page of each library section, which the
+library page loads when a section is opened) instead of on every request. `manage.py prerender_pages` renders every page into
+PRERENDER_ROOT along with a manifest of the content versions each file was built from,
+and the model signals re-render only the pages built from the model that changed.
+
+PrerenderedPageMiddleware serves the files to anonymous visitors while their content
+versions are current, so a page costs one small query and no rendering. When the files
+are deployed with the site (PRERENDER_DEPLOY_HOOK_URL set) they cannot be rewritten in
+place, so a content write triggers a rebuild through the deploy hook instead, at most
+once per PRERENDER_DEPLOY_DEBOUNCE seconds with later writes coalesced into one more
+rebuild. A new GitHub calendar never triggers one: pages built from it are served live
+until the next deploy.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from typing import NamedTuple
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import HttpResponse
+from django.urls import resolve
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+from .cdn import patch_edge_cache
+from .outbound import get_client
+from .versions import read_stamps, version_key
+from .views import LIBRARY_SECTIONS
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+
+# Set while a deploy was triggered recently, and while writes are waiting for the next one
+DEPLOY_THROTTLE_KEY = 'prerender:deploy_triggered'
+DEPLOY_PENDING_KEY = 'prerender:deploy_pending'
+
+
+class Page(NamedTuple):
+    """One pre-rendered response"""
+    path: str
+    query: tuple = ()
+    extension: str = 'html'
+
+    @property
+    def url(self):
+        return f'{self.path}?{urlencode(self.query)}' if self.query else self.path
+
+    @property
+    def filename(self):
+        """File under PRERENDER_ROOT; pages map to <path>/index.html so a CDN can serve them as-is"""
+        stem = '-'.join(f'{name}-{value}' for name, value in self.query) or 'index'
+        return os.path.join(self.path.strip('/'), f'{stem}.{self.extension}')
+
+
+PAGES = (
+    Page('/'),
+    Page('/skills/'),
+    Page('/library/'),
+    *(Page('/library/', (('section', section),)) for section in LIBRARY_SECTIONS),
+    *(Page(f'/library/{section}/', extension='json') for section in LIBRARY_SECTIONS),
+)
+
+_write_lock = threading.Lock()
+
+# Parsed manifest for the middleware, reloaded when the file changes
+_manifest_cache = {}
+
+
+def _root():
+    return getattr(settings, 'PRERENDER_ROOT', None)
+
+
+def _manifest_path():
+    root = _root()
+    return os.path.join(root, MANIFEST_NAME) if root else None
+
+
+def load_manifest():
+    """The manifest written by the last pre-render, or None if pages were never pre-rendered"""
+    path = _manifest_path()
+    if not path:
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.error(f"Error reading pre-render manifest: {e}")
+        return None
+
+
+def content_keys(page):
+    """The content keys a page is built from, as declared by its view's @conditional"""
+    return getattr(resolve(page.path).func, 'content_keys', ())
+
+
+def _build_request(page):
+    base = urlsplit(getattr(settings, 'PRERENDER_BASE_URL', 'http://localhost'))
+    secure = base.scheme == 'https'
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': page.path,
+        'QUERY_STRING': urlencode(page.query),
+        'SERVER_NAME': base.hostname,
+        'SERVER_PORT': str(base.port or (443 if secure else 80)),
+        'HTTP_HOST': base.netloc,
+        'wsgi.url_scheme': base.scheme,
+        'wsgi.input': io.BytesIO(b''),
+    }
+    request = WSGIRequest(environ)
+    request.user = AnonymousUser()
+    return request
+
+
+def render_page(page):
+    """Render a page as an anonymous visitor sees it; returns (content, content_type)"""
+    match = resolve(page.path)
+    response = match.func(_build_request(page), *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response = response.render()
+    if response.status_code != 200:
+        raise ValueError(f"{page.url} rendered with status {response.status_code}")
+    return response.content, response['Content-Type']
+
+
+def _write_file(path, content):
+    """Write via a temporary file so readers never see a half-written file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def prerender(pages=PAGES):
+    """
+    Render `pages` into PRERENDER_ROOT and record them in the manifest.
+    Returns the pages written, or None if content versions could not be read
+    (rendering then would bake database errors into the files).
+    """
+    root = _root()
+    if not root:
+        return None
+    pages = list(pages)
+    keys = tuple(sorted({key for page in pages for key in content_keys(page)}))
+    # Read versions before rendering: a write landing mid-render leaves the file marked stale
+    stamps = read_stamps(keys)
+    if stamps is None:
+        return None
+
+    entries = {}
+    for page in pages:
+        content, content_type = render_page(page)
+        _write_file(os.path.join(root, page.filename), content)
+        entries[page.url] = {
+            'file': page.filename,
+            'content_type': content_type,
+            'etag': hashlib.md5(content).hexdigest(),
+            'versions': {key: stamps.get(key, (0, None))[0] for key in content_keys(page)},
+        }
+
+    with _write_lock:
+        manifest = load_manifest() or {}
+        if manifest.get('release') != getattr(settings, 'RELEASE_VERSION', ''):
+            # Pages rendered by other code are not worth keeping
+            manifest = {'release': getattr(settings, 'RELEASE_VERSION', ''), 'pages': {}}
+        manifest['pages'].update(entries)
+        _write_file(_manifest_path(), json.dumps(manifest, indent=2).encode())
+    _manifest_cache.clear()
+    return pages
+
+
+def trigger_deploy():
+    """Ask the host to rebuild the site (and with it the pre-rendered pages)"""
+    try:
+        response = get_client().post(settings.PRERENDER_DEPLOY_HOOK_URL)
+        response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Error triggering pre-render deploy hook: {e}")
+        return False
+    return True
+
+
+def _deploy_debounce():
+    return getattr(settings, 'PRERENDER_DEPLOY_DEBOUNCE', 300)
+
+
+def request_deploy():
+    """
+    Trigger the deploy hook unless one was triggered within PRERENDER_DEPLOY_DEBOUNCE
+    seconds; the request is then left pending for flush_pending_deploy().
+    Returns True if the hook was triggered.
+    """
+    if cache.add(DEPLOY_THROTTLE_KEY, time.time(), _deploy_debounce()):
+        cache.delete(DEPLOY_PENDING_KEY)
+        return trigger_deploy()
+    cache.set(DEPLOY_PENDING_KEY, time.time(), None)
+    return False
+
+
+def flush_pending_deploy():
+    """Trigger the deploy left pending by request_deploy() once the debounce window has passed"""
+    if cache.get(DEPLOY_PENDING_KEY) is None or not cache.add(DEPLOY_THROTTLE_KEY, time.time(), _deploy_debounce()):
+        return False
+    cache.delete(DEPLOY_PENDING_KEY)
+    return trigger_deploy()
+
+
+def prerender_changed(source):
+    """Re-render only the pre-rendered pages built from the changed model or content key"""
+    if load_manifest() is None:
+        return  # Pre-rendering is not in use
+    if getattr(settings, 'PRERENDER_DEPLOY_HOOK_URL', ''):
+        # Content keys (the GitHub calendar) change without anyone editing the site, and
+        # often; their pages fall through to the live views until the next deploy
+        if not isinstance(source, str):
+            request_deploy()
+        return
+    key = version_key(source)
+    pages = [page for page in PAGES if key in content_keys(page)]
+    if not pages:
+        return
+    try:
+        prerender(pages)
+    except Exception as e:
+        # Stale files are never served, so a failed re-render only costs the speedup
+        logger.error(f"Error pre-rendering pages for {key}: {e}")
+
+
+def _cached_manifest():
+    path = _manifest_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+    if _manifest_cache.get('mtime') != mtime:
+        _manifest_cache.update(mtime=mtime, manifest=load_manifest())
+    return _manifest_cache['manifest']
+
+
+class PrerenderedPageMiddleware:
+    """
+    Serve pre-rendered pages to anonymous visitors, ahead of sessions and authentication.
+    A page is only served while the content versions it was rendered from are current;
+    otherwise the request falls through to the view.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.prerendered_response(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+    def prerendered_response(self, request):
+        # Anyone with a session may be logged in and see admin controls
+        if (settings.DEBUG or request.method not in ('GET', 'HEAD')
+                or settings.SESSION_COOKIE_NAME in request.COOKIES):
+            return None
+        manifest = _cached_manifest()
+        if not manifest or manifest.get('release') != getattr(settings, 'RELEASE_VERSION', ''):
+            return None
+        entry = manifest['pages'].get(request.get_full_path())
+        if entry is None:
+            return None
+
+        stamps = read_stamps(tuple(entry['versions']))
+        if stamps is None:
+            return None
+        if any(stamps.get(key, (0, None))[0] != version for key, version in entry['versions'].items()):
+            if getattr(settings, 'PRERENDER_DEPLOY_HOOK_URL', ''):
+                # Stale files are waiting on a rebuild; send one that was held back
+                flush_pending_deploy()
+            return None
+        try:
+            with open(os.path.join(_root(), entry['file']), 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        response = get_conditional_response(request, etag=f'"{entry["etag"]}"')
+        if response is None:
+            response = HttpResponse(content, content_type=entry['content_type'])
+        response['ETag'] = f'"{entry["etag"]}"'
+        patch_vary_headers(response, ('Cookie',))
+        return patch_edge_cache(response, public=True, tags=entry['versions'])
@@ -0,0 +1,105 @@
+"""
+CDN purge backends
+Writes purge cached responses from the CDN by surrogate key (cache tag): public
+responses are tagged with the content keys they are built from (see api.cdn), and a
+write purges the tag of the model that changed. The backend comes from the
+CDN_PURGE_BACKEND setting, in the same shape as CACHES:
+
+    CDN_PURGE_BACKEND = {
+        'BACKEND': 'api.purge.WebhookPurgeBackend',
+        'OPTIONS': {'url': 'https://...', 'token': '...'},
+    }
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .outbound import get_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'api.purge.NullPurgeBackend'
+
+
+class BasePurgeBackend:
+    def __init__(self, **options):
+        self.options = options
+
+    def purge_tags(self, tags):
+        """Remove every cached response carrying any of `tags`"""
+        raise NotImplementedError
+
+
+class NullPurgeBackend(BasePurgeBackend):
+    """No CDN purging; cached responses expire after their s-maxage"""
+
+    def purge_tags(self, tags):
+        pass
+
+
+class LocalPurgeBackend(BasePurgeBackend):
+    """Records purges in memory instead of sending them, for tests and local development"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.purged = []
+
+    def purge_tags(self, tags):
+        self.purged.append(tuple(tags))
+
+    def clear(self):
+        self.purged = []
+
+
+class WebhookPurgeBackend(BasePurgeBackend):
+    """
+    POSTs {"tags": [...]} to a purge endpoint (a CDN API or a small worker in front of one).
+    Options: url, and optionally token (sent as a Bearer token).
+    """
+
+    def purge_tags(self, tags):
+        headers = {}
+        if self.options.get('token'):
+            headers['Authorization'] = f"Bearer {self.options['token']}"
+        response = get_client().post(self.options['url'], json={'tags': list(tags)}, headers=headers)
+        response.raise_for_status()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_purge_backend():
+    """The process-wide purge backend, configured from settings.CDN_PURGE_BACKEND"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = getattr(settings, 'CDN_PURGE_BACKEND', {})
+                backend_class = import_string(config.get('BACKEND', DEFAULT_BACKEND))
+                _backend = backend_class(**config.get('OPTIONS', {}))
+    return _backend
+
+
+@receiver(setting_changed)
+def _reset_backend(setting, **kwargs):
+    global _backend
+    if setting == 'CDN_PURGE_BACKEND':
+        _backend = None
+
+
+def purge_tags(tags):
+    """Purge `tags` from the CDN. Failures are logged, never raised: responses still expire on their own."""
+    tags = sorted(set(tags))
+    if not tags:
+        return False
+    try:
+        get_purge_backend().purge_tags(tags)
+    except Exception as e:
+        logger.error(f"Error purging CDN tags {', '.join(tags)}: {e}")
+        return False
+    return True
@@ -0,0 +1,106 @@
+"""
+Fast API rendering
+One serializer for every JSON response of the api app, with datetime, date, time,
+Decimal and UUID handled by the encoder itself so views can hand over rows as they
+come out of the database. API_JSON_BACKEND selects orjson (when installed) or the
+standard library; both produce the same document (ISO 8601 datetimes at full
+precision, decimals as strings). Clients that send `Accept: application/msgpack` get
+the same data as MessagePack (when msgpack is installed), which is smaller and faster
+to decode; there datetimes use MessagePack's own timestamp type.
+"""
+import datetime
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_CONTENT_TYPE = 'application/json'
+MSGPACK_CONTENT_TYPE = 'application/msgpack'
+
+
+class APIJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder without its millisecond rounding and "Z" suffix, to match orjson's output"""
+
+    def default(self, o):
+        # datetime is a subclass of date
+        if isinstance(o, (datetime.date, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _default(o):
+    """Fallback for the types orjson and msgpack do not encode natively"""
+    return APIJSONEncoder().default(o)
+
+
+def json_backend():
+    backend = getattr(settings, 'API_JSON_BACKEND', 'orjson')
+    return 'orjson' if backend == 'orjson' and orjson is not None else 'json'
+
+
+def dumps(data, backend=None):
+    """Serialize data as compact UTF-8 JSON bytes with the given or configured backend"""
+    if (backend or json_backend()) == 'orjson' and orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, cls=APIJSONEncoder, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def loads(content):
+    return orjson.loads(content) if json_backend() == 'orjson' else json.loads(content)
+
+
+def packb(data):
+    """Serialize data as MessagePack; aware datetimes become timestamps, the rest converts as in dumps()"""
+    return msgpack.packb(data, default=_default, use_bin_type=True, datetime=True)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """DRF JSON renderer using dumps(); indented output (?indent / Accept params) keeps DRF's path"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = MSGPACK_CONTENT_TYPE
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return packb(data)
+
+
+def accepts_msgpack(request):
+    """Whether the request's Accept header prefers MessagePack over JSON"""
+    if msgpack is None:
+        return False
+    return request.get_preferred_type([JSON_CONTENT_TYPE, MSGPACK_CONTENT_TYPE]) == MSGPACK_CONTENT_TYPE
+
+
+def api_response(request, data, status=200):
+    """
+    HttpResponse of `data` in the format the request's Accept header prefers
+    (JSON unless MessagePack is asked for), for views that do not go through DRF.
+    """
+    if accepts_msgpack(request):
+        return HttpResponse(packb(data), content_type=MSGPACK_CONTENT_TYPE, status=status)
+    return HttpResponse(dumps(data), content_type=JSON_CONTENT_TYPE, status=status)
@@ -0,0 +1,229 @@
+"""
+Full-text search
+Projects, books, photos, skills and hobbies are copied into SearchEntry rows (a title and
+a body of searchable text each) whenever they are saved, and searched through a real
+full-text index: a weighted tsvector column with a GIN index on PostgreSQL, an FTS5
+table on SQLite (both created by migration 0022). Every query term is matched as a
+prefix, so results can follow the visitor's typing, and results are ranked with titles
+weighing more than the rest of the text. Other databases fall back to icontains.
+"""
+import logging
+import re
+from typing import NamedTuple
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Project, Book, Photo, Skills, Hobby, SearchEntry
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'api_searchentry_fts'
+# Longer queries are cut to this many terms
+MAX_TERMS = 8
+EXCERPT_LENGTH = 160
+
+
+class SearchSource(NamedTuple):
+    model: type
+    title: str
+    # Fields joined into the body text
+    body: tuple
+    # Page showing the item
+    url_name: str
+    url_query: str = ''
+
+
+SEARCH_SOURCES = {
+    'projects': SearchSource(Project, 'title', ('description',), 'library', '?section=projects'),
+    'books': SearchSource(Book, 'title', ('author',), 'library', '?section=books'),
+    'photos': SearchSource(Photo, 'title', (), 'library', '?section=photos'),
+    'skills': SearchSource(Skills, 'name', ('category', 'description'), 'skills'),
+    'hobbies': SearchSource(Hobby, 'name', ('category', 'reason'), 'index'),
+}
+SEARCH_MODELS = {source.model: name for name, source in SEARCH_SOURCES.items()}
+
+
+class SearchResult(NamedTuple):
+    collection: str
+    id: int
+    title: str
+    excerpt: str
+    rank: float
+    url: str
+
+    def as_json(self):
+        return self._asdict()
+
+
+def _entry(name, instance):
+    source = SEARCH_SOURCES[name]
+    title = getattr(instance, source.title) or ''
+    body = ' '.join(str(getattr(instance, field) or '') for field in source.body).strip()
+    return SearchEntry(
+        collection=name, object_id=instance.pk, title=title[:200], body=body, updated_at=timezone.now(),
+    )
+
+
+def index_objects(model, instances):
+    """Add or refresh the search entries of saved instances, in one upsert"""
+    name = SEARCH_MODELS.get(model)
+    if name is None:
+        return
+    entries = [_entry(name, instance) for instance in instances if instance.pk is not None]
+    if not entries:
+        return
+    try:
+        # Savepoint, so a failure here never breaks the write that triggered it
+        with transaction.atomic():
+            SearchEntry.objects.bulk_create(
+                entries, update_conflicts=True, unique_fields=['collection', 'object_id'],
+                update_fields=['title', 'body', 'updated_at'],
+            )
+    except DatabaseError as e:
+        logger.error(f"Error indexing {name} for search: {e}")
+
+
+def unindex_object(model, pk):
+    name = SEARCH_MODELS.get(model)
+    if name is None:
+        return
+    try:
+        with transaction.atomic():
+            SearchEntry.objects.filter(collection=name, object_id=pk).delete()
+    except DatabaseError as e:
+        logger.error(f"Error removing {name} #{pk} from search: {e}")
+
+
+def rebuild_index():
+    """Re-create every search entry from the content tables; returns the number of entries"""
+    count = 0
+    with transaction.atomic():
+        SearchEntry.objects.all().delete()
+        for name, source in SEARCH_SOURCES.items():
+            entries = [_entry(name, instance) for instance in source.model.objects.iterator()]
+            SearchEntry.objects.bulk_create(entries, batch_size=500)
+            count += len(entries)
+    return count
+
+
+def query_terms(query):
+    """Lowercased word terms of a free-text query"""
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+_fts_available = None
+
+
+def fts_available():
+    """Whether the SQLite FTS5 table exists (SQLite builds without FTS5 skip it)"""
+    global _fts_available
+    if _fts_available is None:
+        with connection.cursor() as cursor:
+            _fts_available = FTS_TABLE in connection.introspection.table_names(cursor)
+    return _fts_available
+
+
+def _tsquery(terms):
+    """PostgreSQL tsquery matching every term as a prefix"""
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def _fts_query(terms):
+    """FTS5 query matching every term as a prefix"""
+    return ' AND '.join(f'"{term}"*' for term in terms)
+
+
+def _icontains(entries, terms):
+    for term in terms:
+        entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return entries
+
+
+def _ranked_ids(terms, collections, limit, offset):
+    """[(entry id, rank)] best first, from the database's full-text index"""
+    table = SearchEntry._meta.db_table
+    collection_sql = ''
+    collection_params = []
+    if collections:
+        collection_sql = f" AND e.collection IN ({', '.join(['%s'] * len(collections))})"
+        collection_params = list(collections)
+
+    if connection.vendor == 'postgresql':
+        sql = (
+            f"SELECT e.id, ts_rank(e.document, query) AS rank "
+            f"FROM {table} e, to_tsquery('simple', %s) query "
+            f"WHERE e.document @@ query{collection_sql} "
+            f"ORDER BY rank DESC, e.id LIMIT %s OFFSET %s"
+        )
+        params = [_tsquery(terms)]
+    elif connection.vendor == 'sqlite' and fts_available():
+        # bm25() is lower for better matches; titles weigh ten times the body
+        sql = (
+            f"SELECT e.id, -bm25({FTS_TABLE}, 10.0, 1.0) AS rank "
+            f"FROM {FTS_TABLE} JOIN {table} e ON e.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s{collection_sql} "
+            f"ORDER BY rank DESC, e.id LIMIT %s OFFSET %s"
+        )
+        params = [_fts_query(terms)]
+    else:
+        entries = _icontains(SearchEntry.objects.all(), terms)
+        if collections:
+            entries = entries.filter(collection__in=collections)
+        return [(pk, 0.0) for pk in entries.order_by('title', 'id').values_list('id', flat=True)[offset:offset + limit]]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + collection_params + [limit, offset])
+        return cursor.fetchall()
+
+
+def search(query, collections=None, limit=10, offset=0):
+    """
+    Entries matching every term of `query` as a prefix, best first.
+    Returns (results, has_more); an empty query matches nothing.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return [], False
+    ranked = _ranked_ids(terms, collections, limit + 1, offset)
+    has_more = len(ranked) > limit
+    ranked = ranked[:limit]
+    entries = SearchEntry.objects.in_bulk([pk for pk, _ in ranked])
+    results = []
+    for pk, rank in ranked:
+        entry = entries.get(pk)
+        if entry is None:
+            continue
+        source = SEARCH_SOURCES[entry.collection]
+        excerpt = entry.body if len(entry.body) <= EXCERPT_LENGTH else entry.body[:EXCERPT_LENGTH].rsplit(' ', 1)[0] + '…'
+        results.append(SearchResult(
+            entry.collection, entry.object_id, entry.title, excerpt, float(rank or 0),
+            reverse(source.url_name) + source.url_query,
+        ))
+    return results, has_more
+
+
+def matching_ids(model, query):
+    """
+    Subquery of the primary keys of `model` rows matching every term of `query` as a
+    prefix, for filtering querysets (e.g. in the admin). Unranked and not capped.
+    """
+    entries = SearchEntry.objects.filter(collection=SEARCH_MODELS[model])
+    terms = query_terms(query)
+    if not terms:
+        entries = entries.none()
+    elif connection.vendor == 'postgresql':
+        entries = entries.filter(id__in=RawSQL(
+            f"SELECT id FROM {SearchEntry._meta.db_table} WHERE document @@ to_tsquery('simple', %s)",
+            [_tsquery(terms)],
+        ))
+    elif connection.vendor == 'sqlite' and fts_available():
+        entries = entries.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [_fts_query(terms)],
+        ))
+    else:
+        entries = _icontains(entries, terms)
+    return entries.values('object_id')
@@ -0,0 +1,71 @@
+"""
+Signal handlers that keep cached content in step with the database
+Any write to the portfolio models invalidates the anonymous page cache, bumps
+the model's content version (used for ETags and the portfolio snapshot), re-renders
+the pre-rendered pages built from it and purges its tag from the CDN, and so does a
+new GitHub contribution calendar (shown on the home page).
+Saves and deletes also keep the search index current, and deletes leave a
+tombstone for the change feed. New image uploads are stripped of their metadata
+before they are stored and given responsive renditions after the save commits; the
+renditions of replaced and deleted images are removed.
+"""
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .caching import invalidate_page_cache
+from .changes import record_deletion
+from .github import contributions_updated
+from .images import IMAGE_FIELDS, RENDITION_FIELDS, process_images, remove_renditions, schedule_renditions
+from .prerender import prerender_changed
+from .purge import purge_tags
+from .search import index_objects, unindex_object
+from .models import Country, Hobby, Skills, Project, Book, Photo
+from .versions import GITHUB_CONTRIBUTIONS, bump_version, version_key
+
+CONTENT_MODELS = (Country, Hobby, Skills, Project, Book, Photo)
+
+
+def content_changed(model):
+    """Invalidate everything derived from the given model's rows"""
+    invalidate_page_cache()
+    bump_version(model)
+    transaction.on_commit(lambda: prerender_changed(model))
+    transaction.on_commit(lambda: purge_tags([version_key(model)]))
+
+
+@receiver(pre_save)
+def model_saving(sender, instance, **kwargs):
+    if sender in IMAGE_FIELDS:
+        process_images(instance)
+
+
+@receiver([post_save, post_delete])
+def model_changed(sender, **kwargs):
+    if sender in CONTENT_MODELS:
+        content_changed(sender)
+
+
+@receiver(post_save)
+def model_saved(sender, instance, **kwargs):
+    if sender in CONTENT_MODELS:
+        index_objects(sender, [instance])
+    if sender in RENDITION_FIELDS:
+        schedule_renditions(instance)
+
+
+@receiver(post_delete)
+def model_deleted(sender, instance, **kwargs):
+    if sender in CONTENT_MODELS:
+        record_deletion(sender, instance.pk)
+        unindex_object(sender, instance.pk)
+    if sender in RENDITION_FIELDS:
+        remove_renditions(instance)
+
+
+@receiver(contributions_updated)
+def calendar_changed(sender, calendar, **kwargs):
+    invalidate_page_cache()
+    bump_version(GITHUB_CONTRIBUTIONS)
+    prerender_changed(GITHUB_CONTRIBUTIONS)
+    purge_tags([GITHUB_CONTRIBUTIONS])
@@ -0,0 +1,93 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one execution of the work:
+threads in this process wait on the leader's result, and other processes are kept
+out by a lock stored in the cache backend until the leader has published a value.
+"""
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+
+
+class _Call:
+    """An in-flight call that followers in this process can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run a function at most once at a time per key, sharing its result with concurrent callers"""
+
+    def __init__(self, lock_timeout=30, wait_timeout=15, poll_interval=0.1):
+        # lock_timeout: how long the cross-process lock is held if its owner dies
+        # wait_timeout: how long followers wait for a leader before giving up
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, lookup=None):
+        """
+        Call fn() for key unless another caller already is, and return its result.
+        lookup() should return the value published by a leader in another process
+        (e.g. read it from the cache), or None if it is not there yet.
+        Returns None if no result became available within wait_timeout.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait(self.wait_timeout)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._do_across_processes(key, fn, lookup)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def _do_across_processes(self, key, fn, lookup):
+        """Elect one leader across processes through a lock in the cache backend"""
+        lock_key = f'singleflight:{key}'
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            if lookup is not None:
+                value = lookup()
+                if value is not None:
+                    return value
+
+            if cache.add(lock_key, token, self.lock_timeout):
+                try:
+                    # The previous leader may have published and released the lock
+                    # between the lookup above and taking it
+                    if lookup is not None:
+                        value = lookup()
+                        if value is not None:
+                            return value
+                    return fn()
+                finally:
+                    # Only release the lock if it has not expired and been taken over
+                    if cache.get(lock_key) == token:
+                        cache.delete(lock_key)
+
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
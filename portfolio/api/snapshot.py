@@ -0,0 +1,112 @@
+"""
+Portfolio snapshot
+Every public collection (see api.collections) in one JSON document, so a single request
+can hydrate a client. The document is serialized once per set of content versions and
+kept both in the cache and in the database (PortfolioSnapshot, which survives cold
+starts), so requests are served the stored text without touching the collections.
+Writes only bump the content versions; the first read of a new version builds the
+document, once however many requests ask for it at the same time.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .collections import COLLECTIONS
+from .models import PortfolioSnapshot
+from .renderers import dumps
+from .singleflight import SingleFlight
+from .versions import read_stamps, version_key
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_NAME = 'portfolio'
+SNAPSHOT_MODELS = tuple(collection.model for collection in COLLECTIONS.values())
+# Sorted like conditional() sorts its keys, so both share the per-request stamps
+SNAPSHOT_KEYS = tuple(sorted(version_key(model) for model in SNAPSHOT_MODELS))
+# Documents are keyed by digest, so old ones are never served and only need to expire
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Coalesces the reads that find a new version into one build per digest
+_build_flight = SingleFlight(lock_timeout=30, wait_timeout=10)
+
+
+def snapshot_digest(stamps):
+    """Digest of the content versions (and release) a document is built from"""
+    parts = [getattr(settings, 'RELEASE_VERSION', '')]
+    parts += [f'{key}:{stamps.get(key, (0, None))[0]}' for key in SNAPSHOT_KEYS]
+    return hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+
+def _cache_key(digest):
+    return f'snapshot:{SNAPSHOT_NAME}:{digest}'
+
+
+def build_document():
+    """Serialize every collection; one query per collection"""
+    document = {
+        'collections': {
+            name: [
+                collection.serialize(row)
+                for row in collection.model.objects.order_by(*collection.ordering).values(*collection.fields)
+            ]
+            for name, collection in COLLECTIONS.items()
+        },
+        'generated_at': timezone.now(),
+    }
+    return dumps(document).decode()
+
+
+def rebuild_snapshot(stamps=None):
+    """Build the document and store it for the given stamps (read now if not given)"""
+    # Stamps first: the rows read afterwards are at least as new as the digest says
+    if stamps is None:
+        stamps = read_stamps(SNAPSHOT_KEYS)
+    document = build_document()
+    if stamps is None:
+        return document
+
+    digest = snapshot_digest(stamps)
+    try:
+        PortfolioSnapshot.objects.update_or_create(
+            name=SNAPSHOT_NAME,
+            defaults={'digest': digest, 'document': document, 'built_at': timezone.now()},
+        )
+    except DatabaseError as e:
+        logger.error(f"Error saving portfolio snapshot: {e}")
+    cache.set(_cache_key(digest), document, CACHE_TIMEOUT)
+    return document
+
+
+def snapshot_document(stamps):
+    """
+    The JSON document for the given stamps: from the cache, the database, or built now.
+    Concurrent requests for a version that was not built yet wait for one build.
+    """
+    if stamps is None:
+        return build_document()
+
+    digest = snapshot_digest(stamps)
+    document = cache.get(_cache_key(digest))
+    if document is not None:
+        return document
+
+    try:
+        document = PortfolioSnapshot.objects.filter(
+            name=SNAPSHOT_NAME, digest=digest
+        ).values_list('document', flat=True).first()
+    except DatabaseError as e:
+        logger.error(f"Error reading portfolio snapshot: {e}")
+        document = None
+    if document is not None:
+        cache.set(_cache_key(digest), document, CACHE_TIMEOUT)
+        return document
+
+    document = _build_flight.do(
+        digest, lambda: rebuild_snapshot(stamps), lookup=lambda: cache.get(_cache_key(digest)),
+    )
+    # Only None if another process's build outlasted the wait; don't keep the client waiting longer
+    return document if document is not None else build_document()
@@ -0,0 +1,65 @@
+"""
+Responsive image tags
+{% picture item 'image' alt=item.title sizes='(max-width: 768px) 100vw, 33vw' %} renders
+the renditions recorded by api.images as a <picture> element: one <source> per modern
+format (AVIF, WebP) and a JPEG or PNG <img> fallback, each with a srcset of every
+width, so the browser picks the smallest file for the slot and the formats it
+supports. Images without renditions (e.g. uploaded before they existed) render as a
+plain <img>. When the image's metadata is known, the <img> gets its width and height
+(so the browser reserves its space) and its dominant color and blurred preview as an
+inline background, seen until the image itself has loaded. The background stays behind
+the image, so api.images only records them for images without transparent pixels.
+"""
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from ..images import FORMATS, metadata_field, renditions_field
+
+register = template.Library()
+
+MODERN_TYPES = [content_type for content_type, *_ in FORMATS]
+
+
+def _srcset(storage, entries):
+    return ', '.join(f"{storage.url(entry['name'])} {entry['width']}w" for entry in entries)
+
+
+def _sizing(instance, field_name):
+    """width, height and placeholder style attributes of the <img>, from the stored metadata"""
+    width = getattr(instance, metadata_field(field_name, 'width'), None)
+    height = getattr(instance, metadata_field(field_name, 'height'), None)
+    color = getattr(instance, metadata_field(field_name, 'color'), '')
+    placeholder = getattr(instance, metadata_field(field_name, 'placeholder'), '')
+    attributes = format_html(' width="{}" height="{}"', width, height) if width and height else ''
+    if color or placeholder:
+        background = f'{color} url({placeholder}) center / cover no-repeat' if placeholder else color
+        attributes += format_html(' style="background: {}"', background.strip())
+    return attributes
+
+
+@register.simple_tag
+def picture(instance, field_name, alt='', sizes='100vw', loading='lazy'):
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return ''
+    sizing = _sizing(instance, field_name)
+    sources = (getattr(instance, renditions_field(field_name), None) or {}).get('sources') or {}
+    fallback = [content_type for content_type in sources if content_type not in MODERN_TYPES]
+    if not fallback or not sources[fallback[0]]:
+        return format_html(
+            '<img src="{}" alt="{}"{} loading="{}" decoding="async">', field_file.url, alt, sizing, loading,
+        )
+
+    storage = field_file.storage
+    fallback = sources[fallback[0]]
+    modern = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (content_type, _srcset(storage, sources[content_type]), sizes)
+            for content_type in MODERN_TYPES if sources.get(content_type)
+        ),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}"{} loading="{}" decoding="async"></picture>',
+        modern, storage.url(fallback[-1]['name']), _srcset(storage, fallback), sizes, alt, sizing, loading,
+    )
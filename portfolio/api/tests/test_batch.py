@@ -0,0 +1,95 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Country, Hobby, Skills
+from api.search import search
+
+
+class BatchCreateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('admin', password='secret')
+        Hobby.objects.create(name='Climbing', category='Outdoors')
+        Skills.objects.create(name='Python', category='Programming Languages')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def post(self, collection, items):
+        body = items if isinstance(items, (str, bytes)) else json.dumps(items)
+        return self.client.post(f'/api/{collection}/batch/', body, content_type='application/json')
+
+    def test_creates_every_valid_item(self):
+        response = self.post('countries', [
+            {'name': 'Japan', 'code': 'jp', 'flag_emoji': '🇯🇵', 'thoughts': 'Wonderful'},
+            {'name': 'Norway', 'code': 'NOR'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['success'], data['created'], data['failed']), (True, 2, 0))
+        self.assertEqual([result['index'] for result in data['results']], [0, 1])
+        japan = Country.objects.get(name='Japan')
+        self.assertEqual(data['results'][0]['id'], japan.pk)
+        # Truncated and uppercased like create_country
+        self.assertEqual(Country.objects.get(name='Norway').code, 'NO')
+
+    def test_failures_are_reported_per_item(self):
+        response = self.post('hobbies', [
+            {'name': 'Chess', 'category': 'Games'},
+            {'name': 'Climbing'},
+            {'name': 'Chess'},
+            {'name': ''},
+            {'name': 'Cards', 'social': 'always'},
+            'Reading',
+        ])
+        data = response.json()
+        self.assertEqual((data['success'], data['created'], data['failed']), (False, 1, 5))
+        errors = [result.get('error') for result in data['results']]
+        self.assertEqual(errors[:4], [
+            None, 'Hobby with this name already exists', 'Duplicate name in batch', 'Name is required',
+        ])
+        self.assertIn('social', errors[4])
+        self.assertEqual(errors[5], 'Item must be an object')
+        self.assertEqual(set(Hobby.objects.values_list('name', flat=True)), {'Climbing', 'Chess'})
+
+    def test_skill_names_clash_regardless_of_case(self):
+        data = self.post('skills', [
+            {'name': 'PYTHON'}, {'name': 'Rust'}, {'name': 'rust'},
+        ]).json()
+        self.assertEqual([result['success'] for result in data['results']], [False, True, False])
+        self.assertEqual(data['results'][0]['error'], 'Skill with this name already exists')
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        def queries(prefix, size):
+            with CaptureQueriesContext(connection) as context:
+                self.post('countries', [{'name': f'{prefix} {i}'} for i in range(size)])
+            return len(context.captured_queries)
+
+        queries('Warm-up', 1)
+        self.assertEqual(queries('Small', 2), queries('Large', 50))
+        self.assertEqual(Country.objects.count(), 53)
+
+    def test_created_rows_are_searchable(self):
+        self.post('hobbies', [{'name': 'Origami', 'reason': 'Folding paper'}])
+        results, _ = search('origami')
+        self.assertEqual([result.title for result in results], ['Origami'])
+
+    def test_bad_payloads(self):
+        self.assertEqual(self.post('hobbies', '{not json').status_code, 400)
+        response = self.post('hobbies', {'name': 'Chess'})
+        self.assertEqual((response.status_code, response.json()['error']), (400, 'Expected a JSON array of items'))
+        with override_settings(API_MAX_BATCH_SIZE=2):
+            self.assertEqual(self.post('hobbies', [{'name': str(i)} for i in range(3)]).status_code, 400)
+        self.assertEqual(Hobby.objects.count(), 1)
+
+    def test_requires_login_and_post(self):
+        self.assertEqual(self.client.get('/api/hobbies/batch/').status_code, 405)
+        self.client.logout()
+        self.assertEqual(self.post('hobbies', [{'name': 'Chess'}]).status_code, 401)
+        self.assertFalse(Hobby.objects.filter(name='Chess').exists())
@@ -0,0 +1,85 @@
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from api.caching import cache_page_for_anonymous, invalidate_page_cache
+from api.models import Skills
+
+
+class PageCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.calls = 0
+
+    def view(self, request):
+        self.calls += 1
+        response = HttpResponse(f'page {self.calls}')
+        response['X-Page'] = str(self.calls)
+        return response
+
+    def get(self, path='/page/', user=None, **extra):
+        request = self.factory.get(path, **extra)
+        request.user = user or AnonymousUser()
+        return cache_page_for_anonymous(query_params=('section',))(self.view)(request)
+
+    def test_anonymous_responses_are_served_from_the_cache(self):
+        first, second = self.get(), self.get()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['X-Page'], '1')
+
+    def test_invalidation_drops_every_cached_page(self):
+        self.get()
+        self.get('/other/')
+        invalidate_page_cache()
+        self.get()
+        self.get('/other/')
+        self.assertEqual(self.calls, 4)
+
+    def test_listed_query_params_and_ajax_get_their_own_entries(self):
+        self.get('/page/?section=books')
+        self.get('/page/?section=photos')
+        self.get('/page/?section=books&utm_source=feed')
+        self.get('/page/?section=books', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(self.calls, 3)
+
+    def test_logged_in_users_bypass_the_cache(self):
+        user = User(pk=1, username='admin')
+        self.get(user=user)
+        self.get(user=user)
+        self.assertEqual(self.calls, 2)
+
+    def test_responses_setting_cookies_are_not_cached(self):
+        def view(request):
+            self.calls += 1
+            response = HttpResponse('private')
+            response.set_cookie('csrftoken', 'abc')
+            return response
+
+        cached = cache_page_for_anonymous()(view)
+        for _ in range(2):
+            request = self.factory.get('/')
+            request.user = AnonymousUser()
+            cached(request)
+        self.assertEqual(self.calls, 2)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)
+    def test_disabled_by_a_zero_timeout(self):
+        self.get()
+        self.get()
+        self.assertEqual(self.calls, 2)
+
+
+class PageCacheInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_model_writes_invalidate_cached_pages(self):
+        Skills.objects.create(name='Python', category='Programming Languages')
+        self.assertContains(self.client.get('/skills/'), 'Python')
+        Skills.objects.create(name='Rust', category='Programming Languages')
+        self.assertContains(self.client.get('/skills/'), 'Rust')
+        Skills.objects.filter(name='Rust').get().delete()
+        self.assertNotContains(self.client.get('/skills/'), 'Rust')
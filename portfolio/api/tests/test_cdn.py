@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api import purge
+from api.models import Book, Skills
+from api.tests.utils import StubClient, json_response
+
+LOCAL_PURGE = {'BACKEND': 'api.purge.LocalPurgeBackend'}
+
+
+@override_settings(CDN_S_MAXAGE=120, CDN_STALE_WHILE_REVALIDATE=3600, CDN_CACHE_TAG_HEADER='Cache-Tag')
+class EdgeCacheHeaderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_public_responses_are_cached_at_the_edge_and_tagged(self):
+        for path, tags in (
+            ('/skills/', 'api.skills'),
+            ('/library/', 'api.book api.photo api.project'),
+            ('/api/books/', 'api.book'),
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                cache_control = {part.strip() for part in response['Cache-Control'].split(',')}
+                self.assertTrue({'public', 'max-age=0', 's-maxage=120', 'stale-while-revalidate=3600'} <= cache_control)
+                self.assertEqual(response['Cache-Tag'], tags)
+
+    def test_not_modified_responses_keep_the_policy(self):
+        etag = self.client.get('/api/books/')['ETag']
+        response = self.client.get('/api/books/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('s-maxage=120', response['Cache-Control'])
+
+    def test_logged_in_responses_are_private(self):
+        self.client.force_login(User.objects.create_user('admin', password='secret'))
+        response = self.client.get('/skills/')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-store', response['Cache-Control'])
+        self.assertFalse(response.has_header('Cache-Tag'))
+
+    def test_error_responses_are_not_cached_at_the_edge(self):
+        response = self.client.get('/library/unknown/')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('s-maxage', response.get('Cache-Control', ''))
+
+
+@override_settings(CDN_PURGE_BACKEND=LOCAL_PURGE)
+class PurgeOnWriteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_writes_purge_the_model_tag_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = Skills.objects.create(name='Python', category='Programming Languages')
+        self.assertEqual(purge.get_purge_backend().purged, [('api.skills',)])
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.delete()
+            Book.objects.create(title='Dune', author='Frank Herbert')
+        self.assertEqual(purge.get_purge_backend().purged[1:], [('api.skills',), ('api.book',)])
+
+    def test_nothing_is_purged_before_the_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Skills.objects.create(name='Python')
+        self.assertTrue(callbacks)
+        self.assertEqual(purge.get_purge_backend().purged, [])
+
+
+class PurgeBackendTests(SimpleTestCase):
+    def test_failures_are_logged_not_raised(self):
+        backend = mock.Mock(purge_tags=mock.Mock(side_effect=ConnectionError('down')))
+        with mock.patch('api.purge.get_purge_backend', return_value=backend):
+            with self.assertLogs('api.purge', 'ERROR'):
+                self.assertFalse(purge.purge_tags(['api.skills']))
+
+    def test_nothing_to_purge(self):
+        self.assertFalse(purge.purge_tags([]))
+
+    @override_settings(CDN_PURGE_BACKEND={
+        'BACKEND': 'api.purge.WebhookPurgeBackend',
+        'OPTIONS': {'url': 'https://purge.example.com/', 'token': 'secret'},
+    })
+    def test_webhook_backend_posts_the_tags_once(self):
+        client = StubClient(json_response({'ok': True}))
+        with mock.patch('api.purge.get_client', return_value=client):
+            self.assertTrue(purge.purge_tags(['api.skills', 'api.book', 'api.skills']))
+        (method, url, kwargs), = client.calls
+        self.assertEqual((method, url), ('POST', 'https://purge.example.com/'))
+        self.assertEqual(kwargs['json'], {'tags': ['api.book', 'api.skills']})
+        self.assertEqual(kwargs['headers'], {'Authorization': 'Bearer secret'})
+        # Purges are not idempotent requests, so they are never retried
+        self.assertNotIn('idempotent', kwargs)
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.changes import changes_since
+from api.models import Book, Country, Hobby, Tombstone
+from api.pagination import encode_cursor
+
+
+@override_settings(CHANGES_SETTLE_SECONDS=0)
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.hobby = Hobby.objects.create(name='Chess', category='Games')
+        self.book = Book.objects.create(title='Dune', author='Frank Herbert')
+        self.country = Country.objects.create(name='Japan', code='JP')
+
+    def poll(self, since=None, limit=None):
+        params = {key: value for key, value in (('since', since), ('limit', limit)) if value is not None}
+        response = self.client.get('/api/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def keys(self, data):
+        return [(change['op'], change['collection'], change['id']) for change in data['changes']]
+
+    def test_full_sync_lists_every_item_oldest_first(self):
+        data = self.poll()
+        self.assertEqual(self.keys(data), [
+            ('upsert', 'hobbies', self.hobby.pk), ('upsert', 'books', self.book.pk), ('upsert', 'countries', self.country.pk),
+        ])
+        self.assertEqual(data['changes'][1]['data']['title'], 'Dune')
+        self.assertFalse(data['has_more'])
+
+    def test_pages_continue_from_the_cursor(self):
+        first = self.poll(limit=2)
+        self.assertTrue(first['has_more'])
+        second = self.poll(first['cursor'], limit=2)
+        self.assertFalse(second['has_more'])
+        self.assertEqual(self.keys(first) + self.keys(second), self.keys(self.poll()))
+
+    def test_polling_returns_only_what_changed(self):
+        cursor = self.poll()['cursor']
+        empty = self.poll(cursor)
+        self.assertEqual((empty['changes'], empty['cursor']), ([], cursor))
+
+        self.book.rating = 5
+        self.book.save()
+        pk = self.hobby.pk
+        self.hobby.delete()
+        data = self.poll(cursor)
+        self.assertEqual(self.keys(data), [('upsert', 'books', self.book.pk), ('delete', 'hobbies', pk)])
+        self.assertEqual(data['changes'][0]['data']['rating'], 5)
+
+    def test_changes_at_the_same_instant_are_not_skipped(self):
+        now = timezone.now() - timedelta(seconds=1)
+        for model in (Hobby, Book, Country):
+            model.objects.update(updated_at=now)
+        Country.objects.create(name='Peru', code='PE')
+        Country.objects.filter(code='PE').update(updated_at=now)
+        seen, cursor = [], None
+        while True:
+            data = self.poll(cursor, limit=1)
+            seen += self.keys(data)
+            cursor = data['cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(set(seen)), 4)
+
+    @override_settings(CHANGES_SETTLE_SECONDS=60)
+    def test_recent_changes_are_held_back(self):
+        self.assertEqual(self.poll()['changes'], [])
+
+    @override_settings(CHANGES_TOMBSTONE_RETENTION_DAYS=30)
+    def test_old_cursors_must_resync(self):
+        cursor = encode_cursor([timezone.now() - timedelta(days=31), 'books', 1])
+        response = self.client.get('/api/changes/', {'since': cursor})
+        self.assertEqual(response.status_code, 410)
+        self.assertIn('/api/snapshot/', response.json()['error'])
+
+    @override_settings(CHANGES_TOMBSTONE_RETENTION_DAYS=30)
+    def test_old_tombstones_are_pruned(self):
+        Tombstone.objects.create(collection='books', object_id=999)
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        self.hobby.delete()
+        self.assertEqual(list(Tombstone.objects.values_list('collection', flat=True)), ['hobbies'])
+
+    def test_bad_parameters_are_rejected(self):
+        for params in (
+            {'since': 'garbage'}, {'since': encode_cursor(['2026-01-01', 'secrets', 1])},
+            {'since': encode_cursor([timezone.now().isoformat(), 'books', 'x'])}, {'limit': 0},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/changes/', params).status_code, 400)
+
+    def test_feed_queries_stay_bounded(self):
+        Book.objects.bulk_create(Book(title=f'Book {i}', author='Author') for i in range(50))
+        with self.assertNumQueries(7):
+            page = changes_since(limit=5)
+        self.assertEqual(len(page.changes), 5)
+        self.assertTrue(page.has_more)
@@ -0,0 +1,100 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from api import github
+from api.circuitbreaker import CircuitBreaker
+from api.tests.utils import StubClient, calendar_response, calendar_weeks, json_response
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.breaker = CircuitBreaker('test', {'timeout': 30, 'rate_limit': 60}, max_delay=300)
+
+    def test_backoff_doubles_per_consecutive_failure_up_to_the_maximum(self):
+        delays = [self.breaker.record_failure('timeout') for _ in range(6)]
+        self.assertEqual(delays, [30, 60, 120, 240, 300, 300])
+
+    def test_failure_classes_back_off_independently(self):
+        self.breaker.record_failure('timeout')
+        self.breaker.record_failure('timeout')
+        self.assertEqual(self.breaker.record_failure('rate_limit'), 60)
+
+    def test_longer_retry_after_is_honoured(self):
+        self.assertEqual(self.breaker.record_failure('rate_limit', retry_after=200), 200)
+        # Capped at the maximum, and never shorter than the backoff
+        self.assertEqual(self.breaker.record_failure('rate_limit', retry_after=9999), 300)
+        self.assertEqual(self.breaker.record_failure('timeout', retry_after=5), 30)
+
+    def test_open_entry_expires_with_the_backoff(self):
+        self.breaker.record_failure('timeout', 'slow')
+        entry = self.breaker.open_failure()
+        self.assertEqual(entry['failure_class'], 'timeout')
+        self.assertEqual(entry['message'], 'slow')
+        self.assertAlmostEqual(entry['open_until'] - entry['opened_at'], 30)
+
+    def test_success_closes_and_resets_the_backoff(self):
+        self.breaker.record_failure('timeout')
+        self.breaker.record_failure('timeout')
+        self.breaker.record_success()
+        self.assertFalse(self.breaker.is_open())
+        self.assertEqual(self.breaker.record_failure('timeout'), 30)
+
+
+@override_settings(GITHUB_TOKEN='test-token')
+class GitHubBreakerTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_stub = StubClient(calendar_response(calendar_weeks()))
+        patcher = mock.patch('api.github.get_client', return_value=self.client_stub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch_failing_with(self, response):
+        self.client_stub.responses = [response]
+        with self.assertLogs('api.github', 'ERROR'):
+            self.assertIsNone(github.fetch_github_contributions())
+        return github.breaker.open_failure()
+
+    def test_open_breaker_skips_the_request(self):
+        github.breaker.record_failure('timeout')
+        self.assertIsNone(github.fetch_github_contributions())
+        self.assertEqual(self.client_stub.calls, [])
+
+    def test_success_closes_the_breaker(self):
+        calendar, full_sync = github.fetch_github_contributions()
+        self.assertTrue(full_sync)
+        self.assertGreater(calendar.total, 0)
+        self.assertFalse(github.breaker.is_open())
+
+    def test_failures_are_classified(self):
+        cases = [
+            (json_response({}, status=401), 'auth'),
+            (json_response({}, status=429), 'rate_limit'),
+            (json_response({}, status=403, headers={'X-RateLimit-Remaining': '0'}), 'rate_limit'),
+            (json_response({}, status=403), 'forbidden'),
+            (json_response({}, status=502), 'http'),
+            (json_response({'errors': [{'message': 'bad query'}]}), 'graphql'),
+            (json_response({'data': {'user': None}}), 'not_found'),
+            (json_response({'data': None}), 'invalid_response'),
+            (github.requests.exceptions.ReadTimeout(), 'timeout'),
+            (github.requests.exceptions.ConnectionError(), 'network'),
+        ]
+        for response, failure_class in cases:
+            with self.subTest(failure_class=failure_class):
+                cache.clear()
+                self.assertEqual(self.fetch_failing_with(response)['failure_class'], failure_class)
+
+    def test_rate_limit_retry_after_header_sets_the_backoff(self):
+        entry = self.fetch_failing_with(json_response({}, status=429, headers={'Retry-After': '900'}))
+        self.assertAlmostEqual(entry['open_until'] - entry['opened_at'], 900)
+
+    def test_rate_limit_reset_header_sets_the_backoff(self):
+        reset = int(time.time()) + 1200
+        entry = self.fetch_failing_with(json_response({}, status=403, headers={
+            'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset),
+        }))
+        self.assertAlmostEqual(entry['open_until'] - entry['opened_at'], 1200, delta=2)
@@ -0,0 +1,88 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from api import github
+from api.models import Project
+from api.tests.utils import make_calendar
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        entry = github.store_contributions(make_calendar())
+        github.save_snapshot(entry)
+        self.project = Project.objects.create(title='Portfolio', description='This site')
+
+    def test_matching_etag_gets_304(self):
+        for path in ('/', '/skills/', '/library/', '/api/projects/', '/api/snapshot/'):
+            with self.subTest(path=path):
+                etag = self.client.get(path)['ETag']
+                response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+
+    def test_etag_survives_a_cold_instance(self):
+        etag = self.client.get('/')['ETag']
+        # A new instance starts with an empty cache and loads the calendar from the snapshot
+        cache.clear()
+        self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_304_costs_one_query_and_no_rendering(self):
+        etag = self.client.get('/api/projects/')['ETag']
+        cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get('/api/projects/')['ETag']
+        self.project.title = 'Renamed'
+        self.project.save()
+        response = self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_unrelated_writes_keep_the_etag(self):
+        etag = self.client.get('/api/projects/')['ETag']
+        github.store_contributions(make_calendar(count=3))
+        response = self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get('/api/projects/')['Last-Modified']
+        response = self.client.get('/api/projects/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        time.sleep(1)
+        self.project.save()
+        response = self.client.get('/api/projects/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+
+    def test_error_responses_carry_no_validators(self):
+        for path, status in (
+            ('/library/unknown/', 404),
+            ('/library/projects/?after=garbage', 400),
+            ('/api/projects/?limit=0', 400),
+            ('/api/projects/?fields=secret', 400),
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, status)
+                self.assertFalse(response.has_header('ETag'))
+                self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_logged_in_users_get_their_own_etag(self):
+        anonymous = self.client.get('/')['ETag']
+        self.client.force_login(User.objects.create_user('admin', password='secret'))
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=anonymous)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], anonymous)
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_accept_selects_a_different_etag(self):
+        json_etag = self.client.get('/api/projects/')['ETag']
+        response = self.client.get('/api/projects/', HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=json_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Accept', response['Vary'])
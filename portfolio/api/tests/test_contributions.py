@@ -0,0 +1,100 @@
+import pickle
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from api.contributions import ContributionCalendar
+from api.tests.utils import calendar_weeks, make_calendar, weeks_total
+
+
+class ContributionCalendarTests(SimpleTestCase):
+    def setUp(self):
+        self.weeks = calendar_weeks(end=date(2026, 10, 17), count=3)
+        self.calendar = ContributionCalendar.from_weeks(self.weeks, weeks_total(self.weeks))
+
+    def test_days_match_the_graphql_weeks(self):
+        days = [day for week in self.weeks for day in week['contributionDays']]
+        self.assertEqual(len(self.calendar), len(days))
+        for packed, raw in zip(self.calendar.days(), days):
+            self.assertEqual(packed.date.isoformat(), raw['date'])
+            self.assertEqual(packed.count, raw['contributionCount'])
+            self.assertEqual(packed.level, raw['contributionLevel'])
+        self.assertEqual(self.calendar.end, date(2026, 10, 17))
+
+    def test_weeks_start_on_sunday(self):
+        weeks = list(self.calendar.weeks())
+        self.assertEqual(len(weeks), len(self.weeks))
+        self.assertTrue(all(week[0].date.weekday() == 6 for week in weeks))
+        self.assertEqual(len(self.calendar.month_labels()), 13)
+
+    def test_pickle_round_trip_is_compact(self):
+        payload = pickle.dumps(self.calendar, pickle.HIGHEST_PROTOCOL)
+        self.assertEqual(pickle.loads(payload), self.calendar)
+        raw = pickle.dumps(self.weeks, pickle.HIGHEST_PROTOCOL)
+        self.assertLess(len(payload), len(raw) / 4)
+
+    def test_json_round_trip(self):
+        self.assertEqual(ContributionCalendar.from_json(self.calendar.to_json()), self.calendar)
+
+    def test_graphql_shaped_snapshots_still_load(self):
+        legacy = {'total_contributions': weeks_total(self.weeks), 'weeks': self.weeks}
+        self.assertEqual(ContributionCalendar.from_json(legacy), self.calendar)
+
+    def test_empty_calendar(self):
+        empty = ContributionCalendar()
+        self.assertEqual(list(empty.days()), [])
+        self.assertIsNone(empty.end)
+        self.assertEqual(ContributionCalendar.from_json(empty.to_json()), empty)
+        self.assertEqual(pickle.loads(pickle.dumps(empty)), empty)
+
+    def test_digest_changes_with_the_content(self):
+        self.assertEqual(make_calendar(end=date(2026, 10, 17), count=3).digest, self.calendar.digest)
+        self.assertNotEqual(make_calendar(end=date(2026, 10, 17), count=2).digest, self.calendar.digest)
+
+    def test_contributions_since(self):
+        since = self.calendar.end - timedelta(days=9)
+        self.assertEqual(self.calendar.contributions_since(since), 30)
+        self.assertEqual(self.calendar.contributions_since(date(2000, 1, 1)), self.calendar.total)
+
+
+class BenchmarkCalendarCommandTests(SimpleTestCase):
+    def test_prints_both_forms(self):
+        out = StringIO()
+        call_command('benchmark_calendar', repeat=2, stdout=out)
+        self.assertIn('raw GraphQL dicts', out.getvalue())
+        self.assertIn('packed calendar', out.getvalue())
+
+
+class MergeTests(SimpleTestCase):
+    def setUp(self):
+        self.calendar = make_calendar(end=date(2026, 10, 17), count=1)
+
+    def test_merge_extends_the_calendar_and_overwrites_days(self):
+        merged = self.calendar.merge([(date(2026, 10, 17), 4), (date(2026, 10, 18), 2)], self.calendar.start, 999)
+        self.assertEqual(merged.end, date(2026, 10, 18))
+        self.assertEqual(merged.start, self.calendar.start)
+        self.assertEqual([day.count for day in merged.days()][-3:], [1, 4, 2])
+        self.assertEqual(merged.total, 999)
+
+    def test_merge_drops_whole_weeks_before_the_window(self):
+        window_start = self.calendar.start + timedelta(days=10)
+        merged = self.calendar.merge([(date(2026, 10, 18), 1)], window_start, 0)
+        self.assertEqual(merged.start, self.calendar.start + timedelta(days=7))
+        self.assertEqual(merged.start.weekday(), 6)
+
+    def test_merged_levels_follow_the_observed_thresholds(self):
+        weeks = calendar_weeks(end=date(2026, 10, 17), days=14, count=0)
+        for day, (count, level) in zip(weeks[0]['contributionDays'], [
+            (1, 'FIRST_QUARTILE'), (3, 'SECOND_QUARTILE'), (6, 'THIRD_QUARTILE'), (10, 'FOURTH_QUARTILE'),
+        ]):
+            day.update(contributionCount=count, contributionLevel=level)
+        calendar = ContributionCalendar.from_weeks(weeks, 20)
+        self.assertEqual(calendar.level_for(0), 'NONE')
+        self.assertEqual(calendar.level_for(2), 'FIRST_QUARTILE')
+        self.assertEqual(calendar.level_for(7), 'THIRD_QUARTILE')
+        self.assertEqual(calendar.level_for(50), 'FOURTH_QUARTILE')
+
+    def test_merging_nothing_returns_the_calendar(self):
+        self.assertIs(self.calendar.merge([], self.calendar.start, 0), self.calendar)
@@ -0,0 +1,91 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+
+from api.export import NDJSON_CONTENT_TYPE
+from api.models import Country, Project
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Country.objects.bulk_create(
+            Country(name=f'Country {i}', code=f'C{i}', flag_emoji='🏳️') for i in range(5)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def export(self, query='', collection='countries', **extra):
+        return self.client.get(f'/api/export/{collection}/{query}', **extra)
+
+    def body(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_ndjson_by_default(self):
+        response = self.export()
+        self.assertEqual(response['Content-Type'], NDJSON_CONTENT_TYPE)
+        self.assertEqual(response['Content-Disposition'], 'inline; filename="countries.ndjson"')
+        lines = self.body(response).decode().splitlines()
+        self.assertEqual([json.loads(line)['name'] for line in lines], [f'Country {i}' for i in range(5)])
+
+    def test_json_array_by_format_or_accept(self):
+        for response in (self.export('?format=json'), self.export(HTTP_ACCEPT='application/json')):
+            self.assertEqual(response['Content-Type'], 'application/json')
+            rows = json.loads(self.body(response))
+            self.assertEqual(len(rows), 5)
+            self.assertEqual(set(rows[0]), {'id', 'name', 'code', 'flag_emoji', 'thoughts', 'created_at', 'updated_at'})
+
+    def test_empty_collection(self):
+        self.assertEqual(self.body(self.export('?format=json', collection='photos')), b'[]')
+        self.assertEqual(self.body(self.export(collection='photos')), b'')
+
+    def test_fields_projection(self):
+        rows = json.loads(self.body(self.export('?format=json&fields=name,code')))
+        self.assertEqual(rows[0], {'name': 'Country 0', 'code': 'C0'})
+
+    def test_files_are_exported_as_urls(self):
+        Project.objects.bulk_create([
+            Project(title='With image', description='x', image='projects/cover.jpg'),
+            Project(title='Without image', description='x'),
+        ])
+        rows = json.loads(self.body(self.export('?format=json&fields=title,image', collection='projects')))
+        self.assertEqual({row['title']: row['image'] for row in rows}, {
+            'With image': default_storage.url('projects/cover.jpg'), 'Without image': None,
+        })
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_database_errors_leave_the_document_incomplete(self):
+        def failing_rows(collection, fields=None):
+            yield from ({'name': f'Country {i}'} for i in range(3))
+            raise DatabaseError('connection lost')
+
+        for query in ('?format=json', ''):
+            with self.subTest(query=query), mock.patch('api.export.export_rows', failing_rows):
+                received = []
+                with self.assertLogs('api.export', 'ERROR'), self.assertRaises(DatabaseError):
+                    for chunk in self.export(query).streaming_content:
+                        received.append(chunk)
+                body = b''.join(received)
+                self.assertIn(b'Country 1', body)
+                self.assertFalse(body.endswith(b']'))
+                with self.assertRaises(ValueError):
+                    json.loads(body)
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_rows_are_sent_one_chunk_at_a_time(self):
+        chunks = list(self.export().streaming_content)
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [2, 2, 1])
+        chunks = list(self.export('?format=json').streaming_content)
+        self.assertEqual(len(chunks), 5)  # brackets and three chunks
+        self.assertEqual(len(json.loads(b''.join(chunks))), 5)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.export('?fields=name,password').status_code, 400)
+        self.assertEqual(self.export('?format=csv').status_code, 400)
+        self.assertEqual(self.export(collection='users').status_code, 404)
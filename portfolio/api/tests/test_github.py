@@ -0,0 +1,288 @@
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import caching, github
+from api.contributions import ContributionCalendar
+from api.models import ContentVersion, ContributionSnapshot
+from api.tests.utils import (
+    StubClient, calendar_response, calendar_weeks, make_calendar, recent_response, weeks_total,
+)
+from api.versions import GITHUB_CONTRIBUTIONS
+
+
+@override_settings(GITHUB_TOKEN='test-token', GITHUB_CONTRIBUTIONS_INCREMENTAL=False)
+class StaleWhileRevalidateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.weeks = calendar_weeks(count=2)
+        self.client_stub = StubClient(calendar_response(self.weeks))
+        patcher = mock.patch('api.github.get_client', return_value=self.client_stub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_miss_fetches_once_then_serves_from_cache(self):
+        calendar = github.get_github_contributions()
+        self.assertEqual(calendar.total, 2 * len(list(calendar.days())))
+        self.assertEqual(github.get_github_contributions(), calendar)
+        self.assertEqual(len(self.client_stub.calls), 1)
+        # GraphQL queries are reads, so the POST opts in to retries
+        self.assertTrue(self.client_stub.calls[0][2]['idempotent'])
+
+    def test_fresh_entry_is_served_without_refreshing(self):
+        cached = make_calendar(count=1)
+        github.store_contributions(cached)
+        with mock.patch('api.github.refresh_in_background') as refresh:
+            self.assertEqual(github.get_github_contributions(), cached)
+        refresh.assert_not_called()
+        self.assertEqual(self.client_stub.calls, [])
+
+    def test_stale_entry_is_served_while_one_refresh_starts(self):
+        stale = make_calendar(count=1)
+        github.store_contributions(stale, fetched_at=time.time() - github._soft_ttl() - 1)
+        with mock.patch('api.github.refresh_in_background') as refresh:
+            self.assertEqual(github.get_github_contributions(), stale)
+        refresh.assert_called_once_with()
+        # The visitor never waited on GitHub
+        self.assertEqual(self.client_stub.calls, [])
+
+    def test_only_one_background_refresh_runs_at_a_time(self):
+        cache.add(github.REFRESH_LOCK_KEY, True, github.REFRESH_LOCK_TIMEOUT)
+        with mock.patch('api.github.threading.Thread') as thread:
+            self.assertFalse(github.refresh_in_background())
+        thread.assert_not_called()
+
+    def test_refresh_replaces_the_cached_calendar(self):
+        github.store_contributions(make_calendar(count=1), fetched_at=time.time() - 3600)
+        refreshed = github.refresh_github_contributions()
+        self.assertEqual(refreshed.total, sum(day.count for day in refreshed.days()))
+        entry = cache.get(github.CACHE_KEY)
+        self.assertEqual(entry['data'], refreshed)
+        self.assertLess(time.time() - entry['fetched_at'], 60)
+
+    def test_failed_refresh_keeps_serving_the_stale_calendar(self):
+        self.client_stub.responses = [github.requests.exceptions.ConnectionError('down')]
+        stale = make_calendar(count=1)
+        github.store_contributions(stale, fetched_at=time.time() - github._soft_ttl() - 1)
+        with self.assertLogs('api.github', 'ERROR'):
+            self.assertIsNone(github.refresh_github_contributions())
+        self.assertEqual(cache.get(github.CACHE_KEY)['data'], stale)
+
+    @override_settings(GITHUB_CONTRIBUTIONS_HARD_TTL=120)
+    def test_entries_are_cached_for_the_hard_ttl(self):
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            github.store_contributions(make_calendar())
+        cache_set.assert_any_call(github.CACHE_KEY, mock.ANY, 120)
+
+
+@override_settings(GITHUB_TOKEN='test-token', GITHUB_CONTRIBUTIONS_INCREMENTAL=False)
+class SnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.weeks = calendar_weeks(count=4)
+        self.client_stub = StubClient(calendar_response(self.weeks))
+        patcher = mock.patch('api.github.get_client', return_value=self.client_stub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fetch_stores_the_snapshot(self):
+        calendar = github.refresh_github_contributions()
+        snapshot = ContributionSnapshot.objects.get(username=github._username())
+        self.assertEqual(ContributionCalendar.from_json(snapshot.data), calendar)
+
+    def test_cold_cache_is_served_from_the_snapshot(self):
+        calendar = github.refresh_github_contributions()
+        cache.clear()
+        self.client_stub.calls.clear()
+        with mock.patch('api.github.refresh_in_background') as refresh:
+            self.assertEqual(github.get_github_contributions(), calendar)
+        refresh.assert_not_called()
+        self.assertEqual(self.client_stub.calls, [])
+        self.assertEqual(cache.get(github.CACHE_KEY)['data'], calendar)
+
+    def test_stale_snapshot_is_served_and_refreshed_in_the_background(self):
+        calendar = github.refresh_github_contributions()
+        ContributionSnapshot.objects.update(fetched_at=timezone.now() - timedelta(days=1))
+        cache.clear()
+        with mock.patch('api.github.refresh_in_background') as refresh:
+            self.assertEqual(github.get_github_contributions(), calendar)
+        refresh.assert_called_once_with()
+
+    def test_failed_fetch_leaves_the_snapshot_unchanged(self):
+        calendar = github.refresh_github_contributions()
+        github.breaker.record_failure('timeout')
+        out, err = StringIO(), StringIO()
+        call_command('sync_github_contributions', stdout=out, stderr=err)
+        self.assertIn('left unchanged', err.getvalue())
+        snapshot = ContributionSnapshot.objects.get(username=github._username())
+        self.assertEqual(ContributionCalendar.from_json(snapshot.data), calendar)
+
+    def test_sync_command_stores_the_snapshot(self):
+        out = StringIO()
+        call_command('sync_github_contributions', stdout=out)
+        self.assertIn(f'{weeks_total(self.weeks)} total', out.getvalue())
+        self.assertTrue(ContributionSnapshot.objects.filter(username=github._username()).exists())
+
+
+class ContributionGraphTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_graph_is_rendered_once_per_calendar(self):
+        calendar = make_calendar(count=2)
+        with mock.patch('api.github.render_to_string', wraps=github.render_to_string) as render:
+            github.store_contributions(calendar)
+            html = github.contribution_graph_html(calendar)
+            github.contribution_graph_html(make_calendar(count=2))
+        render.assert_called_once()
+        self.assertEqual(cache.get(github.GRAPH_CACHE_KEY.format(digest=calendar.digest)), html)
+        self.assertEqual(html.count('data-date='), len(calendar))
+
+    def test_changed_calendar_gets_its_own_fragment(self):
+        first, second = make_calendar(count=0), make_calendar(count=1)
+        self.assertNotEqual(github.contribution_graph_html(first), github.contribution_graph_html(second))
+
+    def test_empty_calendar_renders_nothing(self):
+        self.assertEqual(github.contribution_graph_html(ContributionCalendar()), '')
+
+    def test_index_inlines_the_cached_fragment(self):
+        calendar = make_calendar(count=2)
+        github.store_contributions(calendar)
+        with mock.patch('api.github.render_to_string') as render:
+            response = self.client.get('/')
+        render.assert_not_called()
+        self.assertContains(response, github.contribution_graph_html(calendar), html=False)
+
+
+@override_settings(GITHUB_TOKEN='test-token', GITHUB_CONTRIBUTIONS_INCREMENTAL=True)
+class IncrementalSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = date.today()
+        self.base = make_calendar(end=self.today - timedelta(days=1), count=1)
+        self.full_synced_at = time.time() - 3600
+        github.store_contributions(self.base, fetched_at=time.time() - 3600, full_synced_at=self.full_synced_at)
+        self.year_start = self.base.start + timedelta(days=1)
+        self.recent_days = [
+            (self.today - timedelta(days=2), 1),
+            (self.today - timedelta(days=1), 2),
+            (self.today, 2),
+        ]
+        self.client_stub = StubClient()
+        patcher = mock.patch('api.github.get_client', return_value=self.client_stub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def queries(self):
+        return [kwargs['json']['query'] for _, _, kwargs in self.client_stub.calls]
+
+    def test_recent_days_are_merged_into_the_cached_calendar(self):
+        # Every day from the year start is 1, except yesterday and today
+        total = len(self.base) + 2
+        self.client_stub.responses = [recent_response(self.recent_days, total, self.year_start)]
+        calendar = github.refresh_github_contributions()
+        self.assertEqual(self.queries(), [github.RECENT_QUERY])
+        self.assertEqual(calendar.end, self.today)
+        self.assertEqual([day.count for day in calendar.days()][-3:], [1, 2, 2])
+        self.assertEqual(calendar.total, total)
+        self.assertEqual(cache.get(github.CACHE_KEY)['full_synced_at'], self.full_synced_at)
+
+    def test_checksum_mismatch_falls_back_to_a_full_fetch(self):
+        weeks = calendar_weeks(count=3)
+        self.client_stub.responses = [
+            recent_response(self.recent_days, 12345, self.year_start),
+            calendar_response(weeks),
+        ]
+        with self.assertLogs('api.github', 'INFO') as logs:
+            calendar = github.refresh_github_contributions()
+        self.assertIn('checksum mismatch', '\n'.join(logs.output))
+        self.assertEqual(self.queries(), [github.RECENT_QUERY, github.CALENDAR_QUERY])
+        self.assertEqual(calendar.total, weeks_total(weeks))
+        self.assertGreater(cache.get(github.CACHE_KEY)['full_synced_at'], self.full_synced_at)
+
+    @override_settings(GITHUB_CONTRIBUTIONS_FULL_SYNC_INTERVAL=60)
+    def test_full_fetch_once_the_full_sync_interval_has_passed(self):
+        self.client_stub.responses = [calendar_response(calendar_weeks())]
+        github.refresh_github_contributions()
+        self.assertEqual(self.queries(), [github.CALENDAR_QUERY])
+
+    def test_full_fetch_when_the_cached_calendar_is_too_far_behind(self):
+        old = make_calendar(end=self.today - timedelta(days=github.INCREMENTAL_MAX_GAP_DAYS + 1))
+        github.store_contributions(old)
+        self.client_stub.responses = [calendar_response(calendar_weeks())]
+        github.refresh_github_contributions()
+        self.assertEqual(self.queries(), [github.CALENDAR_QUERY])
+
+
+@override_settings(GITHUB_TOKEN='test-token', GITHUB_CONTRIBUTIONS_INCREMENTAL=False)
+class ContributionsUpdatedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.weeks = calendar_weeks(count=2)
+        self.client_stub = StubClient(calendar_response(self.weeks))
+        patcher = mock.patch('api.github.get_client', return_value=self.client_stub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.updates = []
+        github.contributions_updated.connect(self.record_update)
+        self.addCleanup(github.contributions_updated.disconnect, self.record_update)
+
+    def record_update(self, sender, calendar, **kwargs):
+        self.updates.append(calendar)
+
+    def github_version(self):
+        stamp = ContentVersion.objects.filter(key=GITHUB_CONTRIBUTIONS).first()
+        return stamp.version if stamp else 0
+
+    def cold_start(self):
+        """Forget everything cached, like a new instance (or an evicted cache)"""
+        cache.clear()
+
+    def test_new_calendar_is_announced_once(self):
+        calendar = github.refresh_github_contributions()
+        self.assertEqual(self.updates, [calendar])
+        self.assertEqual(self.github_version(), 1)
+
+    def test_cold_start_from_the_snapshot_announces_nothing(self):
+        github.refresh_github_contributions()
+        for _ in range(3):
+            self.cold_start()
+            with mock.patch('api.github.refresh_in_background'):
+                github.get_github_contributions()
+        self.assertEqual(len(self.updates), 1)
+        self.assertEqual(self.github_version(), 1)
+
+    def test_refetching_the_stored_calendar_announces_nothing(self):
+        github.refresh_github_contributions()
+        self.cold_start()
+        page_cache_version = caching.page_cache_version()
+        github.refresh_github_contributions()
+        self.assertEqual(len(self.updates), 1)
+        self.assertEqual(self.github_version(), 1)
+        self.assertEqual(caching.page_cache_version(), page_cache_version)
+
+    def test_changed_calendar_is_announced(self):
+        github.refresh_github_contributions()
+        changed = calendar_weeks(count=5)
+        self.client_stub.responses = [calendar_response(changed)]
+        calendar = github.refresh_github_contributions()
+        self.assertEqual(self.updates[-1], calendar)
+        self.assertEqual(calendar.total, weeks_total(changed))
+        self.assertEqual(self.github_version(), 2)
+
+    def test_calendar_stored_by_another_instance_only_drops_local_pages(self):
+        github.refresh_github_contributions()
+        # Another instance fetched and persisted a newer calendar first
+        newer = make_calendar(count=5)
+        github.save_snapshot({'data': newer, 'fetched_at': time.time()})
+        self.client_stub.responses = [calendar_response(calendar_weeks(count=5))]
+        page_cache_version = caching.page_cache_version()
+        github.refresh_github_contributions()
+        self.assertEqual(len(self.updates), 1)
+        self.assertGreater(caching.page_cache_version(), page_cache_version)
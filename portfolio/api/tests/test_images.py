@@ -0,0 +1,243 @@
+import io
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image, ImageChops
+
+from api import images
+from api.models import Photo, Skills
+from api.versions import read_stamps, version_key
+
+GPS_IFD = 0x8825
+
+
+def upload(name='photo.jpg', size=(120, 60), color='red', pil_format='JPEG', frames=1, **save_kwargs):
+    """An uploaded image with a camera make and GPS position in its EXIF"""
+    exif = Image.Exif()
+    exif[0x010F] = 'CameraMaker'
+    exif[GPS_IFD] = {1: 'N', 2: (51.0, 30.0, 0.0)}
+    mode = 'RGBA' if isinstance(color, tuple) and len(color) == 4 else 'RGB'
+    first, *rest = [Image.new(mode, size, color if i == 0 else (0, 0, 60 * i)) for i in range(frames)]
+    buffer = io.BytesIO()
+    if rest:
+        save_kwargs.update(save_all=True, append_images=rest, duration=100, loop=0)
+    first.save(buffer, pil_format, exif=exif.tobytes(), **save_kwargs)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+def rendition_names(renditions):
+    return [entry['name'] for entries in renditions['sources'].values() for entry in entries]
+
+
+@override_settings(IMAGE_RENDITION_WIDTHS=[40, 80], IMAGE_RENDITIONS_IN_BACKGROUND=False)
+class ImagePipelineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create(self, image=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Photo.objects.create(title='Photo', image=image or upload())
+
+    def test_uploads_are_stored_without_metadata(self):
+        photo = self.create()
+        with default_storage.open(photo.image.name) as stored:
+            data = stored.read()
+        self.assertNotIn(b'CameraMaker', data)
+        self.assertFalse(Image.open(io.BytesIO(data)).getexif())
+        self.assertEqual((photo.image_width, photo.image_height), (120, 60))
+        self.assertRegex(photo.image_color, '^#f[ef]0000$')
+
+    def test_originals_are_not_degraded(self):
+        noise = Image.effect_noise((64, 64), 40).convert('RGB')
+        for pil_format, extension, extra in (('JPEG', 'jpg', {'quality': 95}), ('WEBP', 'webp', {'quality': 90})):
+            with self.subTest(pil_format=pil_format):
+                buffer = io.BytesIO()
+                noise.save(buffer, pil_format, exif=Image.Exif().tobytes(), **extra)
+                uploaded = Image.open(io.BytesIO(buffer.getvalue()))
+                photo = self.create(SimpleUploadedFile(f'noise.{extension}', buffer.getvalue()))
+                with default_storage.open(photo.image.name) as stored:
+                    kept = Image.open(io.BytesIO(stored.read()))
+                    kept.load()
+                if pil_format == 'JPEG':
+                    self.assertEqual(kept.quantization, uploaded.quantization)
+                else:
+                    self.assertIsNone(ImageChops.difference(kept.convert('RGB'), uploaded.convert('RGB')).getbbox())
+
+    def test_renditions_wait_for_the_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            photo = Photo.objects.create(title='Photo', image=upload())
+        self.assertEqual(Photo.objects.get().image_renditions, {})
+        self.assertFalse(default_storage.exists('photos/renditions/'))
+        for callback in callbacks:
+            callback()
+        photo.refresh_from_db()
+        sources = photo.image_renditions['sources']
+        self.assertEqual([entry['width'] for entry in sources['image/jpeg']], [40, 80])
+        for name in rendition_names(photo.image_renditions):
+            self.assertTrue(default_storage.exists(name), name)
+
+    @override_settings(IMAGE_RENDITIONS_IN_BACKGROUND=True)
+    def test_renditions_are_made_in_a_background_thread(self):
+        with mock.patch('api.images.threading.Thread') as thread:
+            photo = self.create()
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+        self.assertEqual(Photo.objects.get(pk=photo.pk).image_renditions, {})
+
+    def test_animated_uploads_keep_their_frames_without_metadata(self):
+        for pil_format, extension, extra in (('GIF', 'gif', {'comment': b'Taken at home'}), ('WEBP', 'webp', {})):
+            with self.subTest(pil_format=pil_format):
+                photo = self.create(upload(f'clip.{extension}', pil_format=pil_format, frames=3, **extra))
+                with default_storage.open(photo.image.name) as stored:
+                    data = stored.read()
+                image = Image.open(io.BytesIO(data))
+                self.assertEqual((image.format, image.n_frames), (pil_format, 3))
+                self.assertNotIn('exif', image.info)
+                self.assertNotIn('comment', image.info)
+                self.assertNotIn(b'CameraMaker', data)
+                self.assertNotIn(b'Taken at home', data)
+                photo.refresh_from_db()
+                self.assertEqual(photo.image_renditions, {'sources': {}})
+
+    def test_replaced_images_lose_their_renditions(self):
+        photo = self.create()
+        photo.refresh_from_db()
+        old, old_color = rendition_names(photo.image_renditions), photo.image_color
+        with self.captureOnCommitCallbacks(execute=True):
+            photo.image = upload('other.jpg', color='green')
+            photo.save()
+        self.assertTrue(old)
+        for name in old:
+            self.assertFalse(default_storage.exists(name), name)
+        photo.refresh_from_db()
+        self.assertNotEqual(photo.image_color, old_color)
+        self.assertTrue(all(default_storage.exists(name) for name in rendition_names(photo.image_renditions)))
+
+    def test_deleted_images_lose_their_renditions(self):
+        photo = self.create()
+        photo.refresh_from_db()
+        names = rendition_names(photo.image_renditions)
+        with self.captureOnCommitCallbacks(execute=True):
+            photo.delete()
+        self.assertTrue(names)
+        for name in names:
+            self.assertFalse(default_storage.exists(name), name)
+
+    def test_renditions_of_an_image_replaced_meanwhile_are_discarded(self):
+        with self.captureOnCommitCallbacks():
+            photo = Photo.objects.create(title='Photo', image=upload())
+        generate = images.generate_renditions
+        made = []
+
+        def replace_during_generation(field_file, upload_dir):
+            renditions = generate(field_file, upload_dir)
+            made.extend(rendition_names(renditions))
+            Photo.objects.filter(pk=photo.pk).update(image='photos/newer.jpg')
+            return renditions
+
+        with mock.patch('api.images.generate_renditions', side_effect=replace_during_generation):
+            self.assertFalse(images.store_renditions(Photo, photo.pk, 'image'))
+        self.assertEqual(Photo.objects.get().image_renditions, {})
+        self.assertTrue(made)
+        self.assertFalse(any(default_storage.exists(name) for name in made))
+
+    def test_recording_renditions_does_not_rebuild_pages(self):
+        with self.captureOnCommitCallbacks():
+            photo = Photo.objects.create(title='Photo', image=upload())
+        key = version_key(Photo)
+        before = read_stamps([key])[key][0]
+        with mock.patch('api.signals.prerender_changed') as prerender_changed, \
+                mock.patch('api.prerender.request_deploy') as request_deploy, \
+                mock.patch('api.images.purge_tags') as purge_tags:
+            self.assertTrue(images.store_renditions(Photo, photo.pk, 'image'))
+        prerender_changed.assert_not_called()
+        request_deploy.assert_not_called()
+        purge_tags.assert_called_once_with([key])
+        self.assertEqual(read_stamps([key])[key][0], before + 1)
+
+    def test_command_generates_missing_renditions(self):
+        with self.captureOnCommitCallbacks():
+            Photo.objects.create(title='Photo', image=upload())
+        out = StringIO()
+        call_command('generate_image_renditions', stdout=out)
+        self.assertIn('Generated renditions of 1 images', out.getvalue())
+        first = Photo.objects.get().image_renditions
+        self.assertTrue(first['sources'])
+
+        call_command('generate_image_renditions', stdout=out)
+        self.assertEqual(Photo.objects.get().image_renditions, first)
+
+        call_command('generate_image_renditions', force=True, stdout=out)
+        self.assertNotEqual(Photo.objects.get().image_renditions, first)
+        self.assertFalse(any(default_storage.exists(name) for name in rendition_names(first)))
+
+    def test_picture_tag_falls_back_to_img_until_renditions_exist(self):
+        template = Template("{% load images %}{% picture photo 'image' alt='A photo' %}")
+        with self.captureOnCommitCallbacks():
+            photo = Photo.objects.create(title='Photo', image=upload())
+        html = template.render(Context({'photo': photo}))
+        self.assertTrue(html.startswith('<img src="'))
+        self.assertIn('width="120" height="60"', html)
+        images.store_renditions(Photo, photo.pk, 'image')
+        photo.refresh_from_db()
+        html = template.render(Context({'photo': photo}))
+        self.assertTrue(html.startswith('<picture>'))
+        self.assertIn('40w', html)
+
+
+@override_settings(IMAGE_RENDITION_WIDTHS=[40], IMAGE_RENDITIONS_IN_BACKGROUND=False)
+class ImageMetadataTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.template = Template("{% load images %}{% picture photo 'image' %}")
+
+    def render(self, photo):
+        return self.template.render(Context({'photo': photo}))
+
+    def test_opaque_images_get_a_placeholder(self):
+        photo = Photo.objects.create(title='Photo', image=upload())
+        self.assertTrue(photo.image_placeholder.startswith('data:image/'))
+        self.assertIn('style="background: #f', self.render(photo))
+
+    def test_transparent_images_get_no_placeholder(self):
+        photo = Photo.objects.create(
+            title='Logo', image=upload('logo.png', color=(255, 0, 0, 0), pil_format='PNG'),
+        )
+        self.assertEqual((photo.image_width, photo.image_height), (120, 60))
+        self.assertEqual((photo.image_color, photo.image_placeholder), ('', ''))
+        html = self.render(photo)
+        self.assertIn('width="120" height="60"', html)
+        self.assertNotIn('style=', html)
+
+    def test_skill_icons_are_stripped_without_metadata(self):
+        skill = Skills.objects.create(name='Python', icon=upload('python.jpg'))
+        with default_storage.open(skill.icon.name) as stored:
+            self.assertNotIn(b'CameraMaker', stored.read())
+        self.assertFalse(hasattr(skill, 'icon_width'))
+
+    def test_backfill_command(self):
+        photo = Photo.objects.create(title='Photo', image=upload())
+        Photo.objects.update(image_width=None, image_height=None, image_color='', image_placeholder='')
+        out = StringIO()
+        call_command('backfill_image_metadata', stdout=out)
+        self.assertIn('Updated 1 images', out.getvalue())
+        refreshed = Photo.objects.get()
+        self.assertEqual((refreshed.image_width, refreshed.image_color), (120, photo.image_color))
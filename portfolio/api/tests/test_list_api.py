@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Book, Hobby, Project
+
+
+class ListApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Project.objects.bulk_create(
+            Project(title=f'Project {i}', description='A long description ' * 20) for i in range(25)
+        )
+        Hobby.objects.bulk_create(
+            Hobby(name=f'Hobby {i:02}', category='Outdoors' if i % 2 else 'Arts') for i in range(12)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def walk(self, url):
+        pages = []
+        while url:
+            data = self.client.get(url).json()
+            pages.append(data)
+            url = data['next']
+        return pages
+
+    def test_pages_follow_next_until_null(self):
+        pages = self.walk('/api/projects/')
+        self.assertEqual([len(page['results']) for page in pages], [10, 10, 5])
+        ids = [item['id'] for page in pages for item in page['results']]
+        self.assertEqual(ids, list(Project.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+    def test_count_is_opt_in(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/projects/').json()
+        self.assertNotIn('count', data)
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+        for page in self.walk('/api/projects/?limit=10&count=1'):
+            self.assertEqual(page['count'], 25)
+        first, = self.walk('/api/hobbies/?limit=100&count=1')
+        self.assertEqual(first['count'], 12)
+        self.assertEqual(len(first['hobbies']), 12)
+
+    def test_count_is_counted_once_per_version(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.walk('/api/projects/?limit=10&count=1')
+        self.assertEqual(len([query for query in queries if 'COUNT(' in query['sql']]), 1)
+        Project.objects.create(title='Another')
+        self.assertEqual(self.client.get('/api/projects/?count=1').json()['count'], 26)
+
+    @override_settings(API_MAX_PAGE_SIZE=20)
+    def test_limit_is_capped(self):
+        data = self.client.get('/api/projects/?limit=1000').json()
+        self.assertEqual(len(data['results']), 20)
+
+    def test_fields_select_only_those_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/projects/?fields=id,title').json()
+        self.assertEqual(set(data['results'][0]), {'id', 'title'})
+        page_query = [query['sql'] for query in queries if 'ORDER BY' in query['sql']][-1]
+        self.assertNotIn('"description"', page_query)
+
+    def test_next_keeps_the_other_parameters(self):
+        data = self.client.get('/api/hobbies/?fields=name&limit=5').json()
+        self.assertIn('fields=name', data['next'])
+        self.assertIn('limit=5', data['next'])
+        names = [hobby['name'] for page in self.walk(data['next']) for hobby in page['hobbies']]
+        self.assertEqual(len(names), 7)
+
+    def test_bad_parameters_are_rejected(self):
+        for query in ('fields=id,secret', 'limit=0', 'limit=ten', 'after=garbage'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/books/?{query}').status_code, 400)
+
+    def test_empty_list(self):
+        Book.objects.all().delete()
+        self.assertEqual(self.client.get('/api/books/').json(), {'results': [], 'next': None})
+
+
+class BenchmarkIndexesCommandTests(TestCase):
+    def test_reports_both_phases_and_rolls_back(self):
+        out = StringIO()
+        call_command('benchmark_indexes', rows=50, repeat=1, stdout=out)
+        with_indexes, without_indexes = out.getvalue().split('without indexes')
+        if connection.vendor == 'sqlite':
+            self.assertIn('USING INDEX api_book_created_id', with_indexes)
+            self.assertNotIn('api_book_created_id', without_indexes)
+        self.assertEqual(Book.objects.count(), 0)
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(cursor, Book._meta.db_table)
+        self.assertIn('api_book_created_id', indexes)
@@ -0,0 +1,94 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase
+
+from api.outbound import OutboundClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so the client can keep connections alive
+    protocol_version = 'HTTP/1.1'
+
+    def handle_request(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        with server.lock:
+            server.requests.append((self.command, self.path, self.client_address[1]))
+            status = server.statuses.pop(0) if len(server.statuses) > 1 else server.statuses[0]
+        body = b'{"ok": true}' if status == 200 else b'{}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_HEAD = handle_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OutboundClientTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.statuses = [200]
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/graphql'
+        self.client = OutboundClient(BACKOFF_FACTOR=0)
+        self.addCleanup(self.client.close)
+
+    def test_get_is_retried_on_gateway_errors(self):
+        self.server.statuses = [503, 502, 200]
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([method for method, _, _ in self.server.requests], ['GET'] * 3)
+
+    def test_retries_give_up_after_the_configured_count(self):
+        self.server.statuses = [503]
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_post_is_not_retried_by_default(self):
+        self.server.statuses = [503, 200]
+        response = self.client.post(self.url, json={'query': '{}'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_post_opting_in_is_retried(self):
+        self.server.statuses = [503, 200]
+        response = self.client.post(self.url, json={'query': '{}'}, idempotent=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([method for method, _, _ in self.server.requests], ['POST', 'POST'])
+
+    def test_connections_are_reused(self):
+        for _ in range(3):
+            self.client.get(self.url)
+        ports = {port for _, _, port in self.server.requests}
+        self.assertEqual(len(ports), 1)
+        timings = self.client.timings('127.0.0.1')
+        self.assertEqual(len(timings), 3)
+        # Only the first call opened a connection
+        self.assertIsNotNone(timings[0].connect)
+        self.assertEqual([timing.connect for timing in timings[1:]], [None, None])
+
+    def test_timings_are_recorded(self):
+        self.client.post(self.url, json={})
+        timing, = self.client.timings()
+        self.assertEqual((timing.method, timing.host, timing.status), ('POST', '127.0.0.1', 200))
+        self.assertGreaterEqual(timing.total, timing.ttfb)
+        self.assertEqual(self.client.timings('example.com'), [])
+
+    def test_per_host_timeouts(self):
+        client = OutboundClient(HOST_TIMEOUTS={'127.0.0.1': (1, 2)})
+        self.addCleanup(client.close)
+        self.assertEqual(client.timeout_for('127.0.0.1'), (1, 2))
+        self.assertEqual(client.timeout_for('example.com'), client.options['TIMEOUT'])
@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.models import Book, Hobby
+from api.pagination import InvalidCursor, encode_cursor, keyset_page
+
+
+class KeysetPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        books = Book.objects.bulk_create(Book(title=f'Book {i}', author='Author') for i in range(25))
+        # Ties on created_at are broken by id
+        Book.objects.filter(pk__in=[book.pk for book in books[:10]]).update(created_at=timezone.now())
+
+    def walk(self, size, **kwargs):
+        pages, cursor = [], None
+        while True:
+            page = keyset_page(Book.objects.all(), cursor, size, **kwargs)
+            pages.append([book.pk for book in page.items])
+            cursor = page.next_cursor
+            if cursor is None:
+                return pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        pages = self.walk(7)
+        self.assertEqual([len(page) for page in pages], [7, 7, 7, 4])
+        expected = list(Book.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_ascending_ordering(self):
+        pages = self.walk(10, ordering=('title', 'id'))
+        self.assertEqual(sum(pages, []), list(Book.objects.order_by('title', 'id').values_list('pk', flat=True)))
+
+    def test_new_rows_do_not_shift_later_pages(self):
+        first = keyset_page(Book.objects.all(), None, 5)
+        Book.objects.create(title='Newer', author='Author')
+        second = keyset_page(Book.objects.all(), first.next_cursor, 5)
+        expected = list(Book.objects.order_by('-created_at', '-id').values_list('pk', flat=True))[6:11]
+        self.assertEqual([book.pk for book in second.items], expected)
+
+    def test_last_page_has_no_cursor_and_costs_one_query(self):
+        with self.assertNumQueries(1):
+            page = keyset_page(Book.objects.all(), None, 25)
+        self.assertEqual(len(page.items), 25)
+        self.assertIsNone(page.next_cursor)
+
+    def test_invalid_cursors_are_rejected(self):
+        for cursor in ('not base64!', encode_cursor(['2026-01-01T00:00:00']), encode_cursor(['yesterday', 1]), 'e30'):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    keyset_page(Book.objects.all(), cursor, 5)
+
+    def test_values_querysets(self):
+        page = keyset_page(Hobby.objects.values('name', 'category', 'id'), None, 5, ordering=('category', 'name'))
+        self.assertEqual(page.items, [])
+
+
+@override_settings(LIBRARY_PAGE_SIZE=4)
+class LibraryPagesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Book.objects.bulk_create(Book(title=f'Book {i:02}', author='Author') for i in range(10))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_only_the_active_section_is_queried(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/library/?section=books')
+        self.assertEqual(response.status_code, 200)
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertIn('"api_book"', sql)
+        self.assertNotIn('"api_project"', sql)
+        self.assertNotIn('"api_photo"', sql)
+        self.assertEqual(len(response.context['items']), 4)
+
+    def test_section_pages_follow_next_to_the_end(self):
+        all_titles = list(Book.objects.values_list('title', flat=True))
+        titles, counts, url = [], [], '/library/books/'
+        while url:
+            data = self.client.get(url).json()
+            titles += [title for title in all_titles if title in data['html']]
+            counts.append(data['count'])
+            url = data['next']
+        self.assertEqual(counts, [4, 4, 2])
+        self.assertEqual(sorted(titles), sorted(all_titles))
@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api import prerender
+from api.contributions import ContributionCalendar
+from api.github import contributions_updated, store_contributions
+from api.models import Hobby, Skills
+from api.tests.utils import make_calendar
+
+
+class PrerenderTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+        override = override_settings(PRERENDER_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+        prerender._manifest_cache.clear()
+        self.addCleanup(prerender._manifest_cache.clear)
+        Skills.objects.create(name='Python', category='Programming Languages')
+        store_contributions(make_calendar())
+
+    def prerendered_etag(self, path):
+        return f'"{self.manifest()["pages"][path]["etag"]}"'
+
+    def manifest(self):
+        with open(os.path.join(self.root, prerender.MANIFEST_NAME)) as f:
+            return json.load(f)
+
+    def read(self, page):
+        with open(os.path.join(self.root, page.filename), 'rb') as f:
+            return f.read()
+
+
+class PrerenderTests(PrerenderTestCase):
+    def test_every_page_is_rendered_with_its_versions(self):
+        pages = prerender.prerender()
+        self.assertEqual(pages, list(prerender.PAGES))
+        entries = self.manifest()['pages']
+        self.assertEqual(set(entries), {page.url for page in prerender.PAGES})
+        self.assertIn('api.skills', entries['/skills/']['versions'])
+        self.assertIn(b'Python', self.read(prerender.Page('/skills/')))
+
+    def test_current_pages_are_served_from_the_files(self):
+        prerender.prerender()
+        # Only the content versions are read; the view never runs
+        with self.assertNumQueries(1):
+            response = self.client.get('/skills/')
+        self.assertEqual(response['ETag'], self.prerendered_etag('/skills/'))
+        self.assertEqual(response.content, self.read(prerender.Page('/skills/')))
+        self.assertEqual(self.client.get('/skills/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_visitors_with_a_session_get_the_live_page(self):
+        prerender.prerender()
+        self.client.cookies['sessionid'] = 'abc'
+        self.assertNotEqual(self.client.get('/skills/')['ETag'], self.prerendered_etag('/skills/'))
+
+    def test_writes_re_render_only_the_pages_built_from_the_model(self):
+        prerender.prerender()
+        index = self.read(prerender.Page('/'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Skills.objects.create(name='Rust', category='Programming Languages')
+        self.assertIn(b'Rust', self.read(prerender.Page('/skills/')))
+        self.assertEqual(self.read(prerender.Page('/')), index)
+
+    def test_stale_pages_fall_through_to_the_view(self):
+        prerender.prerender()
+        # Bump the version without the on-commit re-render
+        Skills.objects.create(name='Rust', category='Programming Languages')
+        response = self.client.get('/skills/')
+        self.assertContains(response, 'Rust')
+
+    def test_nothing_is_rendered_when_pre_rendering_is_not_in_use(self):
+        with mock.patch('api.prerender.prerender') as render:
+            prerender.prerender_changed(Skills)
+        render.assert_not_called()
+
+
+@override_settings(PRERENDER_DEPLOY_HOOK_URL='https://deploy.example.com/hook', PRERENDER_DEPLOY_DEBOUNCE=300)
+class DeployHookTests(PrerenderTestCase):
+    def setUp(self):
+        super().setUp()
+        prerender.prerender()
+        patcher = mock.patch('api.prerender.trigger_deploy', return_value=True)
+        self.trigger_deploy = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, model=Hobby, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            model.objects.create(**fields)
+
+    def test_content_writes_trigger_a_deploy_instead_of_re_rendering(self):
+        skills_page = self.read(prerender.Page('/skills/'))
+        self.write(Skills, name='Rust', category='Programming Languages')
+        self.trigger_deploy.assert_called_once_with()
+        self.assertEqual(self.read(prerender.Page('/skills/')), skills_page)
+
+    def test_new_calendars_never_trigger_a_deploy(self):
+        for count in range(3):
+            contributions_updated.send(sender=ContributionCalendar, calendar=make_calendar(count=count))
+        self.trigger_deploy.assert_not_called()
+        # The home page is served live until the next deploy
+        self.assertNotEqual(self.client.get('/')['ETag'], self.prerendered_etag('/'))
+
+    def test_writes_within_the_debounce_window_are_coalesced(self):
+        for name in ('Chess', 'Climbing', 'Cooking'):
+            self.write(name=name, reason='')
+        self.trigger_deploy.assert_called_once_with()
+        self.assertIsNotNone(cache.get(prerender.DEPLOY_PENDING_KEY))
+        # Nothing is sent while the window lasts
+        self.assertFalse(prerender.flush_pending_deploy())
+        cache.delete(prerender.DEPLOY_THROTTLE_KEY)
+        # Once it has passed, a request for a stale page sends the held-back deploy once
+        self.client.get('/')
+        self.client.get('/')
+        self.assertEqual(self.trigger_deploy.call_count, 2)
+        self.assertIsNone(cache.get(prerender.DEPLOY_PENDING_KEY))
+
+    def test_next_write_after_the_window_deploys_again(self):
+        self.write(name='Chess', reason='')
+        cache.delete(prerender.DEPLOY_THROTTLE_KEY)
+        self.write(name='Climbing', reason='')
+        self.assertEqual(self.trigger_deploy.call_count, 2)
+        self.assertIsNone(cache.get(prerender.DEPLOY_PENDING_KEY))
@@ -0,0 +1,106 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from io import StringIO
+from unittest import skipIf
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from api import renderers
+from api.models import Hobby
+
+NOW = datetime.datetime(2026, 10, 18, 6, 28, 32, 123456, tzinfo=datetime.timezone.utc)
+
+
+class DumpsTests(SimpleTestCase):
+    data = {
+        'created_at': NOW,
+        'day': NOW.date(),
+        'at': datetime.time(9, 30, 0, 5),
+        'price': Decimal('4.50'),
+        'id': uuid.UUID(int=1),
+        'name': 'Café',
+        'tags': ['a', None, True, 1.5],
+    }
+
+    def test_json_backend_keeps_full_precision(self):
+        decoded = json.loads(renderers.dumps(self.data, 'json'))
+        self.assertEqual(decoded['created_at'], '2026-10-18T06:28:32.123456+00:00')
+        self.assertEqual(decoded['day'], '2026-10-18')
+        self.assertEqual(decoded['at'], '09:30:00.000005')
+        self.assertEqual(decoded['price'], '4.50')
+        self.assertEqual(decoded['id'], str(uuid.UUID(int=1)))
+        self.assertEqual(decoded['name'], 'Café')
+
+    def test_json_backend_is_compact(self):
+        self.assertNotIn(b' ', renderers.dumps({'a': [1, 2]}, 'json'))
+
+    @skipIf(renderers.orjson is None, 'orjson is not installed')
+    def test_backends_produce_the_same_document(self):
+        self.assertEqual(
+            json.loads(renderers.dumps(self.data, 'orjson')),
+            json.loads(renderers.dumps(self.data, 'json')),
+        )
+
+    @override_settings(API_JSON_BACKEND='json')
+    def test_backend_follows_the_setting(self):
+        self.assertEqual(renderers.json_backend(), 'json')
+
+    @skipIf(renderers.msgpack is None, 'msgpack is not installed')
+    def test_msgpack_round_trip(self):
+        decoded = renderers.msgpack.unpackb(renderers.packb(self.data), timestamp=3)
+        self.assertEqual(decoded['created_at'], NOW)
+        self.assertEqual(decoded['price'], '4.50')
+        self.assertEqual(decoded['tags'], ['a', None, True, 1.5])
+
+    @skipIf(renderers.msgpack is None, 'msgpack is not installed')
+    def test_api_response_negotiates_on_accept(self):
+        factory = RequestFactory()
+        packed = renderers.api_response(factory.get('/', HTTP_ACCEPT='application/msgpack'), {'a': 1})
+        self.assertEqual(packed['Content-Type'], 'application/msgpack')
+        self.assertEqual(renderers.msgpack.unpackb(packed.content), {'a': 1})
+        plain = renderers.api_response(factory.get('/', HTTP_ACCEPT='text/html,*/*'), {'a': 1}, status=201)
+        self.assertEqual((plain['Content-Type'], plain.status_code), ('application/json', 201))
+        self.assertEqual(json.loads(plain.content), {'a': 1})
+
+
+class RendererViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Hobby.objects.create(name='Climbing', category='Outdoors', reason='Heights')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_views_render_compact_json(self):
+        response = self.client.get('/api/hobbies/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertNotIn(b', ', response.content)
+        hobby, = response.json()['hobbies']
+        self.assertEqual(hobby['name'], 'Climbing')
+        created_at = Hobby.objects.get().created_at
+        self.assertEqual(datetime.datetime.fromisoformat(hobby['created_at']), created_at)
+
+    def test_indent_keeps_drf_formatting(self):
+        response = self.client.get('/api/hobbies/', HTTP_ACCEPT='application/json; indent=2')
+        self.assertIn(b'\n  "hobbies"', response.content)
+
+    @skipIf(renderers.msgpack is None, 'msgpack is not installed')
+    def test_msgpack_is_negotiated(self):
+        response = self.client.get('/api/hobbies/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        data = renderers.msgpack.unpackb(response.content, timestamp=3)
+        self.assertEqual(data['hobbies'][0]['name'], 'Climbing')
+        self.assertEqual(data['hobbies'][0]['created_at'], Hobby.objects.get().created_at)
+        self.assertIn('Accept', response['Vary'])
+
+
+class BenchmarkRenderersCommandTests(SimpleTestCase):
+    def test_prints_every_renderer(self):
+        out = StringIO()
+        call_command('benchmark_renderers', sizes='10', repeat=1, stdout=out)
+        self.assertIn('DRF JSONRenderer (stdlib)', out.getvalue())
+        self.assertIn('dumps, json backend', out.getvalue())
@@ -0,0 +1,118 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+
+from api.models import Book, Project, SearchEntry, Skills
+from api.search import fts_available, index_objects, matching_ids, rebuild_index, search
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Skills.objects.create(name='Python', category='Programming Languages', description='Scripting and Django')
+        Skills.objects.create(name='Public speaking', category='Soft', description='Talks at meetups')
+        Book.objects.bulk_create([
+            Book(title='Fluent Python', author='Luciano Ramalho', rating=5),
+            Book(title='Dune', author='Frank Herbert', rating=4),
+        ])
+        index_objects(Book, Book.objects.all())
+
+    def setUp(self):
+        cache.clear()
+
+    def titles(self, query, **kwargs):
+        results, _ = search(query, **kwargs)
+        return [result.title for result in results]
+
+    def test_every_term_matches_as_a_prefix(self):
+        self.assertEqual(set(self.titles('pyth')), {'Python', 'Fluent Python'})
+        self.assertEqual(self.titles('fluent pyth'), ['Fluent Python'])
+        self.assertEqual(self.titles('herb'), ['Dune'])
+        self.assertEqual(self.titles(''), [])
+
+    def test_title_matches_rank_first(self):
+        Project.objects.bulk_create([Project(title='Django blog', description='A blog')])
+        index_objects(Project, Project.objects.all())
+        self.assertEqual(self.titles('django')[0], 'Django blog')
+
+    def test_collections_filter(self):
+        self.assertEqual(self.titles('python', collections=['books']), ['Fluent Python'])
+
+    def test_saves_and_deletes_keep_the_index_current(self):
+        skill = Skills.objects.get(name='Python')
+        skill.description = 'Data pipelines'
+        skill.save()
+        self.assertEqual(self.titles('pipel'), ['Python'])
+        skill.delete()
+        self.assertEqual(self.titles('pipel'), [])
+
+    def test_rebuild_index(self):
+        SearchEntry.objects.all().delete()
+        self.assertEqual(rebuild_index(), 4)
+        self.assertEqual(self.titles('dune'), ['Dune'])
+
+    def test_api_pages_through_results(self):
+        first = self.client.get('/api/search/?q=p&limit=1').json()
+        self.assertEqual(len(first['results']), 1)
+        self.assertIn('page=2', first['next'])
+        second = self.client.get(first['next']).json()
+        self.assertNotEqual(
+            (second['results'][0]['collection'], second['results'][0]['id']),
+            (first['results'][0]['collection'], first['results'][0]['id']),
+        )
+        self.assertEqual(self.client.get('/api/search/?q=x&collections=users').status_code, 400)
+        self.assertEqual(self.client.get('/api/search/?q=x&limit=0').status_code, 400)
+
+
+class MatchingIdsTests(TestCase):
+    def test_not_capped(self):
+        Skills.objects.bulk_create(Skills(name=f'Skill {i}', description='Shared words') for i in range(1100))
+        index_objects(Skills, Skills.objects.all())
+        self.assertEqual(Skills.objects.filter(pk__in=matching_ids(Skills, 'share')).count(), 1100)
+        self.assertEqual(Skills.objects.filter(pk__in=matching_ids(Skills, '')).count(), 0)
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite only')
+    def test_sqlite_uses_the_fts5_table(self):
+        if not fts_available():
+            self.skipTest('SQLite built without FTS5')
+        Skills.objects.create(name='Python')
+        self.assertIn('api_searchentry_fts MATCH', str(matching_ids(Skills, 'py').query))
+
+    # Runs only against PostgreSQL (DB_NAME and friends set); skipped on the default SQLite database
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+    def test_postgresql_uses_the_tsvector_index(self):
+        Skills.objects.create(name='Python', description='Scripting')
+        self.assertIn('to_tsquery', str(matching_ids(Skills, 'py').query))
+        self.assertEqual(list(matching_ids(Skills, 'scrip pyth').values_list('object_id', flat=True)), [
+            Skills.objects.get().pk,
+        ])
+        results, _ = search('pyth')
+        self.assertEqual([result.title for result in results], ['Python'])
+
+
+class AdminSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        Skills.objects.create(name='Python', category='Programming Languages', description='Scripting')
+        Skills.objects.create(name='Rust', category='Programming Languages', description='Systems')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def names(self, query):
+        response = self.client.get('/admin/api/skills/', {'q': query})
+        return sorted(skill.name for skill in response.context['cl'].result_list)
+
+    def test_substrings_still_match(self):
+        self.assertEqual(self.names('ython'), ['Python'])
+
+    def test_indexed_text_outside_search_fields_matches(self):
+        # search_fields is just name; the description is only in the full-text index
+        self.assertEqual(self.names('syst'), ['Rust'])
+
+    def test_empty_search_lists_everything(self):
+        self.assertEqual(self.names(''), ['Python', 'Rust'])
@@ -0,0 +1,114 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from api import github
+from api.singleflight import SingleFlight
+from api.tests.utils import StubClient, calendar_response, calendar_weeks, run_concurrently
+
+CALLERS = 50
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.release = threading.Event()
+
+    def work(self):
+        self.calls += 1
+        # Hold the leader in flight until every caller has queued up behind it
+        self.release.wait(5)
+        return {'value': 42}
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        timer = threading.Timer(0.5, self.release.set)
+        timer.start()
+        results = run_concurrently(lambda: flight.do('key', self.work), CALLERS)
+        timer.cancel()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [{'value': 42}] * CALLERS)
+
+    def test_callers_in_other_processes_wait_for_the_published_value(self):
+        # One SingleFlight per caller stands in for separate processes sharing the cache
+        def call():
+            def work():
+                result = self.work()
+                cache.set('published', result)
+                return result
+            return SingleFlight(poll_interval=0.01).do('key', work, lookup=lambda: cache.get('published'))
+
+        timer = threading.Timer(0.5, self.release.set)
+        timer.start()
+        results = run_concurrently(call, CALLERS)
+        timer.cancel()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [{'value': 42}] * CALLERS)
+
+    def test_errors_are_raised_to_every_waiting_caller(self):
+        flight = SingleFlight()
+
+        def fail():
+            self.calls += 1
+            self.release.wait(5)
+            raise ValueError('upstream failed')
+
+        def call():
+            try:
+                flight.do('key', fail)
+            except ValueError as e:
+                return e
+
+        timer = threading.Timer(0.5, self.release.set)
+        timer.start()
+        results = run_concurrently(call, count=5)
+        timer.cancel()
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_key_is_released_after_the_call(self):
+        flight = SingleFlight()
+        self.release.set()
+        flight.do('key', self.work)
+        flight.do('key', self.work)
+        self.assertEqual(self.calls, 2)
+        self.assertIsNone(cache.get('singleflight:key'))
+
+    def test_value_published_before_the_lock_is_taken_is_not_fetched_again(self):
+        # Another process publishes and releases its lock between our lookup and cache.add()
+        lookups = iter([None, {'value': 'published'}])
+        flight = SingleFlight()
+        self.release.set()
+        self.assertEqual(flight.do('key', self.work, lookup=lambda: next(lookups)), {'value': 'published'})
+        self.assertEqual(self.calls, 0)
+        self.assertIsNone(cache.get('singleflight:key'))
+
+    def test_gives_up_after_the_wait_timeout(self):
+        cache.add('singleflight:key', 'another process', 30)
+        flight = SingleFlight(wait_timeout=0.2, poll_interval=0.05)
+        self.assertIsNone(flight.do('key', self.work, lookup=lambda: None))
+        self.assertEqual(self.calls, 0)
+
+
+@override_settings(GITHUB_TOKEN='test-token', GITHUB_CONTRIBUTIONS_INCREMENTAL=False)
+class ConcurrentMissTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.gate = threading.Event()
+        self.client_stub = StubClient(calendar_response(calendar_weeks(count=3)), gate=self.gate)
+        patcher = mock.patch('api.github.get_client', return_value=self.client_stub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_misses_make_one_upstream_call(self):
+        # The GitHub response is held back until all callers have missed the cache
+        timer = threading.Timer(0.5, self.gate.set)
+        timer.start()
+        results = run_concurrently(github.get_github_contributions, CALLERS)
+        timer.cancel()
+        self.assertEqual(len(self.client_stub.calls), 1)
+        self.assertEqual(len({calendar.digest for calendar in results}), 1)
+        self.assertGreater(results[0].total, 0)
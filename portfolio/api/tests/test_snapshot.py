@@ -0,0 +1,91 @@
+import json
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+
+from api import snapshot
+from api.models import Country, Hobby, PortfolioSnapshot
+from api.tests.utils import run_concurrently
+from api.versions import read_stamps
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Hobby.objects.create(name='Chess', category='Games')
+        Country.objects.create(name='Japan', code='JP')
+
+    def test_document_has_every_collection(self):
+        data = self.client.get('/api/snapshot/').json()
+        self.assertEqual(set(data['collections']), set(snapshot.COLLECTIONS))
+        self.assertEqual([hobby['name'] for hobby in data['collections']['hobbies']], ['Chess'])
+        self.assertEqual(set(data['collections']['countries'][0]), set(snapshot.COLLECTIONS['countries'].fields))
+
+    def test_writes_do_not_build_the_document(self):
+        with mock.patch('api.snapshot.build_document') as build:
+            with self.captureOnCommitCallbacks(execute=True):
+                Hobby.objects.create(name='Go', category='Games')
+                self.client.force_login(User.objects.create_user('admin', password='secret'))
+                response = self.client.post(
+                    '/api/hobbies/batch/', json.dumps([{'name': f'Hobby {i}'} for i in range(20)]),
+                    content_type='application/json',
+                )
+        self.assertEqual(response.status_code, 200)
+        build.assert_not_called()
+
+    def test_first_read_after_a_write_builds_once(self):
+        with mock.patch('api.snapshot.build_document', wraps=snapshot.build_document) as build:
+            self.client.get('/api/snapshot/')
+            self.client.get('/api/snapshot/')
+            Hobby.objects.create(name='Go', category='Games')
+            data = self.client.get('/api/snapshot/').json()
+            self.client.get('/api/snapshot/')
+        self.assertEqual(build.call_count, 2)
+        self.assertEqual(len(data['collections']['hobbies']), 2)
+
+    def test_cold_cache_is_served_from_the_database(self):
+        self.client.get('/api/snapshot/')
+        cache.clear()
+        with mock.patch('api.snapshot.build_document') as build:
+            data = self.client.get('/api/snapshot/').json()
+        build.assert_not_called()
+        self.assertEqual(len(data['collections']['hobbies']), 1)
+        self.assertEqual(PortfolioSnapshot.objects.count(), 1)
+
+    def test_collections_and_fields_can_be_selected(self):
+        data = self.client.get('/api/snapshot/?collections=hobbies,countries&fields[countries]=name').json()
+        self.assertEqual(set(data['collections']), {'hobbies', 'countries'})
+        self.assertEqual(data['collections']['countries'], [{'name': 'Japan'}])
+
+    def test_unknown_collections_and_fields_are_rejected(self):
+        for query in ('collections=secrets', 'fields[hobbies]=password', 'fields[secrets]=id'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/snapshot/?{query}').status_code, 400)
+
+
+class ConcurrentSnapshotTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        Hobby.objects.create(name='Chess', category='Games')
+
+    def test_concurrent_reads_of_a_new_version_share_one_build(self):
+        stamps = read_stamps(snapshot.SNAPSHOT_KEYS)
+        release = threading.Event()
+        build_document = snapshot.build_document
+        calls = []
+
+        def slow_build():
+            calls.append(1)
+            release.wait(5)
+            return build_document()
+
+        timer = threading.Timer(0.5, release.set)
+        timer.start()
+        with mock.patch('api.snapshot.build_document', side_effect=slow_build):
+            documents = run_concurrently(lambda: snapshot.snapshot_document(stamps), count=20)
+        timer.cancel()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(documents)), 1)
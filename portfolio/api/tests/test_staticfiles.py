@@ -0,0 +1,59 @@
+import json
+import tempfile
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api.github import store_contributions
+from api.staticfiles import CDN_MAX_AGE, ManifestStaticFilesStorage, add_cdn_cache_headers
+from api.tests.utils import make_calendar
+
+
+@override_settings(DEBUG=False)
+class ManifestStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+
+    def storage(self, manifest=None):
+        if manifest is not None:
+            with open(f'{self.root.name}/staticfiles.json', 'w') as f:
+                json.dump({'version': '1.1', 'paths': manifest}, f)
+        return ManifestStaticFilesStorage(location=self.root.name, base_url='/static/')
+
+    def test_collected_files_get_their_hashed_names(self):
+        storage = self.storage({'portfolio/css/style.css': 'portfolio/css/style.3f2a1c.css'})
+        self.assertEqual(storage.url('portfolio/css/style.css'), '/static/portfolio/css/style.3f2a1c.css')
+
+    def test_uncollected_files_keep_their_plain_names(self):
+        storage = self.storage({'portfolio/css/style.css': 'portfolio/css/style.3f2a1c.css'})
+        self.assertEqual(storage.url('portfolio/js/new.js'), '/static/portfolio/js/new.js')
+
+    def test_without_a_manifest_every_file_keeps_its_plain_name(self):
+        self.assertEqual(self.storage().url('portfolio/css/style.css'), '/static/portfolio/css/style.css')
+
+
+@override_settings(DEBUG=False)
+class UncollectedPagesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        store_contributions(make_calendar())
+
+    def test_pages_render_without_collectstatic(self):
+        for path in ('/', '/skills/', '/library/'):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, '/static/portfolio/')
+
+
+class CdnCacheHeaderTests(SimpleTestCase):
+    def test_immutable_files_can_be_kept_by_the_cdn(self):
+        headers = {'Cache-Control': 'max-age=315360000, public, immutable'}
+        add_cdn_cache_headers(headers, '/static/style.3f2a1c.css', '/static/style.3f2a1c.css')
+        self.assertEqual(headers['Cache-Control'], f'max-age=315360000, public, immutable, s-maxage={CDN_MAX_AGE}')
+
+    def test_other_files_are_left_alone(self):
+        headers = {'Cache-Control': 'max-age=60, public'}
+        add_cdn_cache_headers(headers, '/static/style.css', '/static/style.css')
+        self.assertEqual(headers['Cache-Control'], 'max-age=60, public')
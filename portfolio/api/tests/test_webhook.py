@@ -0,0 +1,84 @@
+import hashlib
+import hmac
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api import github
+from api.tests.utils import StubClient, calendar_response, calendar_weeks
+
+SECRET = 'webhook-secret'
+
+
+def signed(body, secret=SECRET):
+    return 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+@override_settings(
+    GITHUB_TOKEN='test-token', GITHUB_WEBHOOK_SECRET=SECRET, GITHUB_USERNAME='octocat',
+    GITHUB_CONTRIBUTIONS_INCREMENTAL=False,
+)
+class GitHubWebhookTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('github_webhook')
+        self.weeks = calendar_weeks(count=2)
+        self.client_stub = StubClient(calendar_response(self.weeks))
+        patcher = mock.patch('api.github.get_client', return_value=self.client_stub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def deliver(self, event, payload, signature=None):
+        body = json.dumps(payload).encode()
+        return self.client.post(
+            self.url, body, content_type='application/json',
+            HTTP_X_GITHUB_EVENT=event,
+            HTTP_X_HUB_SIGNATURE_256=signed(body) if signature is None else signature,
+        )
+
+    def test_signed_push_refreshes_the_calendar(self):
+        response = self.deliver('push', {'sender': {'login': 'OctoCat'}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['message'], 'Contributions refreshed')
+        self.assertEqual(len(self.client_stub.calls), 1)
+        self.assertIsNotNone(cache.get(github.CACHE_KEY))
+        # The refresh finished, so the calendar is no longer dirty
+        self.assertIsNone(cache.get(github.DIRTY_KEY))
+
+    def test_refresh_already_running_leaves_the_calendar_dirty(self):
+        cache.add(github.REFRESH_LOCK_KEY, True, github.REFRESH_LOCK_TIMEOUT)
+        response = self.deliver('push', {'sender': {'login': 'octocat'}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client_stub.calls, [])
+        self.assertIsNotNone(cache.get(github.DIRTY_KEY))
+
+    def test_bad_signature_is_rejected(self):
+        for signature in ('', 'sha256=0000', signed(b'another body'), signed(b'{}', secret='wrong')):
+            with self.subTest(signature=signature):
+                response = self.deliver('push', {}, signature=signature)
+                self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.client_stub.calls, [])
+
+    @override_settings(GITHUB_WEBHOOK_SECRET='')
+    def test_unconfigured_secret_is_unavailable(self):
+        self.assertEqual(self.deliver('push', {}).status_code, 503)
+
+    def test_ping_answers_pong(self):
+        response = self.deliver('ping', {'zen': 'Keep it logically awesome.'})
+        self.assertEqual(response.json()['message'], 'pong')
+        self.assertEqual(self.client_stub.calls, [])
+
+    def test_other_senders_and_events_are_ignored(self):
+        for event, payload in (('push', {'sender': {'login': 'someone-else'}}), ('star', {})):
+            with self.subTest(event=event):
+                response = self.deliver(event, payload)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['message'], f'Ignored {event} event')
+        self.assertEqual(self.client_stub.calls, [])
+        self.assertIsNone(cache.get(github.DIRTY_KEY))
+
+    def test_only_post_is_allowed(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
@@ -0,0 +1,125 @@
+"""
+Shared test fixtures: contribution calendars in GitHub's GraphQL shape, canned HTTP
+responses, and a stand-in for the outbound client that records the calls made to it.
+"""
+import json
+import threading
+from datetime import date, timedelta
+
+import requests
+from django.db import connection
+
+from api.contributions import ContributionCalendar
+
+
+def calendar_weeks(end=None, days=364, count=1):
+    """GraphQL `weeks` covering `days` days up to `end`, starting on a Sunday like GitHub's"""
+    end = end or date.today()
+    day = end - timedelta(days=days - 1)
+    day -= timedelta(days=(day.weekday() + 1) % 7)
+    weeks, week = [], []
+    while day <= end:
+        if week and day.weekday() == 6:
+            weeks.append({'contributionDays': week})
+            week = []
+        week.append({
+            'date': day.isoformat(),
+            'contributionCount': count,
+            'contributionLevel': 'FIRST_QUARTILE' if count else 'NONE',
+        })
+        day += timedelta(days=1)
+    weeks.append({'contributionDays': week})
+    return weeks
+
+
+def weeks_total(weeks):
+    return sum(day['contributionCount'] for week in weeks for day in week['contributionDays'])
+
+
+def make_calendar(end=None, days=364, count=1):
+    weeks = calendar_weeks(end, days, count)
+    return ContributionCalendar.from_weeks(weeks, weeks_total(weeks))
+
+
+def json_response(payload, status=200, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(payload).encode()
+    response.encoding = 'utf-8'
+    response.headers.update(headers or {})
+    return response
+
+
+def calendar_response(weeks):
+    """A successful response to the full-calendar GraphQL query"""
+    return json_response({'data': {'user': {'contributionsCollection': {
+        'contributionCalendar': {'totalContributions': weeks_total(weeks), 'weeks': weeks},
+    }}}})
+
+
+def recent_response(days, total, started_at):
+    """A successful response to the incremental GraphQL query: (date, count) days since the window start"""
+    return json_response({'data': {'user': {
+        'recent': {'contributionCalendar': {'weeks': [{'contributionDays': [
+            {'date': day.isoformat(), 'contributionCount': count} for day, count in days
+        ]}]}},
+        'year': {'startedAt': f'{started_at.isoformat()}T00:00:00Z', 'contributionCalendar': {'totalContributions': total}},
+    }}})
+
+
+class StubClient:
+    """
+    Stands in for api.outbound's client. Each call takes the next queued response (the
+    last one repeats); queued exceptions are raised. Thread-safe, and calls are recorded.
+    """
+
+    def __init__(self, *responses, gate=None):
+        self.responses = list(responses)
+        # A threading.Event every call waits on, to hold calls in flight
+        self.gate = gate
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            self.calls.append((method, url, kwargs))
+            response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if self.gate is not None:
+            self.gate.wait(5)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def timings(self, host=None):
+        return []
+
+
+def run_concurrently(target, count=50):
+    """Call target() from `count` threads released at the same moment; returns their results"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = []
+
+    def run(index):
+        barrier.wait()
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    if errors:
+        raise errors[0]
+    return results
@@ -7,11 +7,21 @@ urlpatterns = [
     path('projects/create/', views.create_project, name='create_project'),
     path('skills/', views.skills_list, name='skills_list'),
     path('skills/create/', views.create_skill, name='create_skill'),
+    path('skills/batch/', views.create_skills_batch, name='create_skills_batch'),
     path('books/', views.books_list, name='books_list'),
     path('books/create/', views.create_book, name='create_book'),
     path('photos/create/', views.create_photo, name='create_photo'),
     path('hobbies/', views.hobbies_json, name='hobbies_json'),
     path('hobbies/create/', views.create_hobby, name='create_hobby'),
+    path('hobbies/batch/', views.create_hobbies_batch, name='create_hobbies_batch'),
+    path('snapshot/', views.snapshot, name='snapshot'),
+    path('changes/', views.changes, name='changes'),
+    path('search/', views.search, name='search'),
+    path('export/<str:collection>/', views.export, name='export'),
     path('countries/create/', views.create_country, name='create_country'),
+    path('countries/batch/', views.create_countries_batch, name='create_countries_batch'),
+    path('github/contributions/', views.github_contributions_json, name='github_contributions'),
+    path('github/status/', views.github_status, name='github_status'),
+    path('github/webhook/', views.github_webhook, name='github_webhook'),
     path('secret-login/', views.secret_login, name='secret_login'),
 ]
@@ -0,0 +1,123 @@
+"""
+Content versions and conditional GET
+Each kind of content has a change stamp in the ContentVersion table: a counter and the
+time of the last change, bumped by the model signals on every save and delete (see
+api.signals). Views declare the content they are built from, and conditional() derives
+an ETag and Last-Modified from those stamps, so a client that already has the current
+version gets a 304 before any queryset runs or any template renders.
+"""
+import hashlib
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition
+
+from .models import ContentVersion
+
+logger = logging.getLogger(__name__)
+
+# Stamp for the GitHub contribution calendar shown on the home page
+GITHUB_CONTRIBUTIONS = 'github.contributions'
+
+
+def version_key(source):
+    """Stamp key for a model class (its label, e.g. 'api.project') or a plain string key"""
+    return source if isinstance(source, str) else source._meta.label_lower
+
+
+def bump_version(source):
+    """Record a change to the given model or content key"""
+    key = version_key(source)
+    now = timezone.now()
+    stamps = ContentVersion.objects.filter(key=key)
+    try:
+        # Savepoint, so a failure here never breaks the write that triggered it
+        with transaction.atomic():
+            if stamps.update(version=F('version') + 1, updated_at=now):
+                return
+            _, created = ContentVersion.objects.get_or_create(
+                key=key, defaults={'version': 1, 'updated_at': now}
+            )
+            if not created:
+                # Another request created the row first; bump it on top of theirs
+                stamps.update(version=F('version') + 1, updated_at=now)
+    except DatabaseError as e:
+        logger.error(f"Error bumping content version for {key}: {e}")
+
+
+def read_stamps(keys):
+    """
+    {key: (version, updated_at)} for the given keys. Keys that never changed are missing.
+    Returns None if the database is unavailable.
+    """
+    try:
+        return {
+            key: (version, updated_at)
+            for key, version, updated_at in ContentVersion.objects.filter(key__in=keys)
+            .values_list('key', 'version', 'updated_at')
+        }
+    except DatabaseError as e:
+        logger.error(f"Error reading content versions: {e}")
+        return None
+
+
+def content_stamps(request, keys):
+    """read_stamps() for the given keys, read once per request"""
+    memo = request.__dict__.setdefault('_content_stamps', {})
+    if keys not in memo:
+        memo[keys] = read_stamps(keys)
+    return memo[keys]
+
+
+def conditional(*sources, vary_on_headers=()):
+    """
+    Serve ETag and Last-Modified derived from the stamps of `sources` (models or content
+    keys), answering matching conditional GETs with 304 without calling the view.
+    vary_on_headers lists request headers that select a different body at the same URL
+    (e.g. X-Requested-With for AJAX fragments); they are part of the ETag and the Vary header.
+    Error responses are sent without validators.
+    """
+    def decorator(view_func):
+        keys = tuple(sorted(version_key(source) for source in sources))
+
+        def etag(request, *args, **kwargs):
+            stamps = content_stamps(request, keys)
+            if stamps is None:
+                return None
+            # Logged-in users see admin controls, so they get their own validators
+            parts = [getattr(settings, 'RELEASE_VERSION', ''), str(request.user.pk or '')]
+            parts += [request.headers.get(header, '') for header in vary_on_headers]
+            parts += [f'{key}:{stamps.get(key, (0, None))[0]}' for key in keys]
+            return hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+        def last_modified(request, *args, **kwargs):
+            # Logging in changes the page without changing any stamp; the ETag covers that case
+            if request.user.is_authenticated:
+                return None
+            stamps = content_stamps(request, keys)
+            if not stamps:
+                return None
+            return max(updated_at for _, updated_at in stamps.values())
+
+        inner = condition(etag_func=etag, last_modified_func=last_modified)(view_func)
+
+        @wraps(view_func)
+        def conditional_view(request, *args, **kwargs):
+            response = inner(request, *args, **kwargs)
+            # condition() stamps every response, but an error page is not the content
+            # the validators describe and must not be revalidated as if it were
+            if response.status_code not in (200, 304):
+                del response['ETag']
+                del response['Last-Modified']
+            if vary_on_headers:
+                patch_vary_headers(response, vary_on_headers)
+            return response
+        # The content keys the view is built from, for pre-rendering (see api.prerender)
+        conditional_view.content_keys = keys
+        return conditional_view
+    return decorator
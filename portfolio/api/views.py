@@ -4,135 +4,35 @@ from django.conf import settings
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse, HttpResponse
+from django.views.decorators.http import require_GET
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.contrib.staticfiles import finders
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 from .models import Project, Skills, Book, Country, Hobby, Photo
-import requests
+from .caching import cache_page_for_anonymous
+from .pagination import InvalidCursor, keyset_page
+from .versions import GITHUB_CONTRIBUTIONS, conditional, content_stamps, version_key
+from .cdn import edge_cache
+from .changes import CursorExpired, changes_since
+from .batch import COUNTRIES, HOBBIES, SKILLS, BatchError, batch_create
+from .collections import COLLECTIONS
+from .export import FORMATS as EXPORT_FORMATS, NDJSON_CONTENT_TYPE, json_array_stream, ndjson_stream
+from .renderers import accepts_msgpack, api_response, loads
+from .search import SEARCH_SOURCES, search as search_entries
+from .snapshot import SNAPSHOT_KEYS, SNAPSHOT_MODELS, snapshot_document
+from .github import (
+    get_github_contributions, empty_contributions, contributions_status, contribution_graph_html,
+    verify_webhook_signature, handle_webhook_event
+)
 import json
 import os
+from urllib.parse import urlencode
 
-
-def get_github_contributions():
-    """Fetch GitHub contributions using GraphQL API"""
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # Check cache first
-    cached_data = cache.get('github_contributions')
-    if cached_data:
-        logger.debug("Returning cached GitHub contributions")
-        return cached_data
-    
-    # Get GitHub token from settings
-    token = getattr(settings, 'GITHUB_TOKEN', None)
-    username = getattr(settings, 'GITHUB_USERNAME', 'ElSancturioDeThomas')
-    
-    if not token:
-        logger.warning("GitHub token not configured - contributions will not be displayed")
-        return {'weeks': [], 'total_contributions': 0}
-    
-    # GraphQL query
-    query = """
-    query {
-      user(login: "%s") {
-        contributionsCollection {
-          contributionCalendar {
-            totalContributions
-            weeks {
-              contributionDays {
-                contributionLevel
-                contributionCount
-                date
-              }
-            }
-          }
-        }
-      }
-    }
-    """ % username
-    
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    try:
-        response = requests.post(
-            "https://api.github.com/graphql",
-            json={'query': query},
-            headers=headers,
-            timeout=10
-        )
-        
-        # Handle different HTTP status codes
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Check for GraphQL errors (even with 200 status)
-            if 'errors' in data:
-                error_messages = [err.get('message', 'Unknown error') for err in data['errors']]
-                logger.error(f"GitHub GraphQL API errors: {', '.join(error_messages)}")
-                # Don't cache errors - return empty but don't cache
-                return {'weeks': [], 'total_contributions': 0}
-            
-            # Check if data structure is valid
-            if 'data' in data and data['data'] and 'user' in data['data']:
-                user_data = data['data']['user']
-                
-                # Check if user exists (might be None if user not found)
-                if user_data is None:
-                    logger.error(f"GitHub user '{username}' not found")
-                    return {'weeks': [], 'total_contributions': 0}
-                
-                contributions_collection = user_data.get('contributionsCollection')
-                if not contributions_collection:
-                    logger.error(f"No contributions collection found for user '{username}'")
-                    return {'weeks': [], 'total_contributions': 0}
-                
-                calendar_data = contributions_collection.get('contributionCalendar', {})
-                weeks = calendar_data.get('weeks', [])
-                total_contributions = calendar_data.get('totalContributions', 0)
-                
-                if not weeks:
-                    logger.warning(f"No contribution weeks found for user '{username}'")
-                    return {'weeks': [], 'total_contributions': 0}
-                
-                result = {
-                    'weeks': weeks,
-                    'total_contributions': total_contributions
-                }
-                
-                # Cache for 1 hour only if we got valid data
-                cache.set('github_contributions', result, 3600)
-                logger.info(f"Successfully fetched GitHub contributions: {total_contributions} total")
-                return result
-            else:
-                logger.error(f"Invalid response structure from GitHub API: {data}")
-                return {'weeks': [], 'total_contributions': 0}
-                
-        elif response.status_code == 401:
-            logger.error("GitHub API authentication failed - token may be invalid or expired")
-            return {'weeks': [], 'total_contributions': 0}
-        elif response.status_code == 403:
-            logger.error("GitHub API access forbidden - token may lack required permissions")
-            return {'weeks': [], 'total_contributions': 0}
-        elif response.status_code == 429:
-            logger.warning("GitHub API rate limit exceeded - will retry after cache expires")
-            # Return empty but don't cache, so it retries sooner
-            return {'weeks': [], 'total_contributions': 0}
-        else:
-            logger.error(f"GitHub API returned status {response.status_code}: {response.text[:200]}")
-            return {'weeks': [], 'total_contributions': 0}
-            
-    except requests.exceptions.Timeout:
-        logger.error("GitHub API request timed out")
-        return {'weeks': [], 'total_contributions': 0}
-    except requests.exceptions.RequestException as e:
-        logger.error(f"GitHub API request failed: {e}")
-        return {'weeks': [], 'total_contributions': 0}
-    except Exception as e:
-        logger.exception(f"Unexpected error fetching GitHub contributions: {e}")
-        return {'weeks': [], 'total_contributions': 0}
+# Totals are keyed on the collection's version, so this only bounds how long unused ones linger
+LIST_COUNT_CACHE_TIMEOUT = 60 * 60 * 24
 
 
 def favicon_view(request):
@@ -144,9 +44,11 @@ def favicon_view(request):
     return HttpResponse(status=404)
 
 
+@edge_cache()
+@conditional(Country, Hobby, GITHUB_CONTRIBUTIONS)
+@cache_page_for_anonymous()
 def index(request):
     """Home page view with brief description"""
-    import time
     import logging
     from django.db import DatabaseError
     
@@ -167,26 +69,27 @@ def index(request):
         logger.error(f"Error fetching hobbies: {e}")
         hobbies = []
     
-    # Get GitHub contributions (already has error handling)
+    # Get GitHub contributions calendar (already has error handling)
     try:
         github_data = get_github_contributions()
     except Exception as e:
         logger.error(f"Error fetching GitHub contributions: {e}")
-        github_data = {'weeks': [], 'total_contributions': 0}
+        github_data = empty_contributions()
     
     context = {
-        'timestamp': int(time.time()),
         'countries_visited': countries_visited,
         'hobbies': hobbies,
-        'github_weeks': github_data.get('weeks', []),
-        'github_total': github_data.get('total_contributions', 0)
+        'github_calendar': github_data,
+        'github_graph_html': contribution_graph_html(github_data),
     }
     return render(request, 'portfolio/index.html', context)
 
 
+@edge_cache()
+@conditional(Skills)
+@cache_page_for_anonymous()
 def skills_view(request):
     """Skills page view"""
-    import time
     import logging
     from itertools import groupby
     from django.db import DatabaseError
@@ -228,17 +131,35 @@ def skills_view(request):
             ordered_categories.append((cat, skill_list))
     
     context = {
-        'timestamp': int(time.time()),
         'skills_by_category': ordered_categories,
     }
     return render(request, 'portfolio/skills.html', context)
 
 
+# Library sections and the model each one lists
+LIBRARY_SECTIONS = {
+    'projects': Project,
+    'books': Book,
+    'photos': Photo,
+}
+
+
+def _library_page(section, cursor=None):
+    """One keyset page of a library section: (items, URL of the next page or None)"""
+    size = getattr(settings, 'LIBRARY_PAGE_SIZE', 12)
+    page = keyset_page(LIBRARY_SECTIONS[section].objects.all(), cursor, size)
+    next_url = None
+    if page.next_cursor:
+        next_url = f"{reverse('library_section', args=[section])}?{urlencode({'after': page.next_cursor})}"
+    return page.items, next_url
+
+
+@edge_cache()
+@conditional(Project, Book, Photo)
+@cache_page_for_anonymous(query_params=('section',))
 def library_view(request):
-    """Library page view - combines Projects, Books, Photos, and Posts"""
-    import time
+    """Library page view - Projects, Books and Photos, with the active section's first page rendered"""
     import logging
-    from django.template.loader import render_to_string
     from django.db import DatabaseError
     
     logger = logging.getLogger(__name__)
@@ -247,51 +168,44 @@ def library_view(request):
     section = request.GET.get('section', 'projects')
     
     # Validate section
-    valid_sections = ['projects', 'books', 'photos']
-    if section not in valid_sections:
+    if section not in LIBRARY_SECTIONS:
         section = 'projects'
     
-    # Fetch data from Django with error handling
-    try:
-        projects = Project.objects.all().order_by('-created_at')
-    except (DatabaseError, Exception) as e:
-        logger.error(f"Error fetching projects: {e}")
-        projects = []
-    
-    try:
-        books = Book.objects.all().order_by('-created_at')
-    except (DatabaseError, Exception) as e:
-        logger.error(f"Error fetching books: {e}")
-        books = []
-    
+    # Only the active section is queried; the others load their pages when opened
     try:
-        photos = Photo.objects.all().order_by('-created_at')
+        items, next_url = _library_page(section)
     except (DatabaseError, Exception) as e:
-        logger.error(f"Error fetching photos: {e}")
-        photos = []
+        logger.error(f"Error fetching {section}: {e}")
+        items, next_url = [], None
     
     context = {
-        'timestamp': int(time.time()),
-        'projects': projects,
-        'books': books,
-        'photos': photos,
         'active_section': section,  # Pass active section to template
+        'items': items,
+        'next_url': next_url,
     }
+    return render(request, 'portfolio/library.html', context)
+
+
+@edge_cache()
+@conditional(Project, Book, Photo)
+@cache_page_for_anonymous(query_params=('after',))
+def library_section(request, section):
+    """One page of a library section as an HTML fragment, for infinite scroll"""
+    from django.template.loader import render_to_string
     
-    # If AJAX request, return just the section HTML
-    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        # Render just the section content
-        section_html = render_to_string('portfolio/library_section.html', {
-            'section': section,
-            'projects': projects,
-            'books': books,
-            'photos': photos,
-            'user': request.user,
-        })
-        return JsonResponse({'html': section_html})
+    if section not in LIBRARY_SECTIONS:
+        return JsonResponse({'success': False, 'error': 'Unknown section'}, status=404)
     
-    # Normal request - return full page
-    return render(request, 'portfolio/library.html', context)
+    try:
+        items, next_url = _library_page(section, request.GET.get('after'))
+    except InvalidCursor:
+        return JsonResponse({'success': False, 'error': 'Invalid cursor'}, status=400)
+    
+    html = render_to_string('portfolio/components/library_items.html', {
+        'section': section,
+        'items': items,
+    })
+    return JsonResponse({'html': html, 'next': next_url, 'count': len(items)})
 
 
 @api_view(['GET'])
@@ -303,58 +217,315 @@ def hello_world(request):
     }, status=status.HTTP_200_OK)
 
 
+def _keyset_list(request, queryset, fields, ordering, results_key='results'):
+    """
+    One keyset page of `queryset` as a list API response.
+    Query parameters: `fields` (comma-separated subset of `fields`), `limit`
+    (defaults to REST_FRAMEWORK's PAGE_SIZE), `after` (the cursor from `next`) and
+    `count=1`, which adds the total number of rows as `count`. Only the requested columns
+    are selected; follow `next` until it is null for all of the rows.
+    """
+    from rest_framework.settings import api_settings
+    
+    requested = [name.strip() for name in request.GET.get('fields', '').split(',') if name.strip()]
+    unknown = [name for name in requested if name not in fields]
+    if unknown:
+        return Response({'success': False, 'error': f"Unknown fields: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+    names = requested or list(fields)
+    
+    try:
+        limit = int(request.GET.get('limit', api_settings.PAGE_SIZE or 10))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return Response({'success': False, 'error': 'limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = min(limit, getattr(settings, 'API_MAX_PAGE_SIZE', 100))
+    
+    # The ordering columns are always selected, since the next cursor is built from them
+    columns = names + [name.lstrip('-') for name in ordering if name.lstrip('-') not in names]
+    try:
+        page = keyset_page(queryset.values(*columns), request.GET.get('after'), limit, ordering)
+    except InvalidCursor:
+        return Response({'success': False, 'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Datetimes are left to the renderer (see api.renderers)
+    results = [{name: row[name] for name in names} for row in page.items]
+    next_url = None
+    if page.next_cursor:
+        params = request.GET.copy()
+        params['after'] = page.next_cursor
+        next_url = f"{request.path}?{params.urlencode()}"
+    data = {results_key: results, 'next': next_url}
+    if request.GET.get('count') in ('1', 'true'):
+        data['count'] = _list_count(request, queryset)
+    return Response(data)
+
+
+def _list_count(request, queryset):
+    """
+    The total for `count=1`, counted once per version of the collection rather than
+    on every page (a write bumps the version, so a stale total is never served)
+    """
+    key = version_key(queryset.model)
+    stamps = content_stamps(request, (key,))
+    if stamps is None:
+        return queryset.count()
+    version = stamps.get(key, (0, None))[0]
+    return cache.get_or_set(f'list-count:{key}:{version}', queryset.count, LIST_COUNT_CACHE_TIMEOUT)
+
+
+@edge_cache()
+@conditional(Project, vary_on_headers=('Accept',))
 @api_view(['GET'])
 def projects_list(request):
-    """Get list of all projects"""
-    projects = Project.objects.all()
-    data = [{
-        'id': p.id,
-        'title': p.title,
-        'description': p.description,
-    } for p in projects]
-    return Response({'count': len(data), 'results': data})
+    """Get a page of projects, newest first"""
+    return _keyset_list(
+        request, Project.objects.all(),
+        fields=('id', 'title', 'description'),
+        ordering=('-created_at', '-id'),
+    )
 
 
+@edge_cache()
+@conditional(Skills, vary_on_headers=('Accept',))
 @api_view(['GET'])
 def skills_list(request):
-    """Get list of all skills"""
-    skills = Skills.objects.all()
-    data = [{
-        'id': s.id,
-        'name': s.name,
-        'category': s.category,
-        'description': s.description
-    } for s in skills]
-    return Response({'count': len(data), 'results': data})
+    """Get a page of skills by category and name"""
+    # name is unique, so (category, name) is a total order
+    return _keyset_list(
+        request, Skills.objects.all(),
+        fields=('id', 'name', 'category', 'description'),
+        ordering=('category', 'name'),
+    )
 
 
+@edge_cache()
+@conditional(Book, vary_on_headers=('Accept',))
 @api_view(['GET'])
 def books_list(request):
-    """Get list of all books"""
-    books = Book.objects.all()
-    data = [{
-        'id': b.id,
-        'title': b.title,
-        'author': b.author,
-        'rating': b.rating
-    } for b in books]
-    return Response({'count': len(data), 'results': data})
+    """Get a page of books, newest first"""
+    return _keyset_list(
+        request, Book.objects.all(),
+        fields=('id', 'title', 'author', 'rating'),
+        ordering=('-created_at', '-id'),
+    )
 
 
+@edge_cache()
+@conditional(Hobby, vary_on_headers=('Accept',))
 @api_view(['GET'])
 def hobbies_json(request):
-    """Get hobbies as JSON"""
-    hobbies = Hobby.objects.all().order_by('category', 'name')
+    """Get a page of hobbies as JSON, by category and name"""
+    return _keyset_list(
+        request, Hobby.objects.all(),
+        fields=('id', 'name', 'reason', 'category', 'social', 'icon', 'created_at'),
+        ordering=('category', 'name'),
+        results_key='hobbies',
+    )
+
+
+@edge_cache()
+@conditional(*SNAPSHOT_MODELS, vary_on_headers=('Accept',))
+@require_GET
+def snapshot(request):
+    """
+    Every public collection in one JSON document, served from the precomputed snapshot.
+    Query parameters: `collections` (comma-separated subset) and `fields[<collection>]`
+    (comma-separated subset of that collection's fields).
+    """
+    selected = {}
+    for param, value in request.GET.items():
+        if param.startswith('fields[') and param.endswith(']'):
+            selected[param[len('fields['):-1]] = [name.strip() for name in value.split(',') if name.strip()]
+    included = [name.strip() for name in request.GET.get('collections', '').split(',') if name.strip()]
+    
+    unknown = [name for name in included + list(selected) if name not in COLLECTIONS]
+    if unknown:
+        return JsonResponse({'success': False, 'error': f"Unknown collections: {', '.join(unknown)}"}, status=400)
+    for name, fields in selected.items():
+        unknown = [field for field in fields if field not in COLLECTIONS[name].fields]
+        if unknown:
+            return JsonResponse({'success': False, 'error': f"Unknown fields for {name}: {', '.join(unknown)}"}, status=400)
+    
+    # The stamps were already read for the ETag; the document is looked up by the same versions
+    document = snapshot_document(content_stamps(request, SNAPSHOT_KEYS))
+    if not selected and not included and not accepts_msgpack(request):
+        return HttpResponse(document, content_type='application/json')
+    
+    # From the stored JSON text, so datetimes stay ISO 8601 strings in MessagePack too
+    data = loads(document)
+    data['collections'] = {
+        name: [{field: item[field] for field in selected[name]} for item in items] if selected.get(name) else items
+        for name, items in data['collections'].items()
+        if not included or name in included
+    }
+    return api_response(request, data)
+
+
+@require_GET
+def changes(request):
+    """
+    Items inserted, updated or deleted since a cursor, oldest first.
+    Query parameters: `since` (the `cursor` of the previous response; omit for a full
+    sync) and `limit`. Poll again with `cursor`, straight away while `has_more` is set.
+    """
+    from rest_framework.settings import api_settings
+    
+    try:
+        limit = int(request.GET.get('limit', api_settings.PAGE_SIZE or 10))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return JsonResponse({'success': False, 'error': 'limit must be a positive integer'}, status=400)
+    limit = min(limit, getattr(settings, 'API_MAX_PAGE_SIZE', 100))
+    
+    try:
+        page = changes_since(request.GET.get('since'), limit)
+    except CursorExpired:
+        return JsonResponse({
+            'success': False,
+            'error': 'Cursor expired, resync from /api/snapshot/',
+        }, status=410)
+    except InvalidCursor:
+        return JsonResponse({'success': False, 'error': 'Invalid cursor'}, status=400)
+    
+    return api_response(request, {
+        'changes': [change.as_json() for change in page.changes],
+        'cursor': page.cursor,
+        'has_more': page.has_more,
+    })
+
+
+@edge_cache()
+@conditional(Project, Book, Photo, Skills, Hobby, vary_on_headers=('Accept',))
+@require_GET
+def search(request):
+    """
+    Ranked full-text search over projects, books, photos, skills and hobbies (see api.search).
+    Query parameters: `q` (every word is matched as a prefix), `collections`
+    (comma-separated subset), `limit` and `page`.
+    """
+    from rest_framework.settings import api_settings
+    
+    query = request.GET.get('q', '').strip()
+    collections = [name.strip() for name in request.GET.get('collections', '').split(',') if name.strip()]
+    unknown = [name for name in collections if name not in SEARCH_SOURCES]
+    if unknown:
+        return JsonResponse({'success': False, 'error': f"Unknown collections: {', '.join(unknown)}"}, status=400)
+    
+    try:
+        limit = int(request.GET.get('limit', api_settings.PAGE_SIZE or 10))
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        limit = page = 0
+    if limit < 1 or page < 1:
+        return JsonResponse({'success': False, 'error': 'limit and page must be positive integers'}, status=400)
+    limit = min(limit, getattr(settings, 'API_MAX_PAGE_SIZE', 100))
+    
+    results, has_more = search_entries(query, collections, limit, (page - 1) * limit)
+    next_url = None
+    if has_more:
+        params = request.GET.copy()
+        params['page'] = page + 1
+        next_url = f"{request.path}?{params.urlencode()}"
+    return api_response(request, {
+        'results': [result.as_json() for result in results],
+        'count': len(results),
+        'next': next_url,
+    })
+
+
+def _export_view(name):
+    """Streaming export view for one collection, with its own validators and cache tags"""
+    collection = COLLECTIONS[name]
+    
+    @edge_cache()
+    @conditional(collection.model, vary_on_headers=('Accept',))
+    @require_GET
+    def export_collection(request):
+        fields = [field.strip() for field in request.GET.get('fields', '').split(',') if field.strip()]
+        unknown = [field for field in fields if field not in collection.fields]
+        if unknown:
+            return JsonResponse({'success': False, 'error': f"Unknown fields: {', '.join(unknown)}"}, status=400)
+        
+        export_format = request.GET.get('format')
+        if export_format is None:
+            preferred = request.get_preferred_type([NDJSON_CONTENT_TYPE, 'application/json'])
+            export_format = 'json' if preferred == 'application/json' else 'ndjson'
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({'success': False, 'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}, status=400)
+        
+        if export_format == 'ndjson':
+            response = StreamingHttpResponse(ndjson_stream(collection, fields), content_type=NDJSON_CONTENT_TYPE)
+        else:
+            response = StreamingHttpResponse(json_array_stream(collection, fields), content_type='application/json')
+        response['Content-Disposition'] = f'inline; filename="{name}.{export_format}"'
+        return response
+    return export_collection
+
+
+EXPORT_VIEWS = {name: _export_view(name) for name in COLLECTIONS}
+
+
+def export(request, collection):
+    """
+    Stream a whole collection as NDJSON (default) or as one JSON array.
+    Query parameters: `format` (ndjson or json; otherwise chosen by Accept) and `fields`.
+    """
+    view = EXPORT_VIEWS.get(collection)
+    if view is None:
+        return JsonResponse({'success': False, 'error': 'Unknown collection'}, status=404)
+    return view(request)
+
+
+@edge_cache(tags=(GITHUB_CONTRIBUTIONS,))
+@api_view(['GET'])
+def github_contributions_json(request):
+    """Get the GitHub contribution calendar as JSON"""
+    calendar = get_github_contributions()
     data = [{
-        'id': h.id,
-        'name': h.name,
-        'reason': h.reason,
-        'category': h.category,
-        'social': h.social,
-        'icon': h.icon,
-        'created_at': h.created_at.isoformat() if h.created_at else None
-    } for h in hobbies]
-    return Response({'hobbies': data, 'count': len(data)})
+        'date': day.date,
+        'level': day.level,
+        'count': day.count
+    } for day in calendar.days()]
+    return Response({'total_contributions': calendar.total, 'days': data, 'count': len(data)})
+
+
+@api_view(['GET'])
+def github_status(request):
+    """Get GitHub contributions cache and circuit breaker state (for ops)"""
+    if not request.user.is_authenticated:
+        return Response({'success': False, 'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+    return Response(contributions_status())
+
+
+@csrf_exempt
+def github_webhook(request):
+    """Receive GitHub webhook events and refresh the contribution calendar when it may have changed"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+
+    secret = getattr(settings, 'GITHUB_WEBHOOK_SECRET', '')
+    if not secret:
+        return JsonResponse({'success': False, 'error': 'Webhook not configured'}, status=503)
+
+    signature = request.headers.get('X-Hub-Signature-256', '')
+    if not verify_webhook_signature(secret, request.body, signature):
+        return JsonResponse({'success': False, 'error': 'Invalid signature'}, status=401)
+
+    event = request.headers.get('X-GitHub-Event', '')
+    if event == 'ping':
+        return JsonResponse({'success': True, 'message': 'pong'})
+
+    try:
+        refreshed = handle_webhook_event(event, request.body)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+    return JsonResponse({
+        'success': True,
+        'message': 'Contributions refreshed' if refreshed else f'Ignored {event} event'
+    })
 
 
 @csrf_exempt
@@ -637,6 +808,59 @@ def create_country(request):
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
 
+def _batch_create(request, spec):
+    """Create many rows of spec.model from a JSON array (see api.batch)"""
+    import logging
+    from django.db import DatabaseError, IntegrityError
+    logger = logging.getLogger(__name__)
+    
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+    
+    # Check if user is authenticated
+    if not request.user.is_authenticated:
+        return JsonResponse({'success': False, 'error': 'Authentication required'}, status=401)
+    
+    try:
+        results = batch_create(spec, json.loads(request.body))
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    except BatchError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except IntegrityError:
+        # Another request created one of the names since the duplicate check; nothing was saved
+        return JsonResponse({'success': False, 'error': 'Conflicting concurrent changes, nothing was created; retry the batch'}, status=409)
+    except (DatabaseError, Exception) as e:
+        logger.error(f"Error in batch create of {spec.model._meta.label}: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    
+    created = sum(1 for result in results if result['success'])
+    return JsonResponse({
+        'success': created == len(results),
+        'created': created,
+        'failed': len(results) - created,
+        'results': results,
+    })
+
+
+@csrf_exempt
+def create_hobbies_batch(request):
+    """Create hobbies from a JSON array of {name, reason, category, social, icon}"""
+    return _batch_create(request, HOBBIES)
+
+
+@csrf_exempt
+def create_countries_batch(request):
+    """Create countries from a JSON array of {name, code, flag_emoji, thoughts}"""
+    return _batch_create(request, COUNTRIES)
+
+
+@csrf_exempt
+def create_skills_batch(request):
+    """Create skills (without icons) from a JSON array of {name, category, description}"""
+    return _batch_create(request, SKILLS)
+
+
 @csrf_exempt
 def secret_login(request):
     """Handle secret login authentication"""
@@ -10,5 +10,14 @@ pip install -r requirements.txt
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+echo "Snapshotting GitHub contributions..."
+python manage.py sync_github_contributions
+
+echo "Generating image renditions..."
+python manage.py generate_image_renditions
+
+echo "Pre-rendering public pages..."
+python manage.py prerender_pages
+
 echo "Build completed successfully!"
 
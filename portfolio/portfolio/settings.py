@@ -84,6 +84,7 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Add WhiteNoise for static files (must be after SecurityMiddleware)
+    "api.prerender.PrerenderedPageMiddleware",  # Pre-rendered public pages, before sessions and auth
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -231,15 +232,23 @@ STATICFILES_DIRS = [
 ]
 
 # WhiteNoise configuration for serving static files on Vercel
-# Use CompressedStaticFilesStorage (without manifest) for easier debugging
-# Manifest storage can cause issues if files aren't found
-# WhiteNoise will serve from STATICFILES_DIRS if collectstatic hasn't run
+# collectstatic writes a content-hashed copy of every file (e.g. style.3f2a1c.css) plus a
+# manifest, and {% static %} resolves to the hashed name. Hashed files never change, so
+# WhiteNoise serves them with far-future "immutable" Cache-Control headers and the
+# Vercel CDN caches them too (see api.staticfiles). In DEBUG, {% static %} keeps the
+# plain names so files can be edited without re-running collectstatic, and files that
+# are missing from the manifest fall back to their plain names too.
+STATICFILES_BACKEND = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 try:
     import whitenoise
-    STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
+    STATICFILES_BACKEND = 'api.staticfiles.ManifestStaticFilesStorage'
+    from api.staticfiles import add_cdn_cache_headers
+    WHITENOISE_ADD_HEADERS_FUNCTION = add_cdn_cache_headers
 except ImportError:
     pass  # WhiteNoise not installed, use default storage
 
+MEDIA_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
+
 # Media files (User uploaded content)
 # Use Cloudinary ONLY if all required environment variables are set
 # Otherwise, use local storage (will fail in production Vercel due to read-only filesystem)
@@ -269,7 +278,7 @@ if cloudinary_cloud_name and cloudinary_api_key and cloudinary_api_secret:
         }
         
         # Use Cloudinary for media files
-        DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+        MEDIA_STORAGE_BACKEND = 'cloudinary_storage.storage.MediaCloudinaryStorage'
         
         # Configure Cloudinary
         cloudinary.config(
@@ -290,6 +299,13 @@ else:
     MEDIA_URL = "media/"
     MEDIA_ROOT = BASE_DIR / "media"
 
+# STORAGES replaces the STATICFILES_STORAGE and DEFAULT_FILE_STORAGE settings,
+# which Django 5.1+ no longer reads
+STORAGES = {
+    'default': {'BACKEND': MEDIA_STORAGE_BACKEND},
+    'staticfiles': {'BACKEND': STATICFILES_BACKEND},
+}
+
 # File upload size limits (for Vercel compatibility)
 # Vercel has a 4.5MB limit for serverless functions, but we allow up to 10MB for images
 # Note: Large files should use cloud storage in production
@@ -302,11 +318,29 @@ DATA_UPLOAD_MAX_NUMBER_FIELDS = 1000
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# The covering indexes on Book and Hobby (Index.include) only exist on PostgreSQL;
+# SQLite builds them as plain composite indexes, which is all local development needs
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 # REST Framework settings
+# JSON encoder for API responses (see api/renderers.py): 'orjson' (used when installed)
+# or 'json' for the standard library. Both produce the same output.
+API_JSON_BACKEND = os.environ.get('API_JSON_BACKEND', 'orjson')
+
+# JSON first so it stays the default; MessagePack for clients that ask for application/msgpack
+API_RENDERER_CLASSES = ['api.renderers.FastJSONRenderer']
+try:
+    import msgpack
+    API_RENDERER_CLASSES.append('api.renderers.MessagePackRenderer')
+except ImportError:
+    pass  # msgpack not installed, JSON only
+API_RENDERER_CLASSES.append('rest_framework.renderers.BrowsableAPIRenderer')
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': API_RENDERER_CLASSES,
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
@@ -350,6 +384,103 @@ CORS_ALLOW_HEADERS = [
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN', '')
 GITHUB_USERNAME = os.environ.get('GITHUB_USERNAME', 'ElSancturioDeThomas')
 
+# Secret shared with the GitHub webhook (POST /api/github/webhook/) that invalidates contributions
+GITHUB_WEBHOOK_SECRET = os.environ.get('GITHUB_WEBHOOK_SECRET', '')
+
+# Stale-while-revalidate caching for GitHub contributions (in seconds)
+# After the soft TTL the cached calendar is still served while one background refresh runs.
+# After the hard TTL the entry is dropped and the next visitor waits on GitHub.
+# With the webhook configured, events drive freshness and the soft TTL is only a safety net.
+GITHUB_CONTRIBUTIONS_SOFT_TTL = int(os.environ.get(
+    'GITHUB_CONTRIBUTIONS_SOFT_TTL', 6 * 3600 if GITHUB_WEBHOOK_SECRET else 900
+))
+GITHUB_CONTRIBUTIONS_HARD_TTL = int(os.environ.get('GITHUB_CONTRIBUTIONS_HARD_TTL', 7 * 24 * 3600))
+
+# Refreshes only fetch the last couple of days and merge them into the cached calendar.
+# A full refetch still happens when the merged calendar does not add up to GitHub's total,
+# and at least once per GITHUB_CONTRIBUTIONS_FULL_SYNC_INTERVAL seconds.
+GITHUB_CONTRIBUTIONS_INCREMENTAL = os.environ.get('GITHUB_CONTRIBUTIONS_INCREMENTAL', 'True') == 'True'
+GITHUB_CONTRIBUTIONS_FULL_SYNC_INTERVAL = int(os.environ.get('GITHUB_CONTRIBUTIONS_FULL_SYNC_INTERVAL', 24 * 3600))
+
+# Upper bound (in seconds) for the GitHub circuit breaker's exponential backoff after failures
+GITHUB_BREAKER_MAX_BACKOFF = int(os.environ.get('GITHUB_BREAKER_MAX_BACKOFF', 3600))
+
+# Outbound HTTP client (api.outbound) used for GitHub and any other external calls
+# Sessions are pooled and kept alive per process; timeouts are (connect, read) seconds
+OUTBOUND_HTTP = {
+    'POOL_MAXSIZE': int(os.environ.get('OUTBOUND_HTTP_POOL_SIZE', 10)),
+    'RETRIES': int(os.environ.get('OUTBOUND_HTTP_RETRIES', 2)),
+    'BACKOFF_FACTOR': 0.3,
+    'TIMEOUT': (3.05, 10),
+    'HOST_TIMEOUTS': {
+        'api.github.com': (3.05, 10),
+    },
+}
+
+# Seconds that pages rendered for anonymous visitors stay cached (0 disables the page cache)
+# Cached pages are also invalidated whenever portfolio content or GitHub contributions change
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 600))
+
+# Items per page in the library sections (loaded page by page as visitors scroll)
+LIBRARY_PAGE_SIZE = int(os.environ.get('LIBRARY_PAGE_SIZE', 12))
+
+# Most items accepted by one request to the batch create endpoints (/api/<collection>/batch/)
+API_MAX_BATCH_SIZE = int(os.environ.get('API_MAX_BATCH_SIZE', 500))
+
+# Rows fetched and sent per chunk by the streaming exports (/api/export/<collection>/)
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 500))
+
+# Widths (in pixels) of the responsive renditions made from uploaded images (see api/images.py);
+# uploads narrower than the widest are also kept at their own width, never upscaled
+IMAGE_RENDITION_WIDTHS = [
+    int(width) for width in os.environ.get('IMAGE_RENDITION_WIDTHS', '320,640,960,1280,1920').split(',')
+]
+# Renditions are made after the upload's save commits, in a background thread so the request
+# does not wait on them; False makes them inline. Any left missing are made by
+# `python manage.py generate_image_renditions` (run on each build)
+IMAGE_RENDITIONS_IN_BACKGROUND = os.environ.get('IMAGE_RENDITIONS_IN_BACKGROUND', 'True') == 'True'
+
+# Change feed (/api/changes/, see api/changes.py)
+# Changes younger than CHANGES_SETTLE_SECONDS are held back until slower transactions that
+# started before them have committed. Tombstones of deleted items are kept for
+# CHANGES_TOMBSTONE_RETENTION_DAYS; clients with older cursors must resync from /api/snapshot/.
+CHANGES_SETTLE_SECONDS = int(os.environ.get('CHANGES_SETTLE_SECONDS', 2))
+CHANGES_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('CHANGES_TOMBSTONE_RETENTION_DAYS', 90))
+
+# Static pre-rendering of the public pages (python manage.py prerender_pages)
+# Pages are rendered into PRERENDER_ROOT and served to anonymous visitors while their
+# content is current. Links in the pages use PRERENDER_BASE_URL as the site address.
+# With PRERENDER_DEPLOY_HOOK_URL set (e.g. a Vercel deploy hook), content changes trigger
+# a rebuild instead of re-rendering in place, for hosts with a read-only filesystem.
+# At most one rebuild is triggered per PRERENDER_DEPLOY_DEBOUNCE seconds (per instance);
+# writes in between are sent as one more rebuild once the window has passed.
+PRERENDER_ROOT = BASE_DIR.parent / "prerendered"
+PRERENDER_BASE_URL = os.environ.get('PRERENDER_BASE_URL', 'https://heal.industries')
+PRERENDER_DEPLOY_HOOK_URL = os.environ.get('PRERENDER_DEPLOY_HOOK_URL', '')
+PRERENDER_DEPLOY_DEBOUNCE = int(os.environ.get('PRERENDER_DEPLOY_DEBOUNCE', 300))
+
+# CDN edge caching of public pages and JSON (see api.cdn)
+# Public GETs are cached at the edge for CDN_S_MAXAGE seconds and then served stale for up
+# to CDN_STALE_WHILE_REVALIDATE seconds while the CDN refreshes them. Responses are tagged
+# in CDN_CACHE_TAG_HEADER, and writes purge their tags through CDN_PURGE_BACKEND.
+CDN_S_MAXAGE = int(os.environ.get('CDN_S_MAXAGE', 300))
+CDN_STALE_WHILE_REVALIDATE = int(os.environ.get('CDN_STALE_WHILE_REVALIDATE', 86400))
+CDN_CACHE_TAG_HEADER = os.environ.get('CDN_CACHE_TAG_HEADER', 'Surrogate-Key')
+if os.environ.get('CDN_PURGE_URL'):
+    CDN_PURGE_BACKEND = {
+        'BACKEND': 'api.purge.WebhookPurgeBackend',
+        'OPTIONS': {
+            'url': os.environ['CDN_PURGE_URL'],
+            'token': os.environ.get('CDN_PURGE_TOKEN', ''),
+        },
+    }
+else:
+    CDN_PURGE_BACKEND = {'BACKEND': 'api.purge.NullPurgeBackend'}
+
+# Identifies the deployed code in ETags, so a deploy that changes templates invalidates
+# validators even when no content changed (Vercel sets VERCEL_GIT_COMMIT_SHA)
+RELEASE_VERSION = os.environ.get('RELEASE_VERSION', os.environ.get('VERCEL_GIT_COMMIT_SHA', ''))
+
 # Caching for GitHub contributions
 CACHES = {
     'default': {
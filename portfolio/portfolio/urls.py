@@ -24,6 +24,7 @@ from api import views
 urlpatterns = [
     path("", views.index, name="index"),
     path("library/", views.library_view, name="library"),
+    path("library/<str:section>/", views.library_section, name="library_section"),
     path("skills/", views.skills_view, name="skills"),
     path("admin/", admin.site.urls),
     path("api/", include("api.urls")),
@@ -21,13 +21,20 @@
         try {
             jsonContent.innerHTML = '<code>Loading...</code>';
             
-            const response = await fetch('/api/hobbies/');
-            if (!response.ok) {
-                throw new Error('Failed to fetch hobbies');
+            // The API returns one page at a time; follow `next` until every hobby is loaded
+            const hobbies = [];
+            let url = '/api/hobbies/?limit=100';
+            while (url) {
+                const response = await fetch(url);
+                if (!response.ok) {
+                    throw new Error('Failed to fetch hobbies');
+                }
+                const page = await response.json();
+                hobbies.push(...page.hobbies);
+                url = page.next;
             }
             
-            const data = await response.json();
-            const formattedJson = JSON.stringify(data, null, 2);
+            const formattedJson = JSON.stringify({ hobbies, count: hobbies.length }, null, 2);
             
             // Basic syntax highlighting
             const highlighted = highlightJson(formattedJson);
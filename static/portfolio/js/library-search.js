@@ -0,0 +1,149 @@
+/**
+ * Library Search
+ * Type-ahead search over the library: as the visitor types, ranked matches are fetched
+ * from /api/search/ (every word is matched as a prefix) and shown in place of the
+ * sections until the query is cleared.
+ */
+
+(function() {
+    'use strict';
+
+    const MIN_LENGTH = 2;
+    const DEBOUNCE_MS = 200;
+    const LIMIT = 10;
+
+    function initLibrarySearch() {
+        const form = document.querySelector('.library-search');
+        const results = document.querySelector('.library-search-results');
+
+        if (!form || !results) {
+            return; // Exit if elements don't exist
+        }
+
+        const input = form.querySelector('.library-search-input');
+        const container = form.closest('.library-glass-container');
+        let timer = null;
+        let controller = null;
+
+        // Function to show results instead of the sections, or restore the sections
+        function setSearching(searching) {
+            results.hidden = !searching;
+            if (container) {
+                container.classList.toggle('searching', searching);
+            }
+        }
+
+        // Function to render results with textContent only (titles are user content)
+        function renderResults(items) {
+            results.innerHTML = '';
+            if (items.length === 0) {
+                const empty = document.createElement('li');
+                empty.className = 'empty-state';
+                empty.textContent = 'No matches in the library.';
+                results.appendChild(empty);
+                return;
+            }
+            items.forEach(function(item) {
+                const li = document.createElement('li');
+                const link = document.createElement('a');
+                link.href = item.url;
+
+                const title = document.createElement('span');
+                title.className = 'library-search-result-title';
+                title.textContent = item.title;
+                link.appendChild(title);
+
+                const meta = document.createElement('span');
+                meta.className = 'library-search-result-meta';
+                meta.textContent = item.collection;
+                link.appendChild(meta);
+
+                if (item.excerpt) {
+                    const excerpt = document.createElement('span');
+                    excerpt.className = 'library-search-result-excerpt';
+                    excerpt.textContent = item.excerpt;
+                    link.appendChild(excerpt);
+                }
+
+                li.appendChild(link);
+                results.appendChild(li);
+            });
+        }
+
+        // Function to fetch matches, cancelling the previous request
+        function runSearch(query) {
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+
+            const params = new URLSearchParams({
+                q: query,
+                collections: form.getAttribute('data-collections') || '',
+                limit: LIMIT
+            });
+
+            fetch(`${form.action}?${params.toString()}`, {
+                method: 'GET',
+                headers: {
+                    'Accept': 'application/json',
+                },
+                signal: controller.signal
+            })
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error('Network response was not ok');
+                }
+                return response.json();
+            })
+            .then(function(data) {
+                renderResults(data.results);
+                setSearching(true);
+            })
+            .catch(function(error) {
+                if (error.name !== 'AbortError') {
+                    console.error('Error searching the library:', error);
+                }
+            });
+        }
+
+        input.addEventListener('input', function() {
+            clearTimeout(timer);
+            const query = input.value.trim();
+            if (query.length < MIN_LENGTH) {
+                if (controller) {
+                    controller.abort();
+                }
+                setSearching(false);
+                return;
+            }
+            timer = setTimeout(function() {
+                runSearch(query);
+            }, DEBOUNCE_MS);
+        });
+
+        // Escape clears the search and brings the sections back
+        input.addEventListener('keydown', function(e) {
+            if (e.key === 'Escape') {
+                input.value = '';
+                setSearching(false);
+            }
+        });
+
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+            const query = input.value.trim();
+            if (query.length >= MIN_LENGTH) {
+                clearTimeout(timer);
+                runSearch(query);
+            }
+        });
+    }
+
+    // Initialize when DOM is ready
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', initLibrarySearch);
+    } else {
+        initLibrarySearch();
+    }
+})();
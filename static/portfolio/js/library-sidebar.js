@@ -1,6 +1,8 @@
 /**
  * Library Sidebar Navigation
- * Handles AJAX loading of sections and showing/hiding headers
+ * Switches sections and loads their items page by page: a section's first page is
+ * fetched when it is first opened, and further pages as its sentinel scrolls into view.
+ * Each page comes from /library/<section>/?after=<cursor> as {html, next}.
  */
 
 (function() {
@@ -9,7 +11,7 @@
     function initLibrarySidebar() {
         const sidebarButtons = document.querySelectorAll('.library-sidebar-btn');
         const sections = document.querySelectorAll('.library-section');
-        
+
         if (sidebarButtons.length === 0 || sections.length === 0) {
             return; // Exit if elements don't exist
         }
@@ -31,7 +33,7 @@
             sections.forEach(function(section) {
                 const sectionId = section.getAttribute('data-section');
                 const title = section.querySelector('.library-section-title');
-                
+
                 if (sectionId === activeSection) {
                     section.classList.add('active');
                     if (title) {
@@ -46,28 +48,21 @@
             });
         }
 
-        // Function to fetch section data via AJAX
-        function loadSection(sectionName) {
-            // Show loading state
-            const targetSection = document.querySelector(`[data-section="${sectionName}"]`);
-            if (!targetSection) {
-                console.warn('Library sidebar: Target section not found for', sectionName);
+        // Watches each section's sentinel for infinite scroll (set up below)
+        let observer = null;
+
+        // Function to fetch the next page of a section and append it
+        function loadNextPage(section) {
+            const grid = section.querySelector('.library-items');
+            if (!grid || grid.dataset.loading || !grid.dataset.next) {
                 return;
             }
+            grid.dataset.loading = 'true';
 
-            // Update button state immediately
-            updateActiveButton(sectionName);
-            
-            // Update section visibility immediately
-            updateSectionVisibility(sectionName);
-
-            // Fetch fresh data from server
-            const url = `/library/?section=${sectionName}`;
-            
-            fetch(url, {
+            fetch(grid.dataset.next, {
                 method: 'GET',
                 headers: {
-                    'X-Requested-With': 'XMLHttpRequest', // Identify as AJAX request
+                    'Accept': 'application/json',
                 },
                 credentials: 'same-origin'
             })
@@ -75,65 +70,98 @@
                 if (!response.ok) {
                     throw new Error('Network response was not ok');
                 }
-                return response.text();
-            })
-            .then(function(response) {
                 return response.json();
             })
             .then(function(data) {
-                // The response contains HTML in the 'html' field
-                if (data.html) {
-                    targetSection.innerHTML = data.html;
-                    
-                    // Ensure section is active
-                    targetSection.classList.add('active');
-                    
-                    // Show header
-                    const title = targetSection.querySelector('.library-section-title');
-                    if (title) {
-                        title.style.display = 'flex';
-                    }
+                grid.insertAdjacentHTML('beforeend', data.html);
+                grid.dataset.loaded = 'true';
+                if (data.next) {
+                    grid.dataset.next = data.next;
+                } else {
+                    delete grid.dataset.next;
+                }
+
+                const emptyState = section.querySelector('.empty-state');
+                if (emptyState) {
+                    emptyState.hidden = grid.children.length > 0;
+                }
+
+                // Re-observe so a sentinel that is still on screen loads the following page too
+                const sentinel = section.querySelector('.library-sentinel');
+                if (observer && sentinel && data.next) {
+                    observer.unobserve(sentinel);
+                    observer.observe(sentinel);
                 }
-                
-                // Update URL without reloading
-                const newUrl = `/library/?section=${sectionName}`;
-                window.history.pushState({ section: sectionName }, '', newUrl);
             })
             .catch(function(error) {
-                console.error('Error loading section:', error);
-                // On error, still show the section (it may have cached content)
+                console.error('Error loading library page:', error);
+            })
+            .finally(function() {
+                delete grid.dataset.loading;
             });
         }
 
+        // Show a section, loading its first page if it has not been opened yet
+        function showSection(sectionName) {
+            const targetSection = document.querySelector(`.library-section[data-section="${sectionName}"]`);
+            if (!targetSection) {
+                console.warn('Library sidebar: Target section not found for', sectionName);
+                return;
+            }
+
+            updateActiveButton(sectionName);
+            updateSectionVisibility(sectionName);
+
+            const grid = targetSection.querySelector('.library-items');
+            if (grid && !grid.dataset.loaded) {
+                loadNextPage(targetSection);
+            }
+        }
+
         // Handle button clicks
         sidebarButtons.forEach(function(button) {
             button.addEventListener('click', function(e) {
                 e.preventDefault();
-                
+
                 const targetSection = button.getAttribute('data-section');
-                
+
                 if (!targetSection) {
                     return;
                 }
 
-                // Load the section via AJAX
-                loadSection(targetSection);
+                showSection(targetSection);
+
+                // Update URL without reloading
+                const newUrl = `/library/?section=${targetSection}`;
+                window.history.pushState({ section: targetSection }, '', newUrl);
             });
         });
 
+        // Infinite scroll: load the next page when the active section's sentinel comes into view
+        if ('IntersectionObserver' in window) {
+            observer = new IntersectionObserver(function(entries) {
+                entries.forEach(function(entry) {
+                    const section = entry.target.closest('.library-section');
+                    if (entry.isIntersecting && section && section.classList.contains('active')) {
+                        loadNextPage(section);
+                    }
+                });
+            }, { rootMargin: '400px 0px' });
+
+            document.querySelectorAll('.library-sentinel').forEach(function(sentinel) {
+                observer.observe(sentinel);
+            });
+        }
+
         // Handle browser back/forward buttons
         window.addEventListener('popstate', function(event) {
             const urlParams = new URLSearchParams(window.location.search);
-            const section = urlParams.get('section') || 'projects';
-            updateActiveButton(section);
-            updateSectionVisibility(section);
+            showSection(urlParams.get('section') || 'projects');
         });
 
         // Initialize based on current URL
         const urlParams = new URLSearchParams(window.location.search);
-        const initialSection = urlParams.get('section') || 'projects';
-        updateActiveButton(initialSection);
-        updateSectionVisibility(initialSection);
+        showSection(urlParams.get('section') || 'projects');
     }
 
     // Initialize when DOM is ready